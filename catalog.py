@@ -0,0 +1,65 @@
+# catalog.py — revalidation en arrière-plan des catalogues (stations.json, images maps)
+
+from concurrent.futures import ThreadPoolExecutor
+from PySide6.QtCore import QThread, Signal
+import utils, config
+
+
+class CatalogRefresher(QThread):
+    """Revalide en parallèle les JSON distants ; n'émet que si le contenu a changé.
+
+    L'UI démarre sur les copies locales (`offline=True`) et se met à jour à la volée.
+    """
+    stations   = Signal(object)        # dict stations complet
+    images_map = Signal(str, object)   # nom de station, map compilée
+
+    def __init__(self, station_name: str, station: dict, parent=None):
+        super().__init__(parent)
+        self.station_name = station_name
+        self.station = station
+
+    @staticmethod
+    def _map_url(station: dict):
+        url = station.get("images_map_url")
+        return url if isinstance(url, str) and url.startswith("http") else None
+
+    def run(self):
+        urls = [config.STATIONS_URL, config.MAP_URL]
+        if self._map_url(self.station):
+            urls.append(self._map_url(self.station))
+        with ThreadPoolExecutor(max_workers=len(urls)) as ex:
+            changed = dict(zip(urls, (c for _, c in ex.map(utils.revalidate_json, urls))))
+
+        station = self.station
+        if changed[config.STATIONS_URL]:
+            stations = utils.load_stations(offline=True)
+            self.stations.emit(stations)
+            station = stations["stations"].get(self.station_name, station)
+            # la station a peut-être changé de map dédiée
+            url = self._map_url(station)
+            if url and url not in changed:
+                changed[url] = utils.revalidate_json(url)[1]
+
+        if changed[config.STATIONS_URL]:
+            utils.invalidate_images_maps()
+        # tout vient d'être revalidé : la copie locale est à jour pour la durée du TTL
+        m = utils.load_images_map_for_station(station, offline=True)
+        utils.remember_images_map(self.station_name, m)
+        if any(changed.values()):
+            self.images_map.emit(self.station_name, m)
+
+
+class ImagesMapLoader(QThread):
+    """Charge (ou revalide après TTL) la map d'images d'une station hors du thread GUI."""
+    images_map = Signal(str, object)   # nom de station, map compilée
+
+    def __init__(self, station_name: str, station: dict, force: bool = False, parent=None):
+        super().__init__(parent)
+        self.station_name = station_name
+        self.station = station
+        self.force = force
+
+    def run(self):
+        if self.force:
+            utils.invalidate_images_maps(self.station_name)
+        self.images_map.emit(self.station_name, utils.get_images_map_for_station(self.station_name, self.station))
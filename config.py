@@ -16,3 +16,24 @@ STATIONS_URL = "https://raw.githubusercontent.com/celesteoffi/AppWebRadio/main/s
 
 # --- Fichiers locaux ---
 SETTINGS_FILE = "settings.json"
+HISTORY_FILE  = "history.sqlite3"  # historique des titres par station (SQLite WAL)
+CACHE_DIR     = "cache"           # à côté de settings.json
+COVER_CACHE_MAX_BYTES = 50 * 1024 * 1024
+IMAGES_MAP_TTL = 15 * 60          # s avant revalidation d'une map d'images de station
+STATUS_POLL_INTERVAL   = 30       # s entre deux rafraîchissements de l'état de toutes les stations
+STATUS_MAX_REQ_PER_MIN = 6        # budget de requêtes de l'agrégateur, quel que soit le nb de stations
+NP_POLL_INTERVAL   = 12           # s entre deux appels à nowplaying_url (sans métadonnées ICY)
+ICY_POLL_INTERVAL  = 60           # s : titres reçus dans le flux, l'API ne sert plus qu'à enrichir
+ICY_ENRICH_DELAY   = 2            # s après un titre ICY avant d'interroger l'API (pochette, auditeurs…)
+METRICS_FILE = "metrics.json"     # dans CACHE_DIR, écrit à la fermeture
+STALL_THRESHOLD_MS = 200          # blocage de la boucle principale au-delà duquel on relève la pile
+
+# --- Mode --headless (sans interface) ---
+CONTROL_SOCKET = "inspora.sock"   # socket Unix de contrôle, à côté de settings.json
+CONTROL_PORT   = 47821            # repli TCP 127.0.0.1 si la plateforme n'a pas AF_UNIX
+CONTROL_TOKEN  = "control.token"  # jeton exigé sur le repli TCP, réécrit à chaque lancement
+
+# --- Proxy local de métadonnées (réglage "metadata_proxy") ---
+PROXY_PORT          = 47822       # http://127.0.0.1:47822/api/nowplaying/<station>
+PROXY_POLL_INTERVAL = 10          # s entre deux interrogations amont (raccourci en fin de titre)
+PROXY_CORS_ORIGIN   = None        # origine autorisée à lire le proxy depuis un navigateur (overlay), ex. "http://localhost:8080"
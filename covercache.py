@@ -0,0 +1,151 @@
+# covercache.py — cache des pochettes : LRU mémoire + cache disque borné (revalidation ETag/Last-Modified)
+
+import hashlib, json, os, threading, time
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Tuple, Dict
+
+
+class LRU:
+    """Petit cache LRU (OrderedDict) — utilisé côté GUI pour les pixmaps déjà décodées/redimensionnées."""
+
+    def __init__(self, capacity: int = 32):
+        self.capacity = capacity
+        self._d = OrderedDict()
+
+    def get(self, key):
+        try:
+            self._d.move_to_end(key)
+            return self._d[key]
+        except KeyError:
+            return None
+
+    def put(self, key, value):
+        self._d[key] = value
+        self._d.move_to_end(key)
+        while len(self._d) > self.capacity:
+            self._d.popitem(last=False)
+
+    def __contains__(self, key):
+        return key in self._d
+
+    def __len__(self):
+        return len(self._d)
+
+    def clear(self):
+        self._d.clear()
+
+
+class DiskCache:
+    """Cache disque indexé par URL : `<sha1>.bin` (contenu) + `<sha1>.json` (validateurs HTTP).
+
+    Taille totale bornée ; les entrées les moins récemment utilisées (mtime) sont
+    supprimées en premier. Partagé entre threads (worker des pochettes, proxy de
+    métadonnées) : écritures atomiques (fichier temporaire + rename) sous verrou, et
+    `claim(url)` pour qu'une seule requête amont soit faite par URL manquante.
+    """
+
+    def __init__(self, root: Path, max_bytes: int, fresh_for: int = 3600):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.fresh_for = fresh_for   # durée (s) pendant laquelle on ne revalide pas
+        self._lock = threading.Lock()
+        self._inflight = {}          # url → [verrou, nb de threads intéressés]
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+
+    def _paths(self, url: str) -> Tuple[Path, Path]:
+        h = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.root / f"{h}.bin", self.root / f"{h}.json"
+
+    @contextmanager
+    def claim(self, url: str):
+        """Section critique par URL : lookup + téléchargement + store. Les autres threads
+        qui veulent la même URL attendent, puis trouvent l'entrée fraîche dans le cache."""
+        with self._lock:
+            entry = self._inflight.setdefault(url, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._inflight[url]
+
+    @staticmethod
+    def _write(path: Path, data: bytes):
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def lookup(self, url: str) -> Tuple[Optional[bytes], Dict[str, str], bool]:
+        """Retourne (contenu ou None, en-têtes conditionnels, encore frais ?)."""
+        body, meta = self._paths(url)
+        try:
+            with self._lock:
+                data = body.read_bytes()
+                info = json.loads(meta.read_text(encoding="utf-8"))
+        except Exception:
+            return None, {}, False
+        try:
+            os.utime(body)  # récemment utilisé → évincé en dernier
+        except Exception:
+            pass
+        headers = {}
+        if info.get("etag"):
+            headers["If-None-Match"] = info["etag"]
+        if info.get("last_modified"):
+            headers["If-Modified-Since"] = info["last_modified"]
+        fresh = time.time() - info.get("stored", 0) < self.fresh_for
+        return data, headers, fresh
+
+    def store(self, url: str, data: bytes, headers=None):
+        body, meta = self._paths(url)
+        headers = headers or {}
+        info = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "stored": time.time(),
+        }
+        with self._lock:
+            try:
+                self._write(body, data)
+                self._write(meta, json.dumps(info).encode("utf-8"))
+            except Exception:
+                return
+            self._evict()
+
+    def touch(self, url: str):
+        """Revalidé (304) : on repousse l'expiration et on marque comme récemment utilisé."""
+        body, meta = self._paths(url)
+        with self._lock:
+            try:
+                info = json.loads(meta.read_text(encoding="utf-8"))
+                info["stored"] = time.time()
+                self._write(meta, json.dumps(info).encode("utf-8"))
+                os.utime(body)
+            except Exception:
+                pass
+
+    def _evict(self):
+        """Appelé sous `_lock`."""
+        try:
+            files = [(p.stat().st_mtime, p.stat().st_size, p) for p in self.root.glob("*.bin")]
+        except Exception:
+            return
+        total = sum(size for _, size, _ in files)
+        for _, size, p in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+                p.with_suffix(".json").unlink(missing_ok=True)
+                total -= size
+            except Exception:
+                pass
@@ -0,0 +1,52 @@
+# debug_panel.py — panneau caché (Ctrl+Maj+D) : métriques en direct, blocages, export JSON
+
+from PySide6.QtCore import QTimer, Signal
+from PySide6.QtGui import QFont
+from PySide6.QtWidgets import QDialog, QPlainTextEdit, QPushButton, QVBoxLayout, QHBoxLayout, QFileDialog
+
+import metrics
+
+
+class DebugPanel(QDialog):
+    shown = Signal(bool)   # visibilité : la fenêtre principale n'arme le watchdog que panneau ouvert
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Debug — métriques")
+        self.resize(760, 520)
+        v = QVBoxLayout(self)
+        self.text = QPlainTextEdit(); self.text.setReadOnly(True)
+        font = QFont("Consolas"); font.setStyleHint(QFont.Monospace); font.setPointSize(9)
+        self.text.setFont(font)
+        v.addWidget(self.text)
+
+        row = QHBoxLayout(); row.addStretch(1)
+        btn_export = QPushButton("Exporter JSON…"); btn_export.clicked.connect(self.export)
+        row.addWidget(btn_export)
+        v.addLayout(row)
+
+        # rafraîchi seulement quand visible
+        self.timer = QTimer(self); self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    def refresh(self):
+        bar = self.text.verticalScrollBar()
+        pos = bar.value()
+        self.text.setPlainText(metrics.format_text())
+        bar.setValue(pos)
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Exporter les métriques", "metrics.json", "JSON (*.json)")
+        if path:
+            metrics.dump(path)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+        self.shown.emit(True)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        self.shown.emit(False)
+        super().hideEvent(event)
@@ -0,0 +1,346 @@
+# headless.py — mode démon sans Qt : audio + présence Discord, piloté par un socket local
+# Lancement : python main.py --headless        Contrôle : python main.py --ctl play|stop|station <nom>|volume <n>|status
+
+import asyncio, hmac, json, os, secrets, signal, socket
+
+import config, utils, metrics, http_client
+from nowplaying_data import IcyTracker, NowPlaying, PollSchedule
+from settings_store import SettingsStore
+
+COMMANDS = "play, stop, toggle, station <nom>, volume <0-100>, status, stations [recherche], quit"
+
+
+def control_address():
+    """Socket Unix dans le dossier de l'appli ; TCP local si la plateforme n'a pas AF_UNIX."""
+    if hasattr(socket, "AF_UNIX"):
+        return ("unix", str(utils.app_dir() / config.CONTROL_SOCKET))
+    return ("tcp", ("127.0.0.1", config.CONTROL_PORT))
+
+
+def _token_path():
+    return utils.app_dir() / config.CONTROL_TOKEN
+
+
+def _write_token() -> bytes:
+    """Nouveau jeton de contrôle (repli TCP), lisible seulement par l'utilisateur."""
+    token = secrets.token_hex(16)
+    path = _token_path()
+    try:
+        path.unlink()
+    except OSError:
+        pass
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "w") as f:
+        f.write(token)
+    return token.encode()
+
+
+def _get_json(url: str):
+    """GET JSON ; les réponses d'erreur (proxy pas encore prêt, 4xx/5xx amont) lèvent une exception."""
+    r = http_client.get(url)
+    r.raise_for_status()
+    return r.json()
+
+
+class HeadlessRadio:
+    """Lecteur + RPC + now-playing sur une boucle asyncio (aucun import Qt)."""
+
+    def __init__(self, autoplay: bool = None, proxy: bool = None):
+        self.loop = asyncio.get_running_loop()
+        self.settings = SettingsStore(utils.app_dir() / config.SETTINGS_FILE, {
+            "volume": 80, "autoplay": True, "station": None, "prewarm": False, "metadata_proxy": False,
+            "stall_watchdog": False,
+        })
+        self.autoplay = self.settings.get("autoplay", True) if autoplay is None else autoplay
+        self.serve_proxy = bool(self.settings.get("metadata_proxy")) if proxy is None else proxy
+        self.stations = utils.load_stations(offline=True)
+        names = utils.get_station_names(self.stations)
+        self.station_name = self.settings.get("station") or self.stations.get("default") or names[0]
+        self.station = utils.get_station(self.stations, self.station_name)
+        self.images_map = utils.load_images_map_for_station(self.station, offline=True)
+        self.np = None
+        self.icy = IcyTracker()
+        self.np_schedule = PollSchedule()
+        self._index = None         # index de recherche du catalogue (construit à la 1re recherche)
+        self.state = "stopped"
+        self.player = None
+        self.rpc = None
+        self.server = None
+        self._token = None         # jeton exigé en première ligne sur le repli TCP
+        self.proxy = None
+        self.proxy_url = None      # proxy servi ici ou par une autre instance
+        self.history = None
+        self.watchdog = metrics.StallWatchdog(config.STALL_THRESHOLD_MS)
+        self._tasks = []
+        self._np_wake = asyncio.Event()
+        self._stopping = asyncio.Event()
+
+    # ---------- démarrage / arrêt ----------
+    async def start(self):
+        from player_core import PlayerCore
+        from rpc import DiscordRPCManager
+
+        self.player = PlayerCore(
+            post=self.loop.call_soon_threadsafe,
+            call_later=self.loop.call_later,
+            on_state=self.on_player_state,
+            on_meta=self.on_icy_title,
+            prewarm=bool(self.settings.get("prewarm")),
+        )
+        self.player.set_volume(self.settings["volume"])
+        self.rpc = DiscordRPCManager(config.DISCORD_CLIENT_ID, config.APP_NAME)
+        self.rpc.start()
+        from history import PlayHistory
+        self.history = PlayHistory(utils.app_dir() / config.HISTORY_FILE)
+
+        kind, addr = control_address()
+        if kind == "unix":
+            try:
+                os.unlink(addr)   # socket orphelin d'un arrêt brutal
+            except OSError:
+                pass
+            self.server = await asyncio.start_unix_server(self.on_client, path=addr)
+        else:
+            # TCP local : joignable par tout processus de la machine, navigateur compris
+            # (POST no-cors) ; chaque connexion présente d'abord le jeton du dossier de l'appli
+            self._token = _write_token()
+            self.server = await asyncio.start_server(self.on_client, *addr)
+
+        if self.serve_proxy:
+            from covercache import DiskCache
+            from metadata_proxy import MetadataHub, MetadataProxy, find_running
+            cache = DiskCache(utils.app_dir() / config.CACHE_DIR / "covers", config.COVER_CACHE_MAX_BYTES)
+            try:
+                self.proxy = MetadataProxy(MetadataHub(self.stations, config.PROXY_POLL_INTERVAL, cache)).start()
+                self.proxy_url = self.proxy.url
+            except OSError as e:   # port pris : on se branche sur le proxy d'une autre instance
+                self.proxy_url = await self.loop.run_in_executor(None, find_running)
+                if self.proxy_url is None:
+                    print("[proxy]", e)
+
+        tasks = [self._poll_nowplaying(), self._refresh_catalog()]
+        if self.settings.get("stall_watchdog"):   # battement 20 fois / s : désactivé par défaut
+            self.watchdog.start()
+            tasks.append(self._heartbeat())
+        self._tasks = [self.loop.create_task(t) for t in tasks]
+        if self.autoplay:
+            self.play()
+        print(f"[headless] prêt — {kind}:{addr}", flush=True)
+
+    async def run(self):
+        await self.start()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                self.loop.add_signal_handler(sig, self._stopping.set)
+            except (NotImplementedError, RuntimeError):
+                pass   # Windows : Ctrl+C lève KeyboardInterrupt
+        await self._stopping.wait()
+        await self.shutdown()
+
+    async def shutdown(self):
+        for t in self._tasks:
+            t.cancel()
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            kind, addr = control_address()
+            try:
+                os.unlink(addr if kind == "unix" else _token_path())
+            except OSError:
+                pass
+        if self.proxy is not None:
+            self.proxy.stop()
+        self.player.stop_stream()
+        await self.loop.run_in_executor(None, self.rpc.clear_close)
+        await self.loop.run_in_executor(None, self.history.close)
+        self.settings.flush()
+        self.watchdog.stop()
+        metrics.dump(utils.app_dir() / config.CACHE_DIR / config.METRICS_FILE)
+
+    # ---------- lecture ----------
+    def on_player_state(self, s: str):
+        self.state = s
+
+    def play(self):
+        self.player.start_stream(self.station["stream_url"], self.station.get("vlc"))
+        self._np_wake.set()
+
+    def stop(self):
+        self.player.stop_stream()
+        self.icy.reset()
+
+    def set_station(self, name: str) -> bool:
+        if name not in self.stations.get("stations", {}):
+            return False
+        self.station_name = name
+        self.station = utils.get_station(self.stations, name)
+        cached, _ = utils.peek_images_map(name)
+        self.images_map = cached or utils.load_images_map_for_station(self.station, offline=True)
+        self.settings["station"] = name
+        self.np = None
+        self.icy.reset()
+        self.np_schedule.reset()
+        if self.player.is_active():
+            self.play()
+        self._np_wake.set()
+        return True
+
+    def set_volume(self, v: int):
+        v = max(0, min(100, int(v)))
+        self.player.set_volume(v)
+        self.settings["volume"] = v
+
+    # ---------- tâches de fond ----------
+    async def _heartbeat(self):
+        while True:
+            self.watchdog.beat()
+            await asyncio.sleep(0.05)
+
+    async def _poll_nowplaying(self):
+        """Cadence de `PollSchedule` (sans fenêtre : réglages « masquée ») ; réveil immédiat sur
+        play / changement de station / nouveau titre ICY."""
+        while True:
+            active = self.player.is_active()
+            if active:
+                name, url = self.station_name, self.station.get("nowplaying_url", config.API_URL)
+                if self.proxy_url:
+                    from metadata_proxy import nowplaying_url
+                    url = nowplaying_url(self.proxy_url, name)
+                metrics.incr("np.requests")
+                try:
+                    data = await self.loop.run_in_executor(None, _get_json, url)
+                    if name == self.station_name:
+                        self.on_nowplaying(NowPlaying.from_api(name, data))
+                except Exception as e:
+                    metrics.incr("np.fail")
+                    self.np_schedule.failed()
+                    print("[NowPlaying]", e)
+            self._np_wake.clear()
+            try:
+                delay = self.np_schedule.next_delay(active, visible=False, icy=self.icy.active)
+                await asyncio.wait_for(self._np_wake.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _refresh_catalog(self):
+        """Revalide catalogue et map d'images en arrière-plan (GET conditionnels)."""
+        stations = await self.loop.run_in_executor(None, utils.load_stations)
+        if utils.get_station_names(stations):
+            self.stations = stations
+            self._index = None
+            self.station = utils.get_station(stations, self.station_name)
+            if self.proxy is not None:
+                self.proxy.hub.set_stations(stations)
+        name, station = self.station_name, self.station
+        m = await self.loop.run_in_executor(None, utils.get_images_map_for_station, name, station)
+        if name == self.station_name:
+            self.images_map = m
+
+    def on_icy_title(self, raw: str):
+        """Nouveau morceau annoncé dans le flux : RPC tout de suite, API ensuite pour enrichir."""
+        ok, np = self.icy.on_title(raw, self.station_name, self.np)
+        if not ok:
+            return
+        self.loop.call_later(config.ICY_ENRICH_DELAY, self._np_wake.set)
+        if np is not None:
+            self.np = np
+            self._update_rpc(np)
+
+    def on_nowplaying(self, np: NowPlaying):
+        self.np_schedule.observe(np)
+        retry = self.icy.api_behind(np)
+        if retry is not None:
+            # l'API n'a pas encore vu le morceau annoncé par le flux : on garde le titre ICY
+            if retry:
+                self.loop.call_later(retry, self._np_wake.set)
+            return
+        self.np = np
+        metrics.incr("np.updates")
+        self.history.record(np.station, np.title, np.artist, np.art_url, np.listeners, np.live)
+        self._update_rpc(np)
+
+    def _update_rpc(self, np: NowPlaying):
+        img = utils.choose_image(self.images_map, np.title, np.live)
+        self.rpc.update(np.title, np.artist, np.listeners, img,
+                        small_image=self.station.get("rpc_small_image"), small_text=self.station_name)
+
+    # ---------- contrôle ----------
+    def status(self) -> dict:
+        np = self.np
+        return {"station": self.station_name, "state": self.state, "active": self.player.is_active(),
+                "volume": self.player.volume, "rpc": self.rpc.enabled(),
+                "title": np.title if np else None, "artist": np.artist if np else None,
+                "listeners": np.listeners if np else None}
+
+    def handle(self, line: str) -> dict:
+        cmd, _, arg = line.strip().partition(" ")
+        cmd = cmd.lower()
+        if cmd == "play":
+            self.play()
+        elif cmd == "stop":
+            self.stop()
+        elif cmd == "toggle":
+            self.stop() if self.player.is_active() else self.play()
+        elif cmd == "station":
+            if not self.set_station(arg.strip()):
+                return {"ok": False, "error": f"station inconnue : {arg.strip()}"}
+        elif cmd == "volume":
+            try:
+                self.set_volume(int(arg))
+            except ValueError:
+                return {"ok": False, "error": "volume attendu : 0-100"}
+        elif cmd == "stations":
+            if not arg.strip():
+                return {"ok": True, "stations": utils.get_station_names(self.stations)}
+            if self._index is None:
+                from station_index import StationIndex
+                self._index = StationIndex.from_catalog(self.stations)
+            return {"ok": True, "stations": [self._index[i].name for i in self._index.search(arg)[:200]]}
+        elif cmd == "quit":
+            self._stopping.set()
+        elif cmd != "status":
+            return {"ok": False, "error": f"commandes : {COMMANDS}"}
+        return {"ok": True, **self.status()}
+
+    async def on_client(self, reader, writer):
+        try:
+            if self._token is not None:
+                first = await reader.readline()
+                if not hmac.compare_digest(first.strip(), b"auth " + self._token):
+                    metrics.incr("ctl.rejected")
+                    return   # requête HTTP d'une page web, client sans le jeton…
+            while line := await reader.readline():
+                writer.write((json.dumps(self.handle(line.decode("utf-8", "replace")), ensure_ascii=False) + "\n").encode())
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+def run(autoplay: bool = None, proxy: bool = None) -> int:
+    async def main():
+        await HeadlessRadio(autoplay, proxy).run()
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def send_command(command: str, timeout: float = 5) -> str:
+    """Envoie une commande au démon et renvoie sa réponse (une ligne JSON)."""
+    kind, addr = control_address()
+    family = socket.AF_UNIX if kind == "unix" else socket.AF_INET
+    auth = b"" if kind == "unix" else b"auth " + _token_path().read_bytes().strip() + b"\n"
+    with socket.socket(family, socket.SOCK_STREAM) as s:
+        s.settimeout(timeout)
+        s.connect(addr)
+        s.sendall(auth + command.encode("utf-8") + b"\n")
+        buf = b""
+        while not buf.endswith(b"\n"):
+            chunk = s.recv(4096)
+            if not chunk:
+                break
+            buf += chunk
+    return buf.decode("utf-8").strip()
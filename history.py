@@ -0,0 +1,147 @@
+# history.py — historique des titres joués (SQLite WAL), écritures groupées hors du thread GUI
+# Sans dépendance Qt : utilisé par l'interface (history_view.py) et par le mode --headless.
+
+import queue, sqlite3, threading, time
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS plays (
+    id        INTEGER PRIMARY KEY,
+    station   TEXT    NOT NULL,
+    ts        INTEGER NOT NULL,          -- epoch s
+    title     TEXT    NOT NULL,
+    artist    TEXT    NOT NULL DEFAULT '',
+    art_url   TEXT,
+    listeners INTEGER NOT NULL DEFAULT 0,
+    live      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS plays_station_ts ON plays (station, ts DESC, id DESC);
+-- la recherche (LIKE '%x%') parcourt les lignes de la station via plays_station_ts
+"""
+
+FIELDS  = "station, ts, title, artist, art_url, listeners, live"
+COLUMNS = "id, " + FIELDS
+
+
+def connect(path) -> sqlite3.Connection:
+    db = sqlite3.connect(str(path), timeout=5)
+    db.execute("PRAGMA journal_mode=WAL")       # lectures (GUI) sans bloquer l'écrivain
+    db.execute("PRAGMA synchronous=NORMAL")     # suffisant en WAL : pas de fsync par transaction
+    return db
+
+
+class PlayHistory:
+    """Journal append-only des titres par station.
+
+    `record()` est non bloquant : les entrées sont déposées dans une file et un
+    thread écrivain les insère par lots (une transaction par lot, au plus toutes
+    les `flush_interval` s). Un titre identique au dernier enregistré pour la même
+    station est ignoré. `on_written(station, n)` est appelé depuis l'écrivain après
+    chaque lot. Les lectures se font via `reader()` (une connexion par thread).
+    """
+    BATCH_MAX = 200
+
+    def __init__(self, path: Path, flush_interval: float = 2.0, on_written=None):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.on_written = on_written
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = connect(self.path)
+        db.executescript(SCHEMA)
+        db.close()
+        self._q = queue.Queue()
+        self._last = {}            # station → (title, artist) du dernier enregistrement
+        self._thread = threading.Thread(target=self._run, name="play-history", daemon=True)
+        self._thread.start()
+
+    # ---------- API (n'importe quel thread) ----------
+    def record(self, station: str, title: str, artist: str = "", art_url: str = None,
+               listeners: int = 0, live: bool = False, ts: float = None):
+        if title:
+            self._q.put((station, int(ts or time.time()), title, artist or "", art_url, int(listeners or 0), int(bool(live))))
+
+    def close(self, timeout: float = 3.0):
+        """Vide la file puis arrête l'écrivain."""
+        self._q.put(None)
+        self._thread.join(timeout)
+
+    def reader(self) -> "HistoryReader":
+        return HistoryReader(self.path)
+
+    # ---------- écrivain ----------
+    def _is_duplicate(self, db, row) -> bool:
+        station, _, title, artist = row[:4]
+        last = self._last.get(station)
+        if last is None:
+            r = db.execute("SELECT title, artist FROM plays WHERE station = ? ORDER BY ts DESC, id DESC LIMIT 1",
+                           (station,)).fetchone()
+            last = tuple(r) if r else None
+        if last == (title, artist):
+            self._last[station] = last
+            return True
+        self._last[station] = (title, artist)
+        return False
+
+    def _run(self):
+        db = connect(self.path)
+        stop = False
+        while not stop:
+            item = self._q.get()
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.BATCH_MAX:   # regroupe ce qui arrive pendant la fenêtre
+                left = deadline - time.monotonic()
+                if left <= 0 or batch[-1] is None:
+                    break
+                try:
+                    batch.append(self._q.get(timeout=left))
+                except queue.Empty:
+                    break
+            stop = None in batch
+            rows = [r for r in batch if r is not None and not self._is_duplicate(db, r)]
+            if not rows:
+                continue
+            try:
+                with db:
+                    db.executemany(f"INSERT INTO plays ({FIELDS}) VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            except sqlite3.Error as e:
+                print("[history]", e)
+                continue
+            if self.on_written:
+                counts = {}
+                for r in rows:
+                    counts[r[0]] = counts.get(r[0], 0) + 1
+                for station, n in counts.items():
+                    try:
+                        self.on_written(station, n)
+                    except Exception:
+                        pass
+        db.close()
+
+
+class HistoryReader:
+    """Lecture paginée de l'historique d'une station (du plus récent au plus ancien)."""
+
+    def __init__(self, path: Path):
+        self.db = connect(path)
+        self.db.row_factory = sqlite3.Row
+
+    def count(self, station: str, search: str = "") -> int:
+        where, args = self._where(station, search)
+        return self.db.execute(f"SELECT COUNT(*) FROM plays WHERE {where}", args).fetchone()[0]
+
+    def page(self, station: str, offset: int, limit: int, search: str = "") -> list:
+        where, args = self._where(station, search)
+        return self.db.execute(
+            f"SELECT {COLUMNS} FROM plays WHERE {where} ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+            (*args, limit, offset)).fetchall()
+
+    @staticmethod
+    def _where(station: str, search: str):
+        if not search:
+            return "station = ?", (station,)
+        like = f"%{search}%"
+        return "station = ? AND (title LIKE ? OR artist LIKE ?)", (station, like, like)
+
+    def close(self):
+        self.db.close()
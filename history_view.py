@@ -0,0 +1,114 @@
+# history_view.py — fenêtre d'historique : modèle Qt paginé au-dessus de history.HistoryReader
+
+import time
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QTableView, QHeaderView, QAbstractItemView
+
+from covercache import LRU
+
+
+class HistoryModel(QAbstractTableModel):
+    """Lignes chargées à la demande, par pages ; seules `max_pages` pages restent en mémoire."""
+    HEADERS = ("Heure", "Titre", "Artiste", "👥")
+
+    def __init__(self, reader, station: str, page_size: int = 200, max_pages: int = 8, parent=None):
+        super().__init__(parent)
+        self.reader = reader
+        self.station = station
+        self.search = ""
+        self.page_size = page_size
+        self.pages = LRU(max_pages)
+        self._count = reader.count(station)
+
+    # ---------- QAbstractTableModel ----------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._count
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.ToolTipRole):
+            return None
+        row = self._row(index.row())
+        if row is None:
+            return None
+        col = index.column()
+        if col == 0:
+            return time.strftime("%d/%m %H:%M", time.localtime(row["ts"]))
+        if col == 1:
+            return ("🔴 " if row["live"] else "") + row["title"]
+        if col == 2:
+            return row["artist"]
+        return row["listeners"]
+
+    def _row(self, i: int):
+        n, k = divmod(i, self.page_size)
+        page = self.pages.get(n)
+        if page is None:
+            page = self.reader.page(self.station, n * self.page_size, self.page_size, self.search)
+            self.pages.put(n, page)
+        return page[k] if k < len(page) else None
+
+    # ---------- mises à jour ----------
+    def reload(self, station: str = None, search: str = None):
+        self.beginResetModel()
+        if station is not None:
+            self.station = station
+        if search is not None:
+            self.search = search
+        self.pages.clear()
+        self._count = self.reader.count(self.station, self.search)
+        self.endResetModel()
+
+    def rows_added(self, station: str, n: int):
+        """Nouveaux titres écrits (plus récents → en tête) : insertion sans recharger la vue."""
+        if station != self.station or n <= 0:
+            return
+        if self.search:
+            return self.reload()
+        self.beginInsertRows(QModelIndex(), 0, n - 1)
+        self.pages.clear()   # les offsets ont glissé
+        self._count += n
+        self.endInsertRows()
+
+
+class HistoryDialog(QDialog):
+    def __init__(self, reader, station: str, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"🕘 Historique — {station}")
+        self.resize(640, 480)
+        v = QVBoxLayout(self)
+
+        self.search = QLineEdit(); self.search.setPlaceholderText("Rechercher un titre ou un artiste…")
+        self.search.setClearButtonEnabled(True)
+        v.addWidget(self.search)
+        # filtre appliqué après une courte pause de frappe (une requête, pas une par touche)
+        self._search_timer = QTimer(self); self._search_timer.setSingleShot(True); self._search_timer.setInterval(250)
+        self._search_timer.timeout.connect(lambda: self.model.reload(search=self.search.text().strip()))
+        self.search.textChanged.connect(self._search_timer.start)
+
+        self.model = HistoryModel(reader, station, parent=self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        # hauteur fixe : la vue n'interroge que les lignes visibles
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(24)
+        hh = self.table.horizontalHeader()
+        hh.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        hh.setSectionResizeMode(1, QHeaderView.Stretch)
+        hh.setSectionResizeMode(2, QHeaderView.Stretch)
+        hh.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+        v.addWidget(self.table)
+
+    def set_station(self, station: str):
+        self.setWindowTitle(f"🕘 Historique — {station}")
+        self.model.reload(station=station)
@@ -0,0 +1,107 @@
+# http_client.py — client HTTP unique du process (keep-alive, retries, timeouts, compteurs)
+
+import threading, time
+from typing import TYPE_CHECKING
+from urllib.parse import urlsplit
+
+import config, metrics
+
+if TYPE_CHECKING:
+    import requests
+
+# `requests` (et urllib3) ne sont importés qu'à la création de la session : l'import
+# coûte plusieurs dizaines de ms et n'est pas nécessaire pour afficher la fenêtre.
+
+DEFAULT_TIMEOUT = (3.05, 6)   # (connexion, lecture) en s
+
+_session = None
+_session_lock = threading.Lock()
+_stats = {}                    # endpoint → compteurs
+_stats_lock = threading.Lock()
+
+
+def session() -> "requests.Session":
+    """Session partagée : un pool keep-alive par hôte, retries avec backoff sur erreurs transitoires."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                retry = Retry(
+                    total=2, connect=2, read=1, backoff_factor=0.5,
+                    status_forcelist=(429, 502, 503, 504),
+                    allowed_methods=frozenset({"GET", "HEAD"}),
+                    respect_retry_after_header=True,
+                    raise_on_status=False,
+                )
+                adapter = HTTPAdapter(pool_connections=8, pool_maxsize=8, max_retries=retry)
+                s = requests.Session()
+                s.mount("https://", adapter)
+                s.mount("http://", adapter)
+                s.headers["User-Agent"] = f"{config.APP_NAME}/{config.CURRENT_VERSION}"
+                _session = s
+    return _session
+
+
+def endpoint(url: str) -> str:
+    """Clé de regroupement des compteurs : hôte + deux premiers segments du chemin."""
+    parts = urlsplit(url)
+    segs = [p for p in parts.path.split("/") if p][:2]
+    return parts.netloc + "/" + "/".join(segs)
+
+
+def _record(url: str, elapsed: float, ok: bool):
+    key = endpoint(url)
+    with _stats_lock:
+        st = _stats.setdefault(key, {"count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0})
+        st["count"] += 1
+        if not ok:
+            st["errors"] += 1
+        ms = elapsed * 1000
+        st["total_ms"] += ms
+        st["max_ms"] = max(st["max_ms"], ms)
+    metrics.observe("http " + key, elapsed)
+    if not ok:
+        metrics.incr("http.errors " + key)
+
+
+def stats() -> dict:
+    """Copie des compteurs par endpoint (count, errors, total_ms, max_ms, avg_ms)."""
+    with _stats_lock:
+        out = {k: dict(v) for k, v in _stats.items()}
+    for v in out.values():
+        v["avg_ms"] = v["total_ms"] / v["count"] if v["count"] else 0.0
+    return out
+
+
+def head(url: str, timeout=None, **kwargs) -> "requests.Response":
+    t0 = time.perf_counter()
+    kwargs.setdefault("allow_redirects", True)
+    try:
+        r = session().head(url, timeout=timeout or DEFAULT_TIMEOUT, **kwargs)
+    except Exception:
+        _record(url, time.perf_counter() - t0, False)
+        raise
+    _record(url, time.perf_counter() - t0, r.status_code < 400)
+    return r
+
+
+def get(url: str, timeout=None, validators: dict = None, **kwargs) -> "requests.Response":
+    """GET via la session partagée. `validators` : en-têtes If-None-Match / If-Modified-Since.
+
+    La latence mesurée est le temps jusqu'aux en-têtes (le corps peut être streamé ensuite).
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    if validators:
+        headers.update(validators)
+    t0 = time.perf_counter()
+    try:
+        r = session().get(url, timeout=timeout or DEFAULT_TIMEOUT, headers=headers, **kwargs)
+    except Exception:
+        _record(url, time.perf_counter() - t0, False)
+        raise
+    _record(url, time.perf_counter() - t0, r.status_code < 400)
+    return r
+
@@ -1,14 +1,35 @@
+import argparse
 import sys
 import utils
 
 def main():
+    ap = argparse.ArgumentParser(prog="InsporaRadio")
+    ap.add_argument("--headless", action="store_true", help="audio + présence Discord sans interface (pas de Qt)")
+    ap.add_argument("--no-autoplay", action="store_true", help="avec --headless : ne pas lancer la lecture au démarrage")
+    ap.add_argument("--proxy", action="store_true", help="avec --headless : servir le proxy local de métadonnées")
+    ap.add_argument("--ctl", nargs="+", metavar="CMD", help="commande pour le démon --headless (play, stop, station <nom>, volume <n>, status…)")
+    args, qt_args = ap.parse_known_args()
+
+    if args.ctl:
+        import headless
+        try:
+            print(headless.send_command(" ".join(args.ctl)))
+        except OSError as e:
+            print("Démon injoignable :", e, file=sys.stderr)
+            sys.exit(1)
+        return
+
     # IMPORTANT : charger libVLC AVANT d'importer quelque module qui importe vlc
     utils.load_vlc_portable()
 
+    if args.headless:
+        import headless
+        sys.exit(headless.run(autoplay=False if args.no_autoplay else None, proxy=True if args.proxy else None))
+
     from PySide6.QtWidgets import QApplication
     from ui import MainWindow
 
-    app = QApplication(sys.argv)
+    app = QApplication(sys.argv[:1] + qt_args)
     win = MainWindow()
     win.show()
     sys.exit(app.exec())
@@ -0,0 +1,360 @@
+# metadata_proxy.py — proxy local de métadonnées : un seul poller amont, N clients locaux
+# Sans dépendance Qt : démarré par l'interface ou par le mode --headless (réglage "metadata_proxy").
+#
+# Routes (127.0.0.1 uniquement, format compatible AzuraCast) :
+#   /api/stations                        catalogue de stations (stations.json)
+#   /api/nowplaying                      liste des payloads nowplaying de toutes les stations
+#   /api/statuses                        {nom de station: payload} (StationStatusAggregator)
+#   /api/nowplaying/<station>            payload d'une station (nom, id ou shortcode) ;
+#                                        ?since=<version>&wait=<s> : long-poll jusqu'au prochain changement
+#   /api/live/nowplaying/sse[?station=]  flux SSE façon Centrifugo (lisible par NowPlayingStream)
+#   /cover?url=<url de pochette>         pochette servie depuis le cache disque partagé ; seules les
+#                                        URL présentes dans les payloads du hub sont acceptées
+#
+# Pas d'en-tête CORS par défaut (une page web quelconque ne doit pas pouvoir lire le proxy) :
+# config.PROXY_CORS_ORIGIN autorise une origine précise (overlay de stream…).
+
+import json, math, threading, time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs, quote, unquote
+
+import config, http_client, metrics
+from covercache import LRU
+from nowplaying_data import fetch_statuses, plan_requests
+
+
+def _art_urls(data: dict):
+    """URL de pochettes d'un payload AzuraCast (titre en cours, suivant, historique)."""
+    entries = [data.get("now_playing"), data.get("playing_next"), *(data.get("song_history") or [])]
+    for e in entries:
+        art = ((e or {}).get("song") or {}).get("art")
+        if isinstance(art, str) and art.startswith(("http://", "https://")):
+            yield art
+
+
+class MetadataHub:
+    """État now-playing de toutes les stations, tenu à jour par un seul thread amont.
+
+    Les stations d'un même serveur AzuraCast partagent une requête (endpoint global),
+    avec le même regroupement que StationStatusAggregator (nowplaying_data.plan_requests).
+    Chaque changement de titre / d'auditeurs incrémente `version` et réveille les
+    clients en attente (long-poll, SSE).
+    """
+
+    def __init__(self, stations: dict, interval: float = 10, cover_cache=None):
+        self.interval = interval
+        self.cover_cache = cover_cache     # covercache.DiskCache partagé avec l'interface
+        self._stations = stations
+        self._cond = threading.Condition()
+        self._np = {}                      # nom → payload AzuraCast brut
+        self._versions = {}                # nom → version du dernier changement
+        self._covers = LRU(256)            # pochettes annoncées par l'amont : les seules servies par /cover
+        self.version = 0
+        self._wake = threading.Event()
+        self._running = False
+        self._thread = None
+
+    # ---------- API ----------
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="metadata-hub", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        self._wake.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def set_stations(self, stations: dict):
+        self._stations = stations
+        self._wake.set()
+
+    @property
+    def stations(self) -> dict:
+        return self._stations
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def resolve(self, key: str):
+        """Nom de station à partir d'un nom, d'un id ou d'un shortcode AzuraCast."""
+        if key in self._np or key in (self._stations.get("stations") or {}):
+            return key
+        with self._cond:
+            for name, data in self._np.items():
+                st = data.get("station") or {}
+                if key in (str(st.get("id", "")), st.get("shortcode")):
+                    return name
+        return None
+
+    def get(self, name: str):
+        with self._cond:
+            return self._np.get(name), self._versions.get(name, 0)
+
+    def all(self):
+        with self._cond:
+            return list(self._np.values()), self.version
+
+    def versions(self) -> dict:
+        """nom → (payload, version) pour toutes les stations connues."""
+        with self._cond:
+            return {name: (data, self._versions.get(name, 0)) for name, data in self._np.items()}
+
+    def wait(self, name, since: int, timeout: float):
+        """Bloque jusqu'à une version > `since` (de la station, ou globale si `name` est None)."""
+        end = time.monotonic() + timeout
+        with self._cond:
+            def changed():
+                v = self._versions.get(name, 0) if name else self.version
+                return v > since or not self._running
+            while not changed():
+                left = end - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            return self.version
+
+    def cover(self, url: str):
+        """Octets de la pochette : cache disque, sinon un seul téléchargement amont.
+
+        LookupError si `url` n'apparaît dans aucun payload reçu (le proxy ne relaie pas
+        d'URL arbitraire : pas d'accès au réseau local par son intermédiaire)."""
+        with self._cond:
+            if url not in self._covers:
+                raise LookupError(url)
+        cache = self.cover_cache
+        if cache is None:
+            r = http_client.get(url)
+            r.raise_for_status()
+            return r.content
+        with cache.claim(url):   # N clients sur la même pochette → 1 téléchargement
+            data, validators, fresh = cache.lookup(url)
+            if data is not None and fresh:
+                return data
+            try:
+                r = http_client.get(url, validators=validators if data is not None else None)
+                if r.status_code == 304 and data is not None:
+                    cache.touch(url)
+                    return data
+                r.raise_for_status()
+            except OSError:
+                if data is not None:
+                    return data   # copie ancienne plutôt que rien
+                raise
+            cache.store(url, r.content, r.headers)
+            return r.content
+
+    # ---------- amont ----------
+    @staticmethod
+    def _signature(data: dict):
+        song = ((data.get("now_playing") or {}).get("song") or {})
+        return song.get("id") or (song.get("title"), song.get("artist")), (data.get("listeners") or {}).get("total")
+
+    def _publish(self, results: dict):
+        with self._cond:
+            changed = False
+            for name, data in results.items():
+                old = self._np.get(name)
+                self._np[name] = data
+                for art in _art_urls(data):
+                    self._covers.put(art, True)
+                if old is None or self._signature(old) != self._signature(data):
+                    self.version += 1
+                    self._versions[name] = self.version
+                    changed = True
+            if changed:
+                metrics.incr("proxy.changes")
+                self._cond.notify_all()
+
+    def _next_delay(self) -> float:
+        """Intervalle normal, raccourci pour repasser juste après la fin du titre en cours."""
+        delay = self.interval
+        with self._cond:
+            for data in self._np.values():
+                remaining = (data.get("now_playing") or {}).get("remaining")
+                if isinstance(remaining, (int, float)) and remaining >= 0:
+                    delay = min(delay, remaining + 1)
+        return max(3.0, delay)   # AzuraCast met parfois quelques s à basculer : pas de rafale
+
+    def _run(self):
+        while self._running:
+            self._wake.clear()
+            results = {}
+            for url, ids in plan_requests(self._stations):
+                try:
+                    results.update(fetch_statuses(url, ids)[0])
+                except Exception as e:
+                    print("[MetadataHub]", url, e)
+            metrics.incr("proxy.upstream_cycles")
+            if results:
+                self._publish(results)
+            self._wake.wait(self._next_delay())
+
+
+def nowplaying_url(base: str, station: str) -> str:
+    return f"{base}/api/nowplaying/{quote(station, safe='')}"
+
+
+def sse_url(base: str, station: str) -> str:
+    return f"{base}/api/live/nowplaying/sse?station={quote(station, safe='')}"
+
+
+def find_running(port: int = None, timeout: float = 0.5) -> Optional[str]:
+    """URL d'un proxy déjà servi sur la machine (autre instance), sinon None."""
+    url = f"http://127.0.0.1:{config.PROXY_PORT if port is None else port}"
+    try:
+        r = http_client.get(url + "/api/stations", timeout=timeout)
+        if r.status_code == 200 and isinstance(r.json().get("stations"), dict):
+            return url
+    except Exception:
+        pass
+    return None
+
+
+def _image_type(data: bytes) -> str:
+    if data[:8] == b"\x89PNG\r\n\x1a\n":
+        return "image/png"
+    if data[:3] == b"\xff\xd8\xff":
+        return "image/jpeg"
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "image/webp"
+    if data[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    return "application/octet-stream"
+
+
+class MetadataProxy:
+    """Serveur HTTP local au-dessus d'un MetadataHub (un thread par client, long-poll et SSE compris)."""
+
+    LONGPOLL_MAX = 60   # s
+
+    def __init__(self, hub: MetadataHub, port: int = None, host: str = "127.0.0.1", cors_origin: str = None):
+        self.hub = hub
+        self.cors_origin = config.PROXY_CORS_ORIGIN if cors_origin is None else cors_origin
+        self.httpd = ThreadingHTTPServer((host, config.PROXY_PORT if port is None else port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.hub.start()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metadata-proxy", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.hub.stop()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        hub, proxy = self.hub, self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _cors(self):
+                if proxy.cors_origin:
+                    self.send_header("Access-Control-Allow-Origin", proxy.cors_origin)
+                    self.send_header("Vary", "Origin")
+
+            def _send(self, code, body: bytes = b"", ctype="application/json", headers=None):
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self._cors()
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _json(self, obj, version: int = None):
+                headers = {}
+                if version is not None:
+                    tag = f'"v{version}"'
+                    if self.headers.get("If-None-Match") == tag:
+                        return self._send(304, headers={"ETag": tag})
+                    headers = {"ETag": tag, "X-Version": str(version)}
+                self._send(200, json.dumps(obj, ensure_ascii=False).encode("utf-8"), headers=headers)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                path, query = unquote(parts.path.rstrip("/")), parse_qs(parts.query)
+                metrics.incr("proxy.requests")
+                try:
+                    if path == "/api/stations":
+                        return self._json(hub.stations)
+                    if path == "/api/nowplaying":
+                        data, version = hub.all()
+                        return self._json(data, version)
+                    if path == "/api/statuses":
+                        return self._json({name: data for name, (data, _) in hub.versions().items()}, hub.version)
+                    if path.startswith("/api/nowplaying/"):
+                        return self._nowplaying(path[len("/api/nowplaying/"):], query)
+                    if path == "/api/live/nowplaying/sse":
+                        return self._sse(query)
+                    if path == "/cover" and query.get("url"):
+                        data = hub.cover(query["url"][0])
+                        return self._send(200, data, _image_type(data), {"Cache-Control": "max-age=3600"})
+                    self._send(404, b'{"error": "not found"}')
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+                except LookupError:
+                    self._send(404, b'{"error": "pochette inconnue"}')
+                except Exception as e:
+                    self._send(502, json.dumps({"error": str(e)}).encode("utf-8"))
+
+            def _nowplaying(self, key: str, query: dict):
+                name = hub.resolve(key)
+                if name is None:
+                    return self._send(404, b'{"error": "station inconnue"}')
+                if "since" in query:
+                    try:
+                        since = int(query["since"][0])
+                        wait = float(query.get("wait", ["25"])[0])
+                    except ValueError:
+                        wait = math.nan
+                    if not math.isfinite(wait):
+                        return self._send(400, b'{"error": "since / wait invalides"}')
+                    hub.wait(name, since, min(max(wait, 0.0), proxy.LONGPOLL_MAX))
+                data, version = hub.get(name)
+                if data is None:
+                    return self._send(503, b'{"error": "pas encore de donnees"}', headers={"Retry-After": "2"})
+                self._json(data, version)
+
+            def _sse(self, query: dict):
+                only = hub.resolve(query["station"][0]) if query.get("station") else None
+                self.close_connection = True   # flux sans Content-Length : fin = fermeture
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self._cors()
+                self.end_headers()
+                metrics.incr("proxy.sse_clients")
+                sent = {}                       # nom → version déjà envoyée
+                version = -1
+                while hub.running:
+                    for name, (data, v) in hub.versions().items():
+                        if (only and name != only) or sent.get(name) == v:
+                            continue
+                        sent[name] = v
+                        short = (data.get("station") or {}).get("shortcode") or name
+                        msg = {"channel": f"station:{short}", "pub": {"data": {"np": data}}}
+                        self.wfile.write(f"data: {json.dumps(msg, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    self.wfile.flush()
+                    new = hub.wait(only, version, 25)
+                    if new == version:
+                        self.wfile.write(b"data: {}\n\n")   # ping (même rythme que Centrifugo)
+                    version = new
+
+        return Handler
@@ -0,0 +1,180 @@
+# metrics.py — compteurs, histogrammes de latence et détecteur de blocage de la boucle principale
+# Sans dépendance Qt : utilisable depuis n'importe quel thread (et en mode sans interface).
+
+import json, os, sys, threading, time, traceback
+from collections import deque
+from contextlib import contextmanager
+from pathlib import Path
+
+# bornes supérieures des classes de latence (ms) ; la dernière classe est « au-delà »
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+_lock = threading.Lock()
+_counters = {}
+_hists = {}
+_stalls = deque(maxlen=100)
+_t0 = time.time()
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float):
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.total += ms
+        if ms > self.max:
+            self.max = ms
+
+    def quantile(self, q: float) -> float:
+        """Borne haute de la classe contenant le quantile `q` (approximation)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(float(BUCKETS_MS[i]), self.max) if i < len(BUCKETS_MS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {"count": self.count, "avg_ms": self.total / self.count if self.count else 0.0,
+                "p50_ms": self.quantile(0.5), "p95_ms": self.quantile(0.95), "max_ms": self.max,
+                "buckets": {("≤%d" % b if i < len(BUCKETS_MS) else ">%d" % BUCKETS_MS[-1]): n
+                            for i, (b, n) in enumerate(zip(BUCKETS_MS + (BUCKETS_MS[-1],), self.counts)) if n}}
+
+
+def incr(name: str, n: int = 1):
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def observe(name: str, seconds: float):
+    with _lock:
+        h = _hists.get(name)
+        if h is None:
+            h = _hists[name] = Histogram()
+        h.add(seconds * 1000)
+
+
+@contextmanager
+def timed(name: str):
+    """Chronomètre un bloc ; une exception compte aussi dans `<name>.errors`."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        incr(name + ".errors")
+        raise
+    finally:
+        observe(name, time.perf_counter() - t0)
+
+
+def record_stall(ms: float, site: str, stack: list):
+    incr("mainloop.stalls")
+    observe("mainloop.stall", ms / 1000)
+    with _lock:
+        _stalls.append({"ts": int(time.time()), "ms": round(ms, 1), "site": site, "stack": stack})
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "uptime_s": int(time.time() - _t0),
+            "counters": dict(sorted(_counters.items())),
+            "latency": {k: h.to_dict() for k, h in sorted(_hists.items())},
+            "stalls": list(_stalls),
+        }
+
+
+def format_text(snap: dict = None) -> str:
+    """Rendu texte compact (panneau de debug)."""
+    snap = snap or snapshot()
+    lines = [f"uptime {snap['uptime_s']} s", "", "— latences (ms) —"]
+    for k, h in snap["latency"].items():
+        lines.append(f"{k:<40} n={h['count']:<5} p50≤{h['p50_ms']:<6.0f} p95≤{h['p95_ms']:<6.0f} max={h['max_ms']:.0f}")
+    lines += ["", "— compteurs —"]
+    hours = max(snap["uptime_s"], 1) / 3600
+    lines += [f"{k:<40} {v:<8} {v / hours:>8.0f}/h" for k, v in snap["counters"].items()]
+    lines += ["", f"— blocages de la boucle principale ({len(snap['stalls'])}) —"]
+    for s in reversed(snap["stalls"][-15:]):
+        lines.append(f"{time.strftime('%H:%M:%S', time.localtime(s['ts']))}  {s['ms']:>7.0f} ms  {s['site']}")
+    return "\n".join(lines)
+
+
+def dump(path):
+    """Écrit l'instantané en JSON (écriture atomique)."""
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(snapshot(), ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        return False
+
+
+class StallWatchdog:
+    """Détecte les blocages de la boucle d'événements principale.
+
+    La boucle appelle `beat()` à intervalle régulier (timer Qt, tâche asyncio…) ;
+    un thread de surveillance relève la pile du thread principal quand aucun
+    battement n'arrive depuis `threshold_ms`, puis enregistre la durée totale du
+    blocage et le site d'appel responsable (première frame du code de l'appli).
+    """
+
+    def __init__(self, threshold_ms: int = 200, poll_ms: int = 50):
+        self.threshold = threshold_ms / 1000
+        self.poll = poll_ms / 1000
+        self._main = threading.main_thread().ident
+        self._beat = time.monotonic()
+        self._stall = None        # (site, pile) capturés pendant le blocage en cours
+        self._thread = None
+        self._root = str(Path(__file__).resolve().parent)
+
+    def beat(self):
+        now = time.monotonic()
+        stall, self._stall = self._stall, None
+        if stall is not None and now - self._beat > self.threshold:
+            record_stall((now - self._beat) * 1000, *stall)
+        self._beat = now
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._beat = time.monotonic()
+        self._stall = None
+        self._thread = threading.Thread(target=self._run, name="stall-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._thread = None     # le thread en cours s'arrête au prochain tour (même après un start())
+
+    def _capture(self):
+        frame = sys._current_frames().get(self._main)
+        if frame is None:
+            return "?", []
+        stack = traceback.extract_stack(frame)
+        lines = [f"{Path(f.filename).name}:{f.lineno} {f.name}" for f in stack[-12:]]
+        # site = frame la plus profonde appartenant à l'appli (pas à Qt / requests / stdlib)
+        own = [f for f in stack if f.filename.startswith(self._root) and f.name != "beat"]
+        site = own[-1] if own else stack[-1]
+        return f"{Path(site.filename).name}:{site.lineno} {site.name}", lines
+
+    def _run(self):
+        me = threading.current_thread()
+        while self._thread is me:
+            time.sleep(self.poll)
+            if self._stall is None and time.monotonic() - self._beat > self.threshold:
+                self._stall = self._capture()
@@ -0,0 +1,386 @@
+# nowplaying.py — récupération du "now playing" AzuraCast hors du thread GUI
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+
+from PySide6.QtCore import QObject, QThread, Signal, QBuffer, QByteArray, QIODevice, QSize
+from PySide6.QtGui import QImage, QImageReader
+
+import http_client, metrics
+from nowplaying_data import NowPlaying, fetch_statuses, plan_requests   # NowPlaying réexporté : modèle sans Qt (mode --headless)
+
+
+def decode_cover(data: bytes, size: QSize, dpr: float = 1.0) -> QImage:
+    """Décode une pochette directement à la taille physique `size` (remplissage + recadrage centré).
+
+    `QImageReader.setScaledSize` évite de garder l'image pleine résolution (et, en JPEG,
+    de la décoder entièrement). Utilisable hors du thread GUI ; QImage nulle si illisible.
+    """
+    buf = QBuffer()
+    buf.setData(QByteArray(data))
+    buf.open(QIODevice.ReadOnly)
+    reader = QImageReader(buf)
+    src = reader.size()
+    w, h = size.width(), size.height()
+    if src.isValid() and src.width() > 0 and src.height() > 0:
+        k = max(w / src.width(), h / src.height())
+        reader.setScaledSize(QSize(max(w, round(src.width() * k)), max(h, round(src.height() * k))))
+    img = reader.read()
+    if img.isNull():
+        return img
+    if img.width() != w or img.height() != h:
+        img = img.copy((img.width() - w) // 2, (img.height() - h) // 2, w, h)
+    img.setDevicePixelRatio(dpr)
+    return img
+
+
+class NowPlayingWorker(QThread):
+    """Traite la dernière demande de refresh (les plus anciennes sont abandonnées).
+
+    Chaque demande porte un numéro de génération : `cancel()` ou une nouvelle
+    demande rendent obsolète la requête en cours, dont le résultat n'est jamais émis,
+    et ferment sa réponse HTTP (lecture du corps interrompue). Les demandes tournent
+    sur un petit pool : une requête encore bloquée sur un serveur lent (en-têtes pas
+    reçus) ne retarde pas celle de la nouvelle station.
+    Les pochettes sont décodées ici, à la taille d'affichage (`set_cover_size`) :
+    le thread GUI ne reçoit qu'une petite QImage.
+    """
+    fetched = Signal(object)      # NowPlaying
+    cover   = Signal(str, QImage)  # url, image déjà à la taille physique de la pochette
+    prefetched = Signal(str, QImage)  # pochette du prochain titre, à garder en cache
+    fail    = Signal(str)
+
+    CHUNK = 16 * 1024
+    WORKERS = 3
+
+    def __init__(self, timeout=None, cache=None, parent=None):
+        super().__init__(parent)
+        self.timeout = timeout
+        self.cache = cache         # covercache.DiskCache optionnel
+        self._cond = threading.Condition()
+        self._job = None           # (génération, type, station, url)
+        self._open = {}            # génération → réponses HTTP en cours de lecture
+        self._pool = ThreadPoolExecutor(self.WORKERS, thread_name_prefix="nowplaying")
+        self._gen = 0
+        self._running = True
+        self._last_art_url = None
+        self._cover_size = (QSize(112, 112), 1.0)   # taille logique, ratio de pixels
+
+    # ---------- API (thread GUI) ----------
+    def set_cover_size(self, size: QSize, dpr: float):
+        with self._cond:
+            self._cover_size = (QSize(size), dpr)
+
+    def request(self, station: str, url: str):
+        self._submit("np", station, url)
+
+    def request_cover(self, station: str, art_url: str):
+        """Télécharge seulement la pochette (métadonnées reçues par un autre transport)."""
+        if art_url and art_url != self._last_art_url:
+            self._submit("cover", station, art_url)
+
+    def _submit(self, kind: str, station: str, url: str):
+        with self._cond:
+            self._gen += 1
+            self._job = (self._gen, kind, station, url)
+            self._cond.notify()
+        self._close_stale()
+
+    def cancel(self):
+        """Abandonne la demande en attente et interrompt celle en cours."""
+        with self._cond:
+            self._gen += 1
+            self._job = None
+            self._last_art_url = None
+        self._close_stale()
+
+    def stop(self):
+        """Attend la fin de toutes les requêtes (sans délai max) : plus aucun signal après le retour."""
+        with self._cond:
+            self._running = False
+            self._gen += 1
+            self._job = None
+            self._cond.notify()
+        self._close_stale()
+        self.wait()
+        self._pool.shutdown(wait=True)
+
+    def _close_stale(self):
+        with self._cond:
+            stale = [r for gen, rs in self._open.items() if gen != self._gen for r in rs]
+        for r in stale:
+            r.close()   # le thread qui lit ce corps sort aussitôt (exception ignorée : demande obsolète)
+
+    # ---------- thread worker ----------
+    def _is_current(self, gen: int) -> bool:
+        with self._cond:
+            return self._running and gen == self._gen
+
+    def _read(self, r, gen: int) -> Optional[bytes]:
+        """Lit le corps en streaming ; renvoie None si la demande est devenue obsolète entre deux blocs."""
+        buf = bytearray()
+        for chunk in r.iter_content(self.CHUNK):
+            if not self._is_current(gen):
+                return None
+            buf += chunk
+        return bytes(buf)
+
+    @contextmanager
+    def _stream(self, url: str, gen: int, **kwargs):
+        """GET en streaming, fermé par `_close_stale` dès que la demande devient obsolète."""
+        r = http_client.get(url, stream=True, timeout=self.timeout, **kwargs)
+        with self._cond:
+            self._open.setdefault(gen, set()).add(r)
+        try:
+            with r:
+                yield r
+        finally:
+            with self._cond:
+                rs = self._open.get(gen, set())
+                rs.discard(r)
+                if not rs:
+                    self._open.pop(gen, None)
+
+    def _get(self, url: str, gen: int) -> Optional[bytes]:
+        with self._stream(url, gen) as r:
+            r.raise_for_status()
+            return self._read(r, gen)
+
+    def _get_cover(self, url: str, gen: int) -> Optional[bytes]:
+        """Pochette via le cache disque : frais → aucun réseau, sinon GET conditionnel."""
+        if self.cache is None:
+            return self._get(url, gen)
+        with self.cache.claim(url):   # cache partagé avec le proxy : un seul téléchargement par URL
+            cached, validators, fresh = self.cache.lookup(url)
+            if cached is not None and fresh:
+                return cached
+            try:
+                with self._stream(url, gen, validators=validators) as r:
+                    if r.status_code == 304 and cached is not None:
+                        self.cache.touch(url)
+                        return cached
+                    r.raise_for_status()
+                    data = self._read(r, gen)
+                    if data:
+                        self.cache.store(url, data, r.headers)
+                    return data
+            except OSError:   # requests.RequestException hérite d'IOError
+                if cached is not None:
+                    return cached  # hors-ligne : mieux vaut une copie ancienne que rien
+                raise
+
+    def _decode(self, data: bytes) -> Optional[QImage]:
+        with self._cond:
+            size, dpr = self._cover_size
+        with metrics.timed("cover.decode"):
+            img = decode_cover(data, QSize(round(size.width() * dpr), round(size.height() * dpr)), dpr)
+        return None if img.isNull() else img
+
+    def run(self):
+        while True:
+            with self._cond:
+                while self._running and self._job is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                job, self._job = self._job, None
+            self._pool.submit(self._process, *job)
+
+    def _process(self, gen: int, kind: str, station: str, url: str):
+        if not self._is_current(gen):
+            return
+        try:
+            art_url = url
+            if kind == "np":
+                raw = self._get(url, gen)
+                if raw is None or not self._is_current(gen):
+                    return
+                np = NowPlaying.from_api(station, json.loads(raw))
+                self.fetched.emit(np)
+                art_url = np.art_url
+
+            if art_url and art_url != self._last_art_url:
+                art = self._get_cover(art_url, gen)
+                img = self._decode(art) if art and self._is_current(gen) else None
+                if img is not None and self._is_current(gen):
+                    self._last_art_url = art_url
+                    self.cover.emit(art_url, img)
+
+            # préchargement de la pochette suivante → bascule instantanée au changement de titre
+            if kind == "np" and np.next_art_url and np.next_art_url != art_url:
+                nxt = self._get_cover(np.next_art_url, gen)
+                img = self._decode(nxt) if nxt and self._is_current(gen) else None
+                if img is not None and self._is_current(gen):
+                    self.prefetched.emit(np.next_art_url, img)
+        except Exception as e:
+            if self._is_current(gen):
+                self.fail.emit(str(e))
+
+
+class NowPlayingStream(QObject):
+    """Flux temps réel AzuraCast (SSE Centrifugo) — une seule connexion longue durée.
+
+    Tourne dans un thread Python daemon (une lecture SSE peut rester bloquée
+    longtemps : on ne veut pas retenir la fermeture de l'appli dessus).
+    Les signaux sont émis depuis ce thread et livrés en file au thread GUI.
+    """
+    fetched      = Signal(object)  # NowPlaying
+    connected    = Signal()
+    disconnected = Signal(str)
+
+    def __init__(self, station: str, url: str, read_timeout: float = 45, parent=None):
+        super().__init__(parent)
+        self.station = station
+        self.url = url
+        self.read_timeout = read_timeout  # Centrifugo envoie un ping ~toutes les 25 s
+        self._stop = threading.Event()
+        self._resp = None
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"sse-{self.station}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        try:
+            if self._resp is not None:
+                self._resp.close()
+        except Exception:
+            pass
+
+    # ---------- parsing ----------
+    @staticmethod
+    def extract_np(msg: dict) -> Optional[dict]:
+        """Retrouve le payload nowplaying dans un message Centrifugo (connect initial ou publication)."""
+        if not isinstance(msg, dict):
+            return None
+        if "now_playing" in msg:
+            return msg
+        pub = msg.get("pub") or (msg.get("push") or {}).get("pub")
+        if isinstance(pub, dict):
+            return (pub.get("data") or {}).get("np")
+        connect = msg.get("connect")
+        if isinstance(connect, dict):
+            for sub in (connect.get("subs") or {}).values():
+                pubs = (sub or {}).get("publications") or []
+                if pubs:
+                    return (pubs[-1].get("data") or {}).get("np")
+        return None
+
+    # ---------- thread ----------
+    def _run(self):
+        backoff = 1.0
+        while not self._stop.is_set():
+            try:
+                with http_client.get(self.url, stream=True, timeout=(5, self.read_timeout),
+                                  headers={"Accept": "text/event-stream"}) as r:
+                    r.raise_for_status()
+                    self._resp = r
+                    self.connected.emit()
+                    backoff = 1.0
+                    for line in r.iter_lines(decode_unicode=True):
+                        if self._stop.is_set():
+                            return
+                        if not line or not line.startswith("data:"):
+                            continue
+                        try:
+                            np = self.extract_np(json.loads(line[5:].strip()))
+                        except ValueError:
+                            continue
+                        if np:
+                            self.fetched.emit(NowPlaying.from_api(self.station, np))
+                raise ConnectionError("flux SSE fermé par le serveur")
+            except Exception as e:
+                self._resp = None
+                if self._stop.is_set():
+                    return
+                self.disconnected.emit(str(e))
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 60.0)
+
+
+class StationStatusAggregator(QThread):
+    """Rafraîchit now-playing + auditeurs de toutes les stations.
+
+    Les stations d'un même serveur AzuraCast (`.../api/nowplaying/<id>`) sont
+    regroupées sur l'endpoint global `.../api/nowplaying` : N stations = 1 requête.
+    Les requêtes d'un cycle sont étalées sur l'intervalle (pas de rafale) et chaque
+    requête réellement faite, repli station par station compris, compte dans le
+    budget `max_req_per_min`. La station en cours (`set_current`) est laissée au
+    NowPlayingWorker. Derrière le proxy local (`set_proxy`), une seule requête locale par cycle.
+    """
+    statuses = Signal(object)   # {nom de station: NowPlaying}
+
+    def __init__(self, stations: dict, interval: float = 30, max_req_per_min: float = 6, parent=None):
+        super().__init__(parent)
+        self.interval = interval
+        self.max_req_per_min = max_req_per_min
+        self._stations = stations
+        self._proxy = None
+        self._current = None
+        self._wake = threading.Event()
+        self._running = True
+
+    def set_proxy(self, url: str):
+        """Base du proxy de métadonnées (metadata_proxy) à interroger à la place des serveurs amont."""
+        self._proxy = url
+        self._wake.set()
+
+    def set_stations(self, stations: dict):
+        self._stations = stations
+        self._wake.set()
+
+    def set_current(self, name: str):
+        """Station déjà suivie par le NowPlayingWorker : pas interrogée ici."""
+        self._current = name
+
+    def stop(self, wait_ms: int = 2000):
+        self._running = False
+        self._wake.set()
+        self.wait(wait_ms)
+
+    # ---------- regroupement ----------
+    def _plan(self):
+        """Requêtes du cycle (nowplaying_data.plan_requests) ; derrière le proxy, une seule : (url, None)."""
+        if self._proxy:
+            return [(f"{self._proxy}/api/statuses", None)]
+        return plan_requests(self._stations, skip=self._current)
+
+    def _run_job(self, job):
+        """Exécute une requête planifiée ; renvoie (résultats, nombre de requêtes faites)."""
+        url, ids = job
+        if ids is None:
+            r = http_client.get(url)
+            r.raise_for_status()
+            payloads, count = r.json() or {}, 1
+        else:
+            payloads, count = fetch_statuses(url, ids)
+        return {name: NowPlaying.from_api(name, data) for name, data in payloads.items()}, count
+
+    def run(self):
+        while self._running:
+            self._wake.clear()
+            jobs = self._plan()
+            if not jobs:
+                self._wake.wait(self.interval)
+                continue
+            # une requête (ou un groupe) à la fois, étalées sur l'intervalle
+            slot = self.interval / len(jobs)
+            for job in jobs:
+                result, count = {}, 1
+                try:
+                    result, count = self._run_job(job)
+                except Exception as e:
+                    print("[StationStatus]", e)
+                if not self._running:
+                    return
+                if result:
+                    self.statuses.emit(result)
+                # budget : pas plus de max_req_per_min requêtes / minute (replis compris) ; le proxy est local
+                pause = slot if job[1] is None else max(slot, count * 60 / self.max_req_per_min)
+                if self._wake.wait(pause):
+                    break   # catalogue / proxy / station changés : nouveau plan
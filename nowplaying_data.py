@@ -0,0 +1,276 @@
+# nowplaying_data.py — modèle "now playing" AzuraCast, sans dépendance Qt
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import config, http_client, metrics
+
+
+@dataclass
+class NowPlaying:
+    """Résultat typé d'un appel à l'API nowplaying d'AzuraCast."""
+    station: str
+    title: str = "Inconnu"
+    artist: str = ""
+    art_url: Optional[str] = None
+    next_title: Optional[str] = None
+    next_artist: Optional[str] = None
+    next_art_url: Optional[str] = None
+    listeners: int = 0
+    live: bool = False
+    played_at: Optional[float] = None    # epoch s (horloge du serveur)
+    duration: Optional[float] = None     # s
+    remaining: Optional[float] = None    # s, au moment où le serveur a généré la réponse
+
+    @classmethod
+    def from_api(cls, station: str, data: dict) -> "NowPlaying":
+        data = data if isinstance(data, dict) else {}
+        np = data.get("now_playing", {}) or {}
+        song = np.get("song", {}) or {}
+        pn = data.get("playing_next", {}) or {}
+        pn_song = pn.get("song", {}) or {}
+        return cls(
+            station=station,
+            title=song.get("title", "Inconnu"),
+            artist=song.get("artist", ""),
+            art_url=song.get("art"),
+            next_title=pn_song.get("title"),
+            next_artist=pn_song.get("artist"),
+            next_art_url=pn_song.get("art"),
+            listeners=(data.get("listeners") or {}).get("total", 0),
+            live=(data.get("live") or {}).get("is_live", False),
+            played_at=_num(np.get("played_at")),
+            duration=_num(np.get("duration")),
+            remaining=_num(np.get("remaining")),
+        )
+
+
+def _num(v) -> Optional[float]:
+    return float(v) if isinstance(v, (int, float)) and v > 0 else None
+
+
+def split_api_url(url: str):
+    """`https://h/api/nowplaying/1` → (`https://h/api/nowplaying`, "1") ; sinon (None, None)."""
+    base, _, sid = (url or "").rstrip("/").rpartition("/")
+    if base.endswith("/api/nowplaying") and sid:
+        return base, sid
+    return None, None
+
+
+def plan_requests(stations: dict, skip: str = None) -> list:
+    """Requêtes pour l'état de toutes les stations du catalogue : [(url, {id: nom})].
+
+    Les stations d'un même serveur AzuraCast (`.../api/nowplaying/<id>`) sont regroupées sur
+    l'endpoint global `.../api/nowplaying` : N stations = 1 requête. `{None: nom}` = l'URL
+    d'une seule station. `skip` : station déjà suivie ailleurs, laissée de côté.
+    """
+    groups, singles = {}, []
+    for name, st in (stations.get("stations") or {}).items():
+        url = st.get("nowplaying_url")
+        if not url or name == skip:
+            continue
+        base, sid = split_api_url(url)
+        if base:
+            groups.setdefault(base, {})[sid] = name
+        else:
+            singles.append((url, {None: name}))
+    jobs = []
+    for base, ids in groups.items():
+        if len(ids) > 1:
+            jobs.append((base, ids))
+        else:
+            (sid, name), = ids.items()
+            jobs.append((f"{base}/{sid}", {None: name}))
+    return jobs + singles
+
+
+def fetch_statuses(url: str, ids: dict):
+    """Exécute une requête de `plan_requests` ; renvoie ({nom: payload brut}, nombre de requêtes faites).
+
+    Les stations absentes de la réponse globale (privées, endpoint désactivé…) sont
+    redemandées une par une ; l'échec de l'une ne fait pas perdre les résultats des autres.
+    """
+    if None in ids:
+        r = http_client.get(url)
+        r.raise_for_status()
+        return {ids[None]: r.json()}, 1
+    out, count = {}, 1
+    try:
+        r = http_client.get(url)
+        r.raise_for_status()
+        data = r.json()
+        for item in data if isinstance(data, list) else []:
+            st = item.get("station") or {}
+            for key in (str(st.get("id", "")), st.get("shortcode", "")):
+                if key in ids:
+                    out[ids[key]] = item
+                    break
+    except Exception as e:
+        print("[nowplaying] bulk", url, e)
+    for sid, name in ids.items():
+        if name in out:
+            continue
+        count += 1
+        try:
+            out.update(fetch_statuses(f"{url}/{sid}", {None: name})[0])
+        except Exception as e:
+            print("[nowplaying]", name, e)
+    return out, count
+
+
+def parse_icy_title(raw: str):
+    """`StreamTitle` ICY → (titre, artiste). AzuraCast envoie « Artiste - Titre »."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    artist, sep, title = raw.partition(" - ")
+    if not sep or not title.strip():
+        return raw, ""
+    return title.strip(), artist.strip()
+
+
+class IcyTracker:
+    """Titre annoncé dans le flux (ICY) face aux réponses de l'API nowplaying.
+
+    Le flux signale le changement de morceau avant l'API : son titre est affiché tout
+    de suite, et une réponse de l'API qui ne l'a pas encore vu est écartée puis
+    redemandée (RETRIES fois, toutes les RETRY_DELAY s). Partagé par l'interface et --headless.
+    """
+    RETRIES = 3
+    RETRY_DELAY = 4   # s
+
+    def __init__(self):
+        self.current = None   # (titre, artiste, brut) du morceau en cours selon le flux
+        self.retries = 0
+
+    @property
+    def active(self) -> bool:
+        return self.current is not None
+
+    def reset(self):
+        self.current = None
+
+    def matches(self, np: NowPlaying) -> bool:
+        title, _, raw = self.current
+        t = (np.title or "").casefold().strip()
+        return bool(t) and (t == title.casefold() or t in raw.casefold())
+
+    def on_title(self, raw: str, station: str, last: NowPlaying = None):
+        """Nouveau `StreamTitle` → (accepté, NowPlaying à afficher tout de suite ou None).
+
+        None quand l'API a déjà donné ce titre (`last`) ; auditeurs / direct repris de `last`."""
+        parsed = parse_icy_title(raw)
+        if parsed is None:
+            return False, None
+        self.current = (*parsed, raw)
+        self.retries = 0
+        if last is not None and self.matches(last):
+            return True, None
+        metrics.incr("icy.updates")
+        return True, NowPlaying(station, *parsed, listeners=last.listeners if last else 0,
+                                live=last.live if last else False)
+
+    def api_behind(self, np: NowPlaying) -> Optional[float]:
+        """None si la réponse de l'API est à prendre. Sinon elle n'a pas encore vu le morceau
+        annoncé par le flux (on garde le titre ICY) : délai avant de la redemander, 0 = plus d'essai."""
+        if self.current is None or self.matches(np):
+            return None
+        metrics.incr("icy.api_behind")
+        if self.retries >= self.RETRIES:
+            return 0
+        self.retries += 1
+        return self.RETRY_DELAY
+
+
+class PollSchedule:
+    """Délai avant le prochain appel à l'API nowplaying (remplace l'intervalle fixe de 12 s).
+
+    - lecture, fenêtre visible : prochain appel juste après la fin prévue du morceau
+      (`played_at + duration`, ou `remaining` si les horloges divergent), puis toutes
+      les NEAR s tant que le titre n'a pas changé (fin de morceau en retard, jingle…) ;
+    - titres ICY actifs : le flux signale les changements, l'API ne sert qu'à enrichir ;
+    - fenêtre réduite : même principe, sans polling rapproché et avec des bornes larges
+      (la présence Discord suit toujours les changements de morceau) ;
+    - radio arrêtée : STOPPED s ;
+    - échecs : backoff exponentiel.
+
+    `observe()` mesure aussi la fraîcheur : délai entre le début réel d'un morceau
+    et le moment où on l'a appris (histogramme `np.staleness`).
+    """
+    MARGIN  = 2       # s après la fin prévue (le temps que le serveur publie le nouveau titre)
+    NEAR    = 4       # s entre deux appels quand la fin prévue est dépassée
+    NEAR_MAX = 5      # appels rapprochés avant de revenir à l'intervalle normal
+    MIN     = 3
+    MAX     = 90      # auditeurs / « à suivre » restent raisonnablement frais
+    HIDDEN_MIN, HIDDEN_MAX = 10, 300
+    STOPPED = 300
+    SKEW    = 30      # s d'écart toléré entre l'horloge du serveur et la nôtre
+
+    def __init__(self):
+        self.track_end = None     # epoch s (notre horloge) de la fin prévue du morceau
+        self.key = None           # (station, titre, artiste) du dernier morceau vu
+        self.near = 0
+        self.failures = 0
+        self.last_fetch = None
+
+    def reset(self):
+        self.__init__()
+
+    def observe(self, np: NowPlaying, now: float = None):
+        now = time.time() if now is None else now
+        self.last_fetch, self.failures = now, 0
+        key = (np.station, np.title, np.artist)
+        changed = key != self.key
+        self.key = key
+        if changed:
+            self.near = 0
+            if np.played_at and self.track_end is not None:   # 1er morceau vu : pas de mesure
+                metrics.observe("np.staleness", min(600.0, max(0.0, now - np.played_at)))
+        else:
+            self._count_near(now)
+        end_abs = np.played_at + np.duration if np.played_at and np.duration else None
+        end_rel = now + np.remaining if np.remaining else None
+        if end_abs is not None and (end_rel is None or abs(end_abs - end_rel) <= self.SKEW):
+            self.track_end = end_abs
+        else:
+            self.track_end = end_rel
+
+    def failed(self, now: float = None):
+        self.failures += 1
+        self._count_near(time.time() if now is None else now)
+
+    def _count_near(self, now: float):
+        # appel fait après la fin prévue sans nouveau titre : un appel rapproché de consommé
+        if self.track_end is not None and now >= self.track_end:
+            self.near += 1
+
+    def due(self, now: float = None) -> bool:
+        """Une réponse est-elle déjà périmée (fin de morceau passée / trop ancienne) ?"""
+        now = time.time() if now is None else now
+        if self.last_fetch is None:
+            return True
+        if self.track_end is not None and now > self.track_end:
+            return True
+        return now - self.last_fetch > self.MAX
+
+    def next_delay(self, playing: bool = True, visible: bool = True, icy: bool = False,
+                   now: float = None) -> float:
+        """Sans effet de bord : peut être appelé plusieurs fois par cycle (UI)."""
+        now = time.time() if now is None else now
+        if not playing:
+            return self.STOPPED
+        lo, hi = (self.MIN, self.MAX) if visible else (self.HIDDEN_MIN, self.HIDDEN_MAX)
+        if self.failures:
+            return min(hi, config.NP_POLL_INTERVAL * 2 ** (self.failures - 1))
+        if icy:
+            return max(lo, config.ICY_POLL_INTERVAL)
+        if self.track_end is None:
+            return max(lo, config.NP_POLL_INTERVAL)
+        left = self.track_end + self.MARGIN - now
+        if left > 0:
+            return min(hi, max(lo, left))
+        # fin prévue dépassée sans changement de titre
+        if visible and self.near <= self.NEAR_MAX:
+            return self.NEAR
+        return max(lo, config.NP_POLL_INTERVAL)
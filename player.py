@@ -1,32 +1,77 @@
-import vlc
-import config
+from PySide6.QtCore import QObject, QTimer, Signal
+from player_core import PlayerCore
 
-class RadioPlayer:
-    def __init__(self):
-        self.instance = vlc.Instance("--no-video")
-        self.player = self.instance.media_player_new()
+class _QtCall:
+    """Appel différé sur la boucle Qt, annulable (équivalent de asyncio.TimerHandle)."""
 
-    def start_stream(self, url: str = None):
-        """(Re)crée le média avant lecture pour éviter les états bloqués."""
-        self.player.stop()
-        media = self.instance.media_new(url or config.STREAM_URL)
-        self.player.set_media(media)
-        self.player.play()
+    def __init__(self, parent: QObject, delay_s: float, fn):
+        self.fn = fn
+        self.timer = QTimer(parent)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self._fire)
+        self.timer.start(int(delay_s * 1000))
+
+    def _fire(self):
+        self.cancel()
+        self.fn()
+
+    def cancel(self):
+        if self.timer is not None:
+            self.timer.stop()
+            self.timer.deleteLater()
+            self.timer = None
+
+class RadioPlayer(QObject):
+    """Lecteur de l'interface : `player_core.PlayerCore` branché sur la boucle Qt.
+
+    Les callbacks du cœur deviennent des signaux : `state_changed`, `first_audio`,
+    `start_timings`, `metadata_changed` ; les événements libVLC (threads VLC) passent par un signal
+    interne pour être traités sur le thread Qt.
+    """
+    state_changed = Signal(str)
+    first_audio   = Signal(float, bool)   # secondes, démarrage pré-chauffé ?
+    start_timings = Signal(object)        # dict de mesures d'un démarrage
+    metadata_changed = Signal(str)        # titre ICY (StreamTitle) de la station en cours
+    _posted       = Signal(object, object)   # pont thread libVLC → thread Qt (fn, args)
+
+    def __init__(self, prewarm: bool = False, crossfade_ms: int = 400):
+        super().__init__()
+        self._posted.connect(lambda fn, args: fn(*args))
+        self.core = PlayerCore(
+            post=lambda fn, *args: self._posted.emit(fn, args),
+            call_later=lambda delay, fn: _QtCall(self, delay, fn),
+            on_state=self.state_changed.emit,
+            on_first_audio=self.first_audio.emit,
+            on_timings=self.start_timings.emit,
+            on_meta=self.metadata_changed.emit,
+            prewarm=prewarm, crossfade_ms=crossfade_ms,
+        )
+
+    # API utilisée par l'UI (délégation au cœur)
+    def start_stream(self, url: str = None, options: dict = None):
+        self.core.start_stream(url, options)
 
     def stop_stream(self):
-        self.player.stop()
+        self.core.stop_stream()
+
+    def is_active(self) -> bool:
+        return self.core.is_active()
+
+    def prewarm(self, url: str, options: dict = None):
+        self.core.prewarm(url, options)
+
+    def cancel_prewarm(self):
+        self.core.cancel_prewarm()
 
     def is_playing(self) -> bool:
-        try:
-            return bool(self.player.is_playing())
-        except Exception:
-            return False
+        return self.core.is_playing()
 
     def set_volume(self, v: int):
-        self.player.audio_set_volume(int(v))
+        self.core.set_volume(v)
 
     def state(self):
-        try:
-            return self.player.get_state()
-        except Exception:
-            return None
+        return self.core.state()
+
+    @property
+    def timings(self):
+        return self.core.timings
@@ -0,0 +1,294 @@
+# player_core.py — lecteur libVLC sans dépendance Qt (partagé par l'interface et le mode --headless)
+
+import random, time
+from collections import deque
+import vlc
+import config, metrics
+
+# événements libVLC suivis → nom d'état exposé à l'UI
+_EVENTS = (
+    (vlc.EventType.MediaPlayerOpening,         "opening"),
+    (vlc.EventType.MediaPlayerBuffering,       "buffering"),
+    (vlc.EventType.MediaPlayerPlaying,         "playing"),
+    (vlc.EventType.MediaPlayerStopped,         "stopped"),
+    (vlc.EventType.MediaPlayerEncounteredError, "error"),
+    (vlc.EventType.MediaPlayerEndReached,      "ended"),
+)
+
+_WARM_STATES = (vlc.State.Opening, vlc.State.Buffering, vlc.State.Playing)
+
+def media_options(opts: dict = None) -> list:
+    """Réglages réseau d'une station (clé `vlc` de stations.json) → options de média libVLC.
+
+    network_caching / live_caching (ms), http_reconnect (bool), clock_jitter (ms).
+    """
+    opts = opts or {}
+    out = []
+    for key, flag in (("network_caching", "network-caching"), ("live_caching", "live-caching"),
+                      ("clock_jitter", "clock-jitter")):
+        if isinstance(opts.get(key), (int, float)):
+            out.append(f":{flag}={int(opts[key])}")
+    if "http_reconnect" in opts:
+        out.append(":http-reconnect" if opts["http_reconnect"] else ":no-http-reconnect")
+    return out
+
+class PlayerCore:
+    """Lecteur libVLC piloté par événements (plus de polling de get_state()).
+
+    Indépendant de la boucle d'événements : l'hôte fournit
+      - `post(fn, *args)` : exécute `fn` sur le thread de la boucle (appelé depuis les threads libVLC) ;
+      - `call_later(delay_s, fn)` : minuterie, renvoie un objet avec `cancel()`.
+    (Qt : voir player.RadioPlayer ; asyncio : loop.call_soon_threadsafe / loop.call_later.)
+
+    `on_state` reçoit : opening, buffering, playing, stopped, error, ended,
+    reconnecting. Sur erreur/fin de flux pendant la lecture, une seule reconnexion
+    est planifiée à la fois, avec backoff exponentiel + jitter.
+
+    Mode `prewarm` : un second lecteur, muet, garde la station la plus probable
+    déjà connectée et bufferisée ; `start_stream` sur cette URL bascule dessus
+    (fondu enchaîné) au lieu de repartir de zéro. `on_first_audio(s, warm)` donne
+    le temps jusqu'au premier son de chaque démarrage.
+
+    Chaque démarrage est chronométré (`timings`, `on_timings`) :
+    connect = jusqu'au premier Buffering, buffering = Buffering → Playing,
+    first_audio = total jusqu'à Playing (secondes).
+
+    Métadonnées ICY : libVLC lit le `StreamTitle` du flux et signale chaque
+    changement (MediaMetaChanged) ; `on_meta(str)` reçoit le nouveau titre brut
+    (souvent « Artiste - Titre ») de la station en cours, dès le changement de morceau.
+    """
+    RETRY_BASE = 1.0    # s
+    RETRY_MAX  = 60.0   # s
+
+    def __init__(self, post, call_later, on_state=None, on_first_audio=None, on_timings=None,
+                 on_meta=None, prewarm: bool = False, crossfade_ms: int = 400):
+        self._post = post
+        self._call_later = call_later
+        self.on_state = on_state or (lambda s: None)
+        self.on_first_audio = on_first_audio or (lambda dt, warm: None)
+        self.on_timings = on_timings or (lambda t: None)
+        self.on_meta = on_meta or (lambda s: None)
+        self._medias = {}         # lecteur → (média, gestionnaire d'événements) : références à garder
+        self.meta = None          # dernier titre ICY émis
+        self.instance = vlc.Instance("--no-video")
+        self.player = self._new_player()
+        self.warm = self._new_player() if prewarm else None
+        self.warm_url = None
+        self.crossfade_ms = crossfade_ms
+        self.volume = 100
+        self.url = None
+        self.options = None       # réglages réseau de la station courante
+        self.current = None       # dernier état émis
+        self._want_play = False   # intention de l'utilisateur
+        self._retries = 0
+        self._retry = None        # reconnexion planifiée (handle de call_later)
+        self._start = None        # mesures du démarrage en cours
+        self.timings = deque(maxlen=200)
+
+    def _new_player(self):
+        mp = self.instance.media_player_new()
+        em = mp.event_manager()
+        for ev, name in _EVENTS:
+            # appelé depuis un thread libVLC : on ne fait que relayer vers la boucle de l'hôte
+            em.event_attach(ev, lambda _e, n=name, p=mp: self._post(self._on_vlc_event, p, n))
+        return mp
+
+    def _cancel_retry(self):
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+
+    def start_stream(self, url: str = None, options: dict = None):
+        """(Re)crée le média avant lecture pour éviter les états bloqués."""
+        previous = self.url if self._want_play else None
+        self.url = url or config.STREAM_URL
+        self.meta = None
+        self.options = options
+        self._want_play = True
+        self._retries = 0
+        self._cancel_retry()
+        if self.warm is not None and self.warm_url == self.url and self.warm.get_state() in _WARM_STATES:
+            self._begin_timing(warm=True)
+            self._swap(previous)
+        else:
+            self._begin_timing(warm=False)
+            self._play()
+
+    def _begin_timing(self, warm: bool):
+        self._start = {"url": self.url, "warm": warm, "options": media_options(self.options),
+                       "t0": time.perf_counter(), "connect": None, "buffering": None, "first_audio": None}
+
+    def _media(self, url: str, options: dict = None):
+        return self.instance.media_new(url, *media_options(options))
+
+    def _set_media(self, mp, url: str, options: dict = None):
+        media = self._media(url, options)
+        em = media.event_manager()
+        # thread libVLC : relais vers la boucle de l'hôte, get_meta() y sera appelé
+        em.event_attach(vlc.EventType.MediaMetaChanged, lambda _e, m=media: self._post(self._on_meta_event, m))
+        self._medias[mp] = (media, em)
+        mp.set_media(media)
+
+    def _play(self):
+        self.player.stop()
+        self._set_media(self.player, self.url, self.options)
+        self.player.audio_set_volume(self.volume)
+        self.player.play()
+
+    def stop_stream(self):
+        self._want_play = False
+        self.meta = None
+        self._cancel_retry()
+        self._start = None
+        self.player.stop()
+        self.cancel_prewarm()
+
+    def is_active(self) -> bool:
+        """Lecture demandée (en cours, en chargement ou en attente de reconnexion)."""
+        return self._want_play
+
+    # ---------- pré-chauffage ----------
+    def prewarm(self, url: str, options: dict = None):
+        """Connecte et bufferise `url` en silence sur le lecteur secondaire (mode prewarm seulement)."""
+        if self.warm is None or not url or url == self.url or url == self.warm_url:
+            return
+        self.warm.stop()
+        self._set_media(self.warm, url, options)
+        self.warm.audio_set_mute(True)
+        self.warm.play()
+        self.warm_url = url
+
+    def cancel_prewarm(self):
+        if self.warm is not None:
+            self.warm.stop()
+        self.warm_url = None
+
+    def _swap(self, previous_url):
+        """Le lecteur pré-chauffé devient principal ; l'ancien reste connecté, muet, sur `previous_url`."""
+        old, self.player = self.player, self.warm
+        self.warm, self.warm_url = old, None
+        self.current = None
+        self.player.audio_set_mute(False)
+        if self.crossfade_ms > 0:
+            self._crossfade(old, previous_url)
+        else:
+            self.player.audio_set_volume(self.volume)
+            self._park(old, previous_url)
+        if self.player.get_state() == vlc.State.Playing:
+            self._on_vlc_event(self.player, "playing")
+        media = self._medias.get(self.player, (None,))[0]
+        if media is not None:
+            self._on_meta_event(media)   # le lecteur pré-chauffé connaît déjà le titre en cours
+
+    def _park(self, old, url):
+        """Fin de bascule : l'ancien lecteur devient le lecteur pré-chauffé (station « précédente »)."""
+        if old is self.player or old is not self.warm or self.warm_url is not None:
+            return  # déjà réutilisé entre-temps
+        if url:
+            old.audio_set_mute(True)
+            self.warm_url = url
+        else:
+            old.stop()
+
+    def _crossfade(self, old, previous_url, steps: int = 10):
+        self.player.audio_set_volume(0)
+        step_s = max(1, self.crossfade_ms // steps) / 1000
+        state = {"i": 0}
+        def tick():
+            state["i"] += 1
+            k = state["i"] / steps
+            self.player.audio_set_volume(int(self.volume * k))
+            if old is not self.player:
+                old.audio_set_volume(int(self.volume * (1 - k)))
+            if state["i"] >= steps:
+                self._park(old, previous_url)
+            else:
+                self._call_later(step_s, tick)
+        self._call_later(step_s, tick)
+
+    # ---------- événements ----------
+    def _on_vlc_event(self, p, name: str):
+        if p is not self.player:
+            if p is self.warm and name == "playing":
+                self.warm.audio_set_mute(True)   # la sortie audio n'existe qu'à partir de Playing
+            return
+        if name == self.current:
+            return  # Buffering arrive en rafale (un événement par % de cache)
+        self.current = name
+        metrics.incr("vlc." + name)
+        if name == "playing":
+            self._retries = 0
+        self._measure(name)
+        self.on_state(name)
+        if name in ("error", "ended") and self._want_play:
+            self._schedule_reconnect()
+
+    def _on_meta_event(self, media):
+        if self._medias.get(self.player, (None,))[0] is not media:
+            return  # lecteur pré-chauffé ou média remplacé entre-temps
+        try:
+            title = media.get_meta(vlc.Meta.NowPlaying)
+        except Exception:
+            return
+        if title:
+            title = title.strip()
+        if not title or title == self.meta:
+            return  # MediaMetaChanged arrive aussi pour d'autres champs (genre, URL…)
+        self.meta = title
+        metrics.incr("vlc.icy_titles")
+        self.on_meta(title)
+
+    def _measure(self, name: str):
+        st = self._start
+        if st is None:
+            return
+        elapsed = time.perf_counter() - st["t0"]
+        if name == "buffering" and st["connect"] is None:
+            st["connect"] = elapsed
+        elif name == "playing":
+            st["first_audio"] = elapsed
+            if st["connect"] is not None:
+                st["buffering"] = elapsed - st["connect"]
+            self._start = None
+            del st["t0"]
+            self.timings.append(st)
+            metrics.observe("vlc.first_audio.warm" if st["warm"] else "vlc.first_audio", elapsed)
+            self.on_first_audio(elapsed, st["warm"])
+            self.on_timings(dict(st))
+        elif name in ("error", "ended"):
+            self._start = None   # démarrage avorté : pas de mesure
+        # "stopped" est ignoré : _play() fait un stop() juste avant chaque démarrage
+
+    def _schedule_reconnect(self):
+        if self._retry is not None:
+            return
+        delay = min(self.RETRY_MAX, self.RETRY_BASE * (2 ** self._retries))
+        delay *= random.uniform(0.5, 1.5)
+        self._retries += 1
+        metrics.incr("vlc.reconnects")
+        self._retry = self._call_later(delay, self._reconnect)
+        self.current = "reconnecting"
+        self.on_state("reconnecting")
+
+    def _reconnect(self):
+        self._retry = None
+        if self._want_play and self.url:
+            self._begin_timing(warm=False)
+            self._play()
+
+    # ---------- divers ----------
+    def is_playing(self) -> bool:
+        try:
+            return bool(self.player.is_playing())
+        except Exception:
+            return False
+
+    def set_volume(self, v: int):
+        self.volume = int(v)
+        self.player.audio_set_volume(self.volume)
+
+    def state(self):
+        try:
+            return self.player.get_state()
+        except Exception:
+            return None
@@ -1,16 +1,77 @@
-from pypresence import Presence
+import threading
 import time
+import metrics
 
 class DiscordRPCManager:
-    def __init__(self, client_id: str, app_name: str):
+    """Présence Discord gérée par un thread dédié (aucun appel IPC sur le thread GUI).
+
+    `update()` ne fait que déposer la dernière présence voulue (la plus récente
+    gagne) ; le worker ignore les doublons, respecte la limite de Discord
+    (~1 mise à jour / 15 s) et se reconnecte avec un backoff plafonné.
+    `on_status(bool)` est appelé depuis le worker quand la connexion change.
+    """
+    MIN_INTERVAL = 15.0   # s entre deux envois
+    RETRY_BASE   = 5.0
+    RETRY_MAX    = 300.0
+
+    def __init__(self, client_id: str, app_name: str, on_status=None):
         self.client_id = client_id
         self.app_name = app_name
+        self.on_status = on_status
         self.rpc = None
         self.start_ts = int(time.time())
         self.last_error = None
 
+        self._cond = threading.Condition()
+        self._pending = None     # dernière présence demandée
+        self._sent = None        # dernière présence réellement envoyée
+        self._last_send = 0.0
+        self._running = False
+        self._thread = None
+        self._last_status = None
+
+    # ---------- API (n'importe quel thread, non bloquante) ----------
+    def start(self):
+        if self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="discord-rpc", daemon=True)
+        self._thread.start()
+
+    def enabled(self) -> bool:
+        return self.rpc is not None
+
+    def update(self, title: str, artist: str, listeners: int, large_image: str,
+               small_image: str = None, small_text: str = None):
+        payload = {
+            "details": f"{title} — {artist}",
+            "state": f"👥 {listeners} auditeurs",
+            "start": self.start_ts,
+            "large_image": large_image,
+            "large_text": self.app_name,
+        }
+        if small_image:
+            payload["small_image"] = small_image
+            if small_text:
+                payload["small_text"] = small_text
+        with self._cond:
+            self._pending = payload
+            self._cond.notify()
+
+    def clear_close(self, timeout: float = 2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        else:
+            self._close()
+
+    # ---------- worker ----------
     def connect(self) -> bool:
         try:
+            from pypresence import Presence   # import coûteux (asyncio…) : seulement au premier usage
             self.rpc = Presence(self.client_id)
             self.rpc.connect()
             self.last_error = None
@@ -20,28 +81,7 @@ class DiscordRPCManager:
             self.last_error = str(e)
             return False
 
-    def enabled(self) -> bool:
-        return self.rpc is not None
-
-    def update(self, title: str, artist: str, listeners: int, large_image: str):
-        if not self.rpc:
-            return
-        try:
-            self.rpc.update(
-                details=f"{title} — {artist}",
-                state=f"👥 {listeners} auditeurs",
-                start=self.start_ts,
-                large_image=large_image,
-                large_text=self.app_name
-            )
-        except Exception as e:
-            self.last_error = str(e)
-            try:
-                self.connect()
-            except Exception:
-                pass
-
-    def clear_close(self):
+    def _close(self):
         try:
             if self.rpc:
                 self.rpc.clear()
@@ -49,3 +89,54 @@ class DiscordRPCManager:
         except Exception:
             pass
         self.rpc = None
+
+    def _status(self, ok: bool):
+        if ok == self._last_status:
+            return
+        self._last_status = ok
+        if self.on_status:
+            try:
+                self.on_status(ok)
+            except Exception:
+                pass
+
+    def _run(self):
+        backoff = self.RETRY_BASE
+        while self._running:
+            if self.rpc is None:
+                with metrics.timed("rpc.connect"):
+                    ok = self.connect()
+                metrics.incr("rpc.connect.ok" if ok else "rpc.connect.fail")
+                if ok:
+                    backoff = self.RETRY_BASE
+                    self._sent = None   # nouvelle session : renvoyer la présence
+                    self._status(True)
+                else:
+                    self._status(False)
+                    with self._cond:
+                        self._cond.wait_for(lambda: not self._running, timeout=backoff)
+                    backoff = min(backoff * 2, self.RETRY_MAX)
+                    continue
+
+            with self._cond:
+                self._cond.wait_for(lambda: not self._running or
+                                    (self._pending is not None and self._pending != self._sent))
+                if not self._running:
+                    break
+                delay = self._last_send + self.MIN_INTERVAL - time.monotonic()
+                if delay > 0:
+                    # une présence plus récente peut arriver entre-temps : on réévalue au réveil
+                    self._cond.wait(delay)
+                    continue
+                payload = self._pending
+
+            try:
+                with metrics.timed("rpc.update"):
+                    self.rpc.update(**payload)
+                self._sent = payload
+                self._last_send = time.monotonic()
+            except Exception as e:
+                self.last_error = str(e)
+                self._close()
+                self._status(False)
+        self._close()
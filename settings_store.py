@@ -0,0 +1,78 @@
+# settings_store.py — réglages en mémoire, écriture différée (write-behind) et atomique
+
+import threading, time
+from pathlib import Path
+import utils
+
+
+class SettingsStore:
+    """Dict de réglages : les modifications sont regroupées et écrites après `delay` s sans changement.
+
+    Glisser le volume de 0 à 100 ne produit donc qu'une écriture. `flush()` force
+    l'écriture (à appeler à la fermeture). Écriture atomique via `utils.save_json`.
+    Un seul thread écrivain (créé à la première modification) gère le délai ; la copie
+    des réglages est prise sous le verrou d'écriture disque, donc la dernière écriture
+    est toujours la plus récente.
+    """
+
+    def __init__(self, path: Path, defaults: dict, delay: float = 0.8):
+        self.path = Path(path)
+        self.delay = delay
+        self._data = {**defaults, **utils.load_json(self.path, {})}
+        self._lock = threading.Lock()      # protège _data / _dirty / _deadline
+        self._cond = threading.Condition(self._lock)
+        self._io_lock = threading.Lock()   # une seule écriture disque à la fois
+        self._dirty = False
+        self._deadline = None              # heure (monotonic) de la prochaine écriture différée
+        self._thread = None
+        self.writes = 0                    # nombre d'écritures disque réelles
+
+    # ---------- lecture ----------
+    def get(self, key, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    # ---------- écriture ----------
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def set(self, key, value):
+        with self._lock:
+            if key in self._data and self._data[key] == value:
+                return
+            self._data[key] = value
+            self._dirty = True
+            self._schedule()
+
+    def _schedule(self):
+        # appelé sous _lock : on repousse l'écriture à chaque modification
+        self._deadline = time.monotonic() + self.delay
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="settings-writer", daemon=True)
+            self._thread.start()
+        self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._deadline is None or time.monotonic() < self._deadline:
+                    self._cond.wait(None if self._deadline is None else self._deadline - time.monotonic())
+            self.flush()
+
+    def flush(self):
+        with self._io_lock:
+            with self._lock:
+                self._deadline = None
+                if not self._dirty:
+                    return
+                snapshot = dict(self._data)
+                self._dirty = False
+            if utils.save_json(self.path, snapshot):
+                self.writes += 1
+            else:
+                with self._lock:
+                    self._dirty = True   # on retentera au prochain flush
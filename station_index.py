@@ -0,0 +1,116 @@
+# station_index.py — catalogue de stations compact + index de recherche, sans dépendance Qt
+# Utilisé par le sélecteur de l'interface (station_picker.py) et par le mode --headless.
+
+import sys
+from typing import Any, Dict, List, Optional
+
+
+class StationRecord:
+    """Une station du catalogue : seulement ce que le sélecteur affiche / cherche."""
+    __slots__ = ("name", "tags", "genre", "country", "key")
+
+    def __init__(self, name: str, tags: tuple = (), genre: str = "", country: str = ""):
+        self.name = name
+        self.tags = tags
+        self.genre = genre
+        self.country = country
+        # clé de recherche pré-calculée : une seule chaîne casefold par station
+        self.key = " ".join((name, genre, country, *tags)).casefold()
+
+    def __repr__(self):
+        return f"StationRecord({self.name!r})"
+
+
+def _tags(value) -> tuple:
+    if isinstance(value, str):
+        value = value.split(",")
+    if not isinstance(value, (list, tuple)):
+        return ()
+    # tags / genres / pays se répètent énormément dans les annuaires : une seule copie en mémoire
+    return tuple(sys.intern(t.strip()) for t in value if isinstance(t, str) and t.strip())
+
+
+class StationIndex:
+    """Stations dans l'ordre du catalogue, accès par ligne ou par nom, recherche plein texte.
+
+    `search("jazz fr")` renvoie les lignes dont le nom, le genre, le pays ou un tag
+    contiennent tous les mots (insensible à la casse). Une
+    recherche qui prolonge la précédente (frappe au clavier) ne re-parcourt que les
+    résultats précédents.
+    """
+
+    def __init__(self, records: List[StationRecord]):
+        self.records = records
+        self._rows = {r.name: i for i, r in enumerate(records)}
+        self._last = ((), None)   # (mots, lignes) de la dernière recherche
+
+    @classmethod
+    def from_catalog(cls, stations: Dict[str, Any]) -> "StationIndex":
+        records = []
+        for name, st in (stations.get("stations") or {}).items():
+            st = st if isinstance(st, dict) else {}
+            genre, country = st.get("genre"), st.get("country")
+            records.append(StationRecord(
+                name, _tags(st.get("tags")),
+                sys.intern(genre) if isinstance(genre, str) else "",
+                sys.intern(country) if isinstance(country, str) else ""))
+        return cls(records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, row: int) -> StationRecord:
+        return self.records[row]
+
+    def row_of(self, name: str) -> int:
+        return self._rows.get(name, -1)
+
+    def names(self) -> List[str]:
+        return [r.name for r in self.records]
+
+    def search(self, query: str) -> Optional[List[int]]:
+        """Lignes correspondant à `query` (ordre du catalogue) ; None = pas de filtre."""
+        words = tuple(query.casefold().split())
+        if not words:
+            return None
+        last_words, last_rows = self._last
+        if last_rows is not None and len(words) >= len(last_words) and \
+                all(lw in w for w, lw in zip(words, last_words)):
+            candidates = last_rows          # la requête ne fait que se préciser
+        else:
+            candidates = range(len(self.records))
+        recs = self.records
+        rows = [i for i in candidates if all(w in recs[i].key for w in words)]
+        self._last = (words, rows)
+        return rows
+
+
+def normalize(data) -> Optional[Dict[str, Any]]:
+    """Annuaire façon radio-browser (liste d'objets `name`, `url_resolved`/`url`, `tags`…)
+    → format de stations.json (`{"default", "stations": {nom: {...}}}`). None si non reconnu."""
+    items = data.get("stations") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return None
+    out = {}
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        name = (it.get("name") or "").strip()
+        url = it.get("stream_url") or it.get("url_resolved") or it.get("url")
+        if not name or not isinstance(url, str) or not url.startswith("http"):
+            continue
+        base, n = name, 2
+        while name in out:        # noms en double fréquents dans les annuaires
+            name = f"{base} ({n})"; n += 1
+        st = {"stream_url": url}
+        for key in ("nowplaying_url", "genre", "country", "vlc"):
+            if it.get(key):
+                st[key] = it[key]
+        tags = _tags(it.get("tags"))
+        if tags:
+            st["tags"] = list(tags)
+        out[name] = st
+    if not out:
+        return None
+    default = data.get("default") if isinstance(data, dict) else None
+    return {"default": default if default in out else next(iter(out)), "stations": out}
@@ -0,0 +1,85 @@
+# station_picker.py — modèle Qt du sélecteur de stations au-dessus de station_index.StationIndex
+
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+
+from station_index import StationIndex
+
+
+class StationListModel(QAbstractListModel):
+    """Une ligne par station ; libellés calculés à l'affichage (seules les lignes visibles).
+
+    DisplayRole = libellé (`label(name)`, avec l'état en direct), EditRole / UserRole = nom
+    (itemData du QComboBox, texte inséré par la complétion), ToolTipRole = genre / pays / tags.
+    """
+
+    def __init__(self, catalog: StationIndex, label=None, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.label = label or (lambda name: name)
+
+    def set_catalog(self, catalog: StationIndex):
+        self.beginResetModel()
+        self.catalog = catalog
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.catalog)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        rec = self.catalog[index.row()]
+        if role == Qt.DisplayRole:
+            return self.label(rec.name)
+        if role in (Qt.EditRole, Qt.UserRole):
+            return rec.name
+        if role == Qt.ToolTipRole:
+            info = " · ".join(x for x in (rec.genre, rec.country, ", ".join(rec.tags)) if x)
+            return f"{rec.name}\n{info}" if info else rec.name
+        return None
+
+    def row_of(self, name: str) -> int:
+        return self.catalog.row_of(name)
+
+    def refresh(self, names):
+        """Libellés à redessiner (état en direct reçu pour `names`)."""
+        for name in names:
+            row = self.catalog.row_of(name)
+            if row >= 0:
+                i = self.index(row)
+                self.dataChanged.emit(i, i, [Qt.DisplayRole])
+
+
+class StationFilterProxy(QSortFilterProxyModel):
+    """Filtre de recherche : les correspondances sont calculées en une passe par l'index,
+    `filterAcceptsRow` n'est plus qu'un test d'appartenance."""
+
+    def __init__(self, source: StationListModel, parent=None):
+        super().__init__(parent)
+        self.query = ""
+        self._accept = None     # None = tout afficher
+        self.setSourceModel(source)
+        source.modelAboutToBeReset.connect(self._drop)
+        source.modelReset.connect(self._reapply)
+
+    def set_query(self, text: str):
+        text = text.strip()
+        if text == self.query:
+            return
+        self.query = text
+        self._apply()
+
+    def _apply(self):
+        rows = self.sourceModel().catalog.search(self.query)
+        self._accept = None if rows is None else set(rows)
+        self.invalidateFilter()
+
+    def _drop(self):
+        self._accept = None
+
+    def _reapply(self):
+        if self.query:
+            self._apply()   # nouveau catalogue : mêmes mots, autres lignes
+
+    def filterAcceptsRow(self, row, parent):
+        return self._accept is None or row in self._accept
@@ -0,0 +1,5 @@
+# tests/conftest.py — modules de l'appli importables depuis tests/ (disposition à plat, sans paquet)
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
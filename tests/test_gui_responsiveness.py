@@ -0,0 +1,103 @@
+# tests/test_gui_responsiveness.py — la boucle d'événements Qt reste fluide pendant un now-playing lent
+import json, os, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("PySide6")
+pytest.importorskip("requests")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+from nowplaying import NowPlayingWorker
+
+TICK_MS = 10
+MAX_LATE_MS = 50
+LATENCY = 1.5                 # s avant la réponse now-playing (sauf /api/nowplaying/fast)
+ART_BYTES = 4 * 1024 * 1024   # grosse pochette
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Serveur AzuraCast lent : réponse now-playing retardée + pochette volumineuse."""
+
+    def do_GET(self):
+        if self.path.startswith("/api/nowplaying"):
+            if not self.path.endswith("/fast"):
+                time.sleep(LATENCY)
+            host = f"http://127.0.0.1:{self.server.server_address[1]}"
+            body = json.dumps({"now_playing": {"song": {"title": "Titre", "artist": "Artiste",
+                                                        "art": f"{host}/art.png"}}}).encode()
+            ctype = "application/json"
+        elif self.path == "/art.png":
+            body, ctype = os.urandom(ART_BYTES), "image/png"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def slow_server():
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def test_slow_endpoint_does_not_block_event_loop(qapp, slow_server):
+    worker = NowPlayingWorker()
+    got, ticks = [], []
+    worker.fetched.connect(got.append)
+    worker.start()
+    try:
+        timer = QTimer(); timer.setInterval(TICK_MS)
+        timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+        loop = QEventLoop()
+        QTimer.singleShot(4000, loop.quit)
+        worker.cover.connect(lambda *_: QTimer.singleShot(200, loop.quit))
+        timer.start()
+        worker.request("Station1", f"{slow_server}/api/nowplaying/1")
+        loop.exec()
+        timer.stop()
+    finally:
+        worker.stop()
+    assert got, "aucune réponse now-playing"
+    assert len(ticks) > 1, "le timer GUI n'a jamais tourné"
+    gaps = [(b - a) * 1000 - TICK_MS for a, b in zip(ticks, ticks[1:])]
+    assert max(gaps) < MAX_LATE_MS, f"boucle GUI bloquée {max(gaps):.0f} ms"
+
+
+def test_station_change_does_not_queue_behind_slow_request(qapp, slow_server):
+    worker = NowPlayingWorker()
+    got = []
+    worker.fetched.connect(lambda np: got.append((np.station, time.perf_counter())))
+    worker.start()
+    try:
+        loop = QEventLoop()
+        QTimer.singleShot(3000, loop.quit)
+        worker.fetched.connect(lambda np: np.station == "Fast" and loop.quit())
+        worker.request("Slow", f"{slow_server}/api/nowplaying/slow")
+        QTimer.singleShot(100, lambda: worker.request("Fast", f"{slow_server}/api/nowplaying/fast"))
+        t0 = time.perf_counter()
+        loop.exec()
+    finally:
+        worker.stop()
+    fast = [t for station, t in got if station == "Fast"]
+    assert fast, "la nouvelle station n'a pas eu de réponse"
+    assert fast[0] - t0 < LATENCY - 0.5, "requête de la nouvelle station bloquée derrière l'ancienne"
+    assert all(station != "Slow" for station, _ in got), "résultat d'une demande obsolète émis"
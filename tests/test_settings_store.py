@@ -0,0 +1,27 @@
+# tests/test_settings_store.py — écriture différée des réglages : une écriture par rafale de modifications
+import json, time
+
+from settings_store import SettingsStore
+
+
+def test_slider_drag_writes_once(tmp_path):
+    path = tmp_path / "settings.json"
+    store = SettingsStore(path, {"volume": 80}, delay=0.2)
+    for v in range(100):              # glisser le volume : ~100 modifications rapprochées
+        store.set("volume", v)
+        time.sleep(0.001)
+    time.sleep(0.5)                   # délai écoulé
+    assert store.writes == 1
+    assert json.loads(path.read_text(encoding="utf-8"))["volume"] == 99
+
+
+def test_flush_on_close_persists_last_value(tmp_path):
+    path = tmp_path / "settings.json"
+    store = SettingsStore(path, {"volume": 80}, delay=60)
+    for v in range(100):
+        store.set("volume", v)
+    store.flush()                     # closeEvent
+    assert store.writes == 1
+    assert json.loads(path.read_text(encoding="utf-8"))["volume"] == 99
+    store.flush()                     # rien de nouveau : pas de deuxième écriture
+    assert store.writes == 1
@@ -0,0 +1,71 @@
+# tools/bench_choose_image.py — micro-benchmark : boucle historique vs automate compilé
+# Usage : python tools/bench_choose_image.py [--titles 2000]
+from pathlib import Path
+import argparse, random, string, sys, time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import utils
+
+
+def legacy_choose(images_map: dict, title: str, live: bool) -> str:
+    """Ancienne implémentation de utils.choose_image (référence)."""
+    if live:
+        return images_map.get("live", "logo_live")
+    for song_title, img in images_map.get("titles", {}).items():
+        if song_title.lower() in title.lower():
+            return img
+    return images_map.get("default", "logo_default")
+
+
+def make_map(n: int, rnd: random.Random) -> dict:
+    titles = {}
+    while len(titles) < n:
+        words = [''.join(rnd.choices(string.ascii_letters, k=rnd.randint(3, 9))) for _ in range(rnd.randint(1, 3))]
+        titles[" ".join(words)] = str(len(titles))
+    return utils.normalize_image_map({"titles": titles})
+
+
+def make_titles(m: dict, count: int, rnd: random.Random) -> list:
+    keys = list(m["titles"])
+    out = []
+    for i in range(count):
+        noise = ''.join(rnd.choices(string.ascii_lowercase + " ", k=40))
+        # moitié de titres qui matchent (clé aléatoire), moitié sans correspondance
+        out.append(f"{noise[:20]}{rnd.choice(keys).upper()}{noise[20:]}" if i % 2 else noise)
+    return out
+
+
+def timeit(fn, titles) -> float:
+    t0 = time.perf_counter()
+    for t in titles:
+        fn(t)
+    return (time.perf_counter() - t0) / len(titles)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--titles", type=int, default=2000, help="titres testés par taille de map")
+    args = ap.parse_args()
+    rnd = random.Random(42)
+
+    print(f"{'motifs':>8} {'compile':>10} {'boucle/titre':>14} {'automate/titre':>16} {'gain':>7}")
+    for n in (10, 1_000, 100_000):
+        m = make_map(n, rnd)
+        titles = make_titles(m, args.titles, rnd)
+        # la boucle est très lente à 100k : on échantillonne
+        legacy_titles = titles if n < 100_000 else titles[:max(20, args.titles // 100)]
+
+        t0 = time.perf_counter()
+        compiled = utils.compile_image_map(dict(m))
+        t_compile = time.perf_counter() - t0
+
+        for t in legacy_titles:
+            assert utils.choose_image(compiled, t, False) == legacy_choose(m, t, False), t
+
+        t_old = timeit(lambda t: legacy_choose(m, t, False), legacy_titles)
+        t_new = timeit(lambda t: utils.choose_image(compiled, t, False), titles)
+        print(f"{n:>8} {t_compile * 1e3:>8.1f}ms {t_old * 1e6:>12.1f}µs {t_new * 1e6:>14.1f}µs {t_old / t_new:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
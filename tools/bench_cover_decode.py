@@ -0,0 +1,78 @@
+# tools/bench_cover_decode.py — décodage des pochettes : coût sur le thread GUI et mémoire retenue
+# Usage : python tools/bench_cover_decode.py [--runs 20] [--dpr 2]
+#
+# avant (1.0.6)  : QPixmap.loadFromData sur le thread GUI, pixmap pleine résolution gardée (setScaledContents)
+# pré-scalé      : loadFromData + scaled() sur le thread GUI, seule la petite pixmap est gardée
+# worker         : nowplaying.decode_cover (QImageReader.setScaledSize) hors GUI ; le GUI ne fait que fromImage
+from pathlib import Path
+import argparse, os, statistics, sys, time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from PySide6.QtCore import QBuffer, QIODevice, QSize, Qt
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+from nowplaying import decode_cover
+from standin_server import make_png
+
+COVER = 112   # taille logique de lbl_cover
+
+
+def samples():
+    """Pochettes typiques : PNG et JPEG de 600, 1000 et 3000 px."""
+    out = {}
+    for px in (600, 1000, 3000):
+        png = make_png(px, 0)
+        out[f"png {px}"] = png
+        img = QImage.fromData(png)
+        buf = QBuffer(); buf.open(QIODevice.WriteOnly)
+        img.save(buf, "JPEG", 90)
+        out[f"jpeg {px}"] = bytes(buf.data())
+    return out
+
+
+def ms(fn, runs):
+    times, res = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        res = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), res
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=20)
+    ap.add_argument("--dpr", type=float, default=2.0)
+    args = ap.parse_args()
+    QApplication(sys.argv)   # PySide garde l'instance (qApp)
+    phys = QSize(round(COVER * args.dpr), round(COVER * args.dpr))
+
+    def before(data):
+        pix = QPixmap(); pix.loadFromData(data)
+        return pix
+
+    def prescaled(data):
+        pix = before(data)
+        return pix.scaled(phys, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+
+    print(f"{'image':<11} {'avant GUI ms':>13} {'ko gardés':>10} │ {'pré-scalé GUI ms':>17} {'ko':>6} │"
+          f" {'worker ms':>10} {'GUI ms':>7} {'ko':>6}")
+    for name, data in samples().items():
+        t_before, pix = ms(lambda: before(data), args.runs)
+        kb_before = pix.width() * pix.height() * pix.depth() / 8 / 1024
+        t_pre, pix = ms(lambda: prescaled(data), args.runs)
+        kb_pre = pix.width() * pix.height() * pix.depth() / 8 / 1024
+        t_worker, img = ms(lambda: decode_cover(data, phys, args.dpr), args.runs)
+        t_gui, _ = ms(lambda: QPixmap.fromImage(img), args.runs)
+        kb_worker = img.sizeInBytes() / 1024
+        print(f"{name:<11} {t_before:>13.1f} {kb_before:>10.0f} │ {t_pre:>17.1f} {kb_pre:>6.0f} │"
+              f" {t_worker:>10.1f} {t_gui:>7.2f} {kb_worker:>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
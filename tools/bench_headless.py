@@ -0,0 +1,82 @@
+# tools/bench_headless.py — coût mémoire / démarrage : mode --headless vs interface Qt
+# Usage : python tools/bench_headless.py [--runs 3]
+# « prêt » = lecteur, RPC et contrôle opérationnels (headless) / start_backend terminé (GUI).
+# Lecture automatique désactivée dans les deux cas : on ne mesure que l'appli, pas le flux audio.
+from pathlib import Path
+import argparse, os, statistics, subprocess, sys, time
+
+ROOT = Path(__file__).resolve().parents[1]
+
+GUI = r"""
+import sys, time
+t0 = time.perf_counter()
+import utils
+utils.load_vlc_portable()
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QTimer
+app = QApplication(sys.argv)
+import ui
+orig = ui.MainWindow.start_backend
+def start_backend(self):
+    orig(self)
+    print("READY %.1f" % ((time.perf_counter() - t0) * 1000), flush=True)
+ui.MainWindow.start_backend = start_backend
+win = ui.MainWindow()
+win.settings._data["autoplay"] = False   # pas d'écriture disque
+win.show()
+app.exec()
+"""
+
+
+def rss_mb(pid: int):
+    """RSS courante et pic (Mo) ; psutil si présent, sinon /proc (Linux)."""
+    try:
+        import psutil
+        mi = psutil.Process(pid).memory_info()
+        return mi.rss / 2**20, getattr(mi, "peak_wset", mi.rss) / 2**20
+    except ImportError:
+        fields = {}
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            k, _, v = line.partition(":")
+            fields[k] = v.strip()
+        return int(fields["VmRSS"].split()[0]) / 1024, int(fields["VmHWM"].split()[0]) / 1024
+
+
+def measure(cmd, env) -> dict:
+    t0 = time.perf_counter()
+    p = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    try:
+        for line in p.stdout:
+            if line.startswith(("READY", "[headless] prêt")):
+                ready_ms = (time.perf_counter() - t0) * 1000
+                time.sleep(1.0)   # laisser finir les initialisations en arrière-plan
+                rss, peak = rss_mb(p.pid)
+                return {"ready_ms": ready_ms, "rss_mb": rss, "peak_mb": peak}
+        raise RuntimeError(f"{cmd[1:]} : pas de signal « prêt »")
+    finally:
+        p.kill()
+        p.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+    env = {**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")}
+
+    modes = {
+        "headless": [sys.executable, "main.py", "--headless", "--no-autoplay"],
+        "gui": [sys.executable, "-c", GUI],
+    }
+    res = {}
+    for name, cmd in modes.items():
+        runs = [measure(cmd, env) for _ in range(args.runs)]
+        res[name] = {k: statistics.median(r[k] for r in runs) for k in runs[0]}
+        print(f"{name:<9} prêt en {res[name]['ready_ms']:6.0f} ms   RSS {res[name]['rss_mb']:6.1f} Mo"
+              f"   (pic {res[name]['peak_mb']:.1f} Mo)")
+    h, g = res["headless"], res["gui"]
+    print(f"gain headless : {g['ready_ms'] - h['ready_ms']:.0f} ms, {g['rss_mb'] - h['rss_mb']:.1f} Mo")
+
+
+if __name__ == "__main__":
+    main()
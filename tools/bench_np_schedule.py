@@ -0,0 +1,81 @@
+# tools/bench_np_schedule.py — polling now-playing : intervalle fixe (12 s) vs nowplaying_data.PollSchedule
+# Usage : python tools/bench_np_schedule.py [--hours 24] [--seed 1]
+#
+# Simulation (pas de réseau) : une station AzuraCast dont les morceaux durent 2 à 6 min ; la fin
+# réelle dérive de la durée annoncée de -3..+8 s (fondus, jingles) et le serveur publie le nouveau
+# titre 0..3 s après. La session est découpée en tiers : lecture fenêtre visible, lecture fenêtre
+# réduite, radio arrêtée (l'ancien timer tournait dans les trois cas).
+# Fraîcheur = délai entre le début réel d'un morceau et le premier appel qui le renvoie (lecture).
+from pathlib import Path
+import argparse, random, statistics, sys
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import config
+from nowplaying_data import NowPlaying, PollSchedule
+
+
+def playlist(hours: float, rng: random.Random):
+    """[(début réel, durée annoncée, publication)] sur toute la session."""
+    tracks, t = [], 0.0
+    while t < hours * 3600:
+        duration = rng.uniform(120, 360)
+        tracks.append((t, duration, t + rng.uniform(0, 3)))
+        t += duration + rng.uniform(-3, 8)
+    return tracks
+
+
+def phase(t: float, total: float):
+    """(lecture, fenêtre visible) à l'instant t."""
+    third = total / 3
+    return (t < 2 * third), (t < third)
+
+
+def response(tracks, t: float):
+    """Ce que renvoie l'API à l'instant t : dernier morceau publié."""
+    i = max(k for k, tr in enumerate(tracks) if tr[2] <= t) if t >= tracks[0][2] else 0
+    start, duration, _ = tracks[i]
+    np = NowPlaying("bench", f"titre {i}", "artiste", played_at=start, duration=duration,
+                    remaining=max(0.0, start + duration - t))
+    return i, np
+
+
+def simulate(tracks, total: float, adaptive: bool):
+    sched = PollSchedule()
+    t, seen, requests, stale = 0.0, -1, {"visible": 0, "réduite": 0, "arrêtée": 0}, []
+    while t < total:
+        playing, visible = phase(t, total)
+        requests["visible" if visible else "réduite" if playing else "arrêtée"] += 1
+        i, np = response(tracks, t)
+        if i != seen:
+            if seen >= 0 and playing:
+                stale.append(t - tracks[i][0])
+            seen = i
+        sched.observe(np, now=t)
+        t += sched.next_delay(playing, visible, now=t) if adaptive else config.NP_POLL_INTERVAL
+    return requests, stale
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--hours", type=float, default=24)
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+    tracks = playlist(args.hours, random.Random(args.seed))
+    total = args.hours * 3600
+    per_phase = args.hours / 3
+
+    print(f"{len(tracks)} morceaux sur {args.hours:g} h (⅓ visible, ⅓ réduite, ⅓ arrêtée)\n")
+    print(f"{'':<10} {'req/h visible':>14} {'réduite':>9} {'arrêtée':>9} {'total':>7} │"
+          f" {'fraîcheur p50 s':>16} {'p95 s':>7} {'max s':>7}")
+    for name, adaptive in (("fixe 12 s", False), ("adaptatif", True)):
+        req, stale = simulate(tracks, total, adaptive)
+        q = statistics.quantiles(stale, n=20)
+        print(f"{name:<10} {req['visible'] / per_phase:>14.0f} {req['réduite'] / per_phase:>9.0f}"
+              f" {req['arrêtée'] / per_phase:>9.0f} {sum(req.values()) / args.hours:>7.0f} │"
+              f" {statistics.median(stale):>16.1f} {q[18]:>7.1f} {max(stale):>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# tools/bench_startup.py — coût de démarrage : imports (-X importtime) + temps jusqu'à la 1re frame
+# Usage : python tools/bench_startup.py [--runs 5] [--budget-ms 1200] [--json out.json]
+# Code de sortie 1 si le budget est dépassé ou si un module lourd est chargé avant la 1re frame.
+from pathlib import Path
+import argparse, json, os, statistics, subprocess, sys
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# modules qui doivent rester hors du chemin critique (chargés par start_backend / à la demande)
+HEAVY = ("vlc", "pypresence", "requests", "updater")
+
+# Script lancé dans un process neuf : mesure jusqu'au premier Paint de la fenêtre.
+# start_backend est neutralisé : on ne mesure que ce qui précède l'affichage (pas de son, pas de réseau).
+FIRST_FRAME = r"""
+import sys, time, json
+t0 = time.perf_counter()
+import utils
+utils.load_vlc_portable()
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QEvent, QTimer
+app = QApplication(sys.argv)
+import ui
+t_import = time.perf_counter()
+ui.MainWindow.start_backend = lambda self: None
+win = ui.MainWindow()
+t_built = time.perf_counter()
+res = {}
+
+class FirstPaint(QObject):
+    def eventFilter(self, obj, ev):
+        if ev.type() == QEvent.Paint and "first_frame_ms" not in res:
+            now = time.perf_counter()
+            res.update(import_ms=(t_import - t0) * 1e3, build_ms=(t_built - t_import) * 1e3,
+                       first_frame_ms=(now - t0) * 1e3,
+                       heavy_loaded=[m for m in %(heavy)r if m in sys.modules])
+            QTimer.singleShot(0, app.quit)
+        return False
+
+f = FirstPaint()
+win.installEventFilter(f)
+win.show()
+QTimer.singleShot(10000, app.quit)
+app.exec()
+print(json.dumps(res))
+"""
+
+
+def run_first_frame(env) -> dict:
+    code = FIRST_FRAME % {"heavy": HEAVY}
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env,
+                         capture_output=True, text=True, timeout=60)
+    lines = [l for l in out.stdout.splitlines() if l.startswith("{")]
+    if out.returncode != 0 or not lines:
+        raise RuntimeError(out.stderr.strip() or "pas de mesure")
+    return json.loads(lines[-1])
+
+
+def import_times(env, module: str) -> dict:
+    """Temps cumulé (ms) par module de premier niveau, via -X importtime."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                         cwd=ROOT, env=env, capture_output=True, text=True, timeout=60)
+    res = {}
+    for line in out.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        cumulative = cumulative.strip()
+        if cumulative.isdigit() and not name.startswith("  "):   # niveau 0 : un seul espace
+            res[name.strip()] = int(cumulative) / 1000
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--budget-ms", type=float, default=1200, help="médiane max jusqu'à la 1re frame")
+    ap.add_argument("--json", help="écrit les résultats dans ce fichier")
+    args = ap.parse_args()
+
+    env = {**os.environ, "QT_QPA_PLATFORM": os.environ.get("QT_QPA_PLATFORM", "offscreen")}
+    runs = [run_first_frame(env) for _ in range(args.runs)]
+    imports = import_times(env, "ui")
+    deferred = {m: import_times(env, m).get(m) for m in ("vlc", "pypresence", "requests")}
+
+    summary = {
+        "runs": runs,
+        "first_frame_ms_median": statistics.median(r["first_frame_ms"] for r in runs),
+        "import_ms_median": statistics.median(r["import_ms"] for r in runs),
+        "ui_import_tree_ms": dict(sorted(imports.items(), key=lambda kv: -kv[1])[:15]),
+        "deferred_import_ms": deferred,
+        "budget_ms": args.budget_ms,
+    }
+    heavy = sorted({m for r in runs for m in r["heavy_loaded"]})
+    print(f"1re frame (médiane) : {summary['first_frame_ms_median']:.0f} ms  (budget {args.budget_ms:.0f} ms)")
+    print(f"import ui (médiane) : {summary['import_ms_median']:.0f} ms")
+    print("imports différés     :", ", ".join(f"{m} {v:.0f} ms" for m, v in deferred.items() if v is not None) or "—")
+    if heavy:
+        print("⚠ modules lourds chargés avant la 1re frame :", ", ".join(heavy))
+    if args.json:
+        Path(args.json).write_text(json.dumps(summary, indent=2), encoding="utf-8")
+
+    ok = summary["first_frame_ms_median"] <= args.budget_ms and not heavy
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
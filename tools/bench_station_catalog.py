@@ -0,0 +1,108 @@
+# tools/bench_station_catalog.py — catalogue de 50k stations : construction, mémoire, recherche, sélecteur Qt
+# Usage : python tools/bench_station_catalog.py [--stations 50000] [--qt]
+#
+# avant (1.0.6) : QComboBox.addItem pour chaque station, libellé calculé pour toutes, recherche
+#                 = parcours des dicts avec casefold à chaque frappe
+# après         : station_index.StationIndex (__slots__, clé casefold pré-calculée, recherche
+#                 incrémentale) + station_picker (modèle paresseux, proxy de filtre)
+from pathlib import Path
+import argparse, os, random, statistics, sys, time, tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from station_index import StationIndex, normalize
+
+GENRES = ("jazz", "rock", "pop", "classical", "news", "talk", "electronic", "chill", "lofi", "metal", "hip hop")
+COUNTRIES = ("France", "Germany", "Brazil", "United States", "Japan", "Canada", "Belgium", "Spain")
+WORDS = ("radio", "fm", "best", "hits", "paris", "city", "wave", "classic", "live", "nova", "one", "music")
+
+
+def directory(n: int, rng: random.Random) -> list:
+    """Annuaire synthétique au format radio-browser."""
+    return [{
+        "name": " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 3))) + f" {i}",
+        "url_resolved": f"https://stream{i}.example.net/live.mp3",
+        "tags": ",".join(rng.sample(GENRES, rng.randint(1, 3))),
+        "country": rng.choice(COUNTRIES),
+    } for i in range(n)]
+
+
+def ms(fn, runs=1):
+    times, res = [], None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        res = fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times), res
+
+
+def naive_search(stations: dict, query: str) -> list:
+    words = query.casefold().split()
+    out = []
+    for name, st in stations["stations"].items():
+        text = " ".join((name, st.get("genre", ""), st.get("country", ""), *st.get("tags", ()))).casefold()
+        if all(w in text for w in words):
+            out.append(name)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--stations", type=int, default=50_000)
+    ap.add_argument("--qt", action="store_true", help="mesure aussi le sélecteur (PySide6)")
+    args = ap.parse_args()
+    catalog = normalize(directory(args.stations, random.Random(1)))
+    n = len(catalog["stations"])
+
+    t_build, index = ms(lambda: StationIndex.from_catalog(catalog), runs=3)
+    tracemalloc.start()
+    probe = StationIndex.from_catalog(catalog)
+    mem = tracemalloc.get_traced_memory()[0] / 1024 / 1024
+    tracemalloc.stop()
+    del probe
+    print(f"{n} stations — index : {t_build:.0f} ms, {mem:.1f} Mo\n")
+
+    # frappe au clavier : chaque préfixe de la requête, comme le ferait le champ de recherche
+    query = "paris jazz fr"
+    prefixes = [query[:i] for i in range(1, len(query) + 1)]
+    naive = [ms(lambda p=p: naive_search(catalog, p))[0] for p in prefixes]
+    fresh = StationIndex.from_catalog(catalog)
+    indexed = [ms(lambda p=p: fresh.search(p))[0] for p in prefixes]
+    print(f"{'saisie':<16} {'naïf ms':>9} {'index ms':>9} {'résultats':>10}")
+    for p, a, b in zip(prefixes, naive, indexed):
+        print(f"{p!r:<16} {a:>9.1f} {b:>9.1f} {len(index.search(p)):>10}")
+    print(f"{'total':<16} {sum(naive):>9.0f} {sum(indexed):>9.0f}")
+
+    if not args.qt:
+        return
+    from PySide6.QtWidgets import QApplication, QComboBox
+    from station_picker import StationListModel, StationFilterProxy
+    app = QApplication(sys.argv)
+    names = list(catalog["stations"])
+
+    def before():
+        cb = QComboBox()
+        for name in names:
+            cb.addItem(name, name)
+        return cb
+
+    def after():
+        cb = QComboBox()
+        cb.setModel(StationListModel(StationIndex.from_catalog(catalog), parent=cb))
+        cb.view().setUniformItemSizes(True)
+        return cb
+
+    print()
+    for label, make in (("addItem", before), ("modèle", after)):
+        t_fill, cb = ms(make)
+        t_open, _ = ms(lambda: (cb.showPopup(), app.processEvents(), cb.hidePopup()))
+        print(f"{label:<8} remplissage {t_fill:>7.0f} ms   ouverture de la liste {t_open:>6.0f} ms")
+    proxy = StationFilterProxy(StationListModel(index))
+    t_filter = [ms(lambda p=p: proxy.set_query(p))[0] for p in prefixes]
+    print(f"proxy de filtre : {statistics.median(t_filter):.1f} ms médian par frappe, max {max(t_filter):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
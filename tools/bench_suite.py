@@ -0,0 +1,225 @@
+# tools/bench_suite.py — suite de benchmarks contre le stand-in AzuraCast local (Qt offscreen)
+# Usage : python tools/bench_suite.py [--quick] [--out fichier.json] [--compare ancien.json]
+#
+# Mesures : latence de refresh now-playing, blocage du thread GUI (vs ancien GET bloquant),
+# changement de station côté GUI, débit de choose_image, temps jusqu'à la 1re frame.
+# Les résultats (JSON) sont rangés par commit dans bench_results/ pour comparer les runs.
+from pathlib import Path
+import argparse, json, os, platform, statistics, subprocess, sys, tempfile, time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from PySide6.QtCore import QEventLoop, QTimer
+from PySide6.QtWidgets import QApplication
+
+import config, utils, http_client
+from standin_server import StandIn
+
+
+def pct(values, p):
+    values = sorted(values)
+    if not values:
+        return None
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def wait_signal(signal, timeout_ms: int):
+    """Bloque (boucle Qt locale) jusqu'à l'émission de `signal` ; renvoie les arguments ou None."""
+    loop = QEventLoop()
+    got = []
+    def on(*args):
+        got.append(args)
+        loop.quit()
+    signal.connect(on)
+    QTimer.singleShot(timeout_ms, loop.quit)
+    loop.exec()
+    signal.disconnect(on)
+    return got[0] if got else None
+
+
+class Heartbeat:
+    """Timer GUI à période fixe : l'écart max entre deux ticks = pire blocage de la boucle d'événements."""
+
+    def __init__(self, period_ms: int = 5):
+        self.period = period_ms / 1000
+        self.gaps = []
+        self._last = None
+        self.timer = QTimer()
+        self.timer.setInterval(period_ms)
+        self.timer.timeout.connect(self._tick)
+
+    def _tick(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.gaps.append(max(0.0, now - self._last - self.period))
+        self._last = now
+
+    def start(self):
+        self._last = None
+        self.gaps.clear()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+        return {"max_ms": max(self.gaps, default=0) * 1e3, "p99_ms": (pct(self.gaps, 99) or 0) * 1e3}
+
+
+def run_for(seconds: float):
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+
+# ---------- scénarios ----------
+def bench_refresh(srv, n: int) -> dict:
+    from nowplaying import NowPlayingWorker
+    w = NowPlayingWorker()
+    w.start()
+    lat, fails = [], 0
+    for i in range(n):
+        t0 = time.perf_counter()
+        w.request("Station1", f"{srv.url}/api/nowplaying/1")
+        if wait_signal(w.fetched, 10_000) is None:
+            fails += 1
+        else:
+            lat.append(time.perf_counter() - t0)
+    w.stop()
+    return {"n": n, "failures": fails, "p50_ms": (pct(lat, 50) or 0) * 1e3, "p95_ms": (pct(lat, 95) or 0) * 1e3}
+
+
+def bench_gui_block(srv, seconds: float) -> dict:
+    """Refresh toutes les 200 ms contre un serveur lent : worker actuel vs GET sur le thread GUI."""
+    from nowplaying import NowPlayingWorker
+    url = f"{srv.url}/api/nowplaying/1"
+    hb = Heartbeat()
+
+    w = NowPlayingWorker()
+    w.start()
+    t = QTimer(); t.setInterval(200); t.timeout.connect(lambda: w.request("Station1", url))
+    hb.start(); t.start()
+    run_for(seconds)
+    t.stop(); worker = hb.stop()
+    w.stop()
+
+    t = QTimer(); t.setInterval(200)
+    t.timeout.connect(lambda: http_client.get(url).json())   # ancien comportement
+    hb.start(); t.start()
+    run_for(seconds)
+    t.stop(); legacy = hb.stop()
+    return {"latency_s": srv.latency, "worker": worker, "legacy_blocking": legacy}
+
+
+def bench_station_switch(srv, rounds: int) -> dict:
+    """Coût côté thread GUI de on_station_changed (backend désactivé : pas de VLC)."""
+    import ui
+    ui.MainWindow.start_backend = lambda self: None
+    win = ui.MainWindow()
+    win.show()
+    win.stations = utils.load_stations()   # catalogue du stand-in (réseau, une fois)
+    names = utils.get_station_names(win.stations)
+    times = []
+    for i in range(rounds):
+        name = names[i % len(names)]
+        t0 = time.perf_counter()
+        win.on_station_changed(name)
+        times.append(time.perf_counter() - t0)
+        QApplication.processEvents()
+    run_for(0.5)
+    win.close()
+    return {"rounds": rounds, "p50_ms": pct(times, 50) * 1e3, "max_ms": max(times) * 1e3}
+
+
+def bench_choose_image(titles: int) -> dict:
+    import random
+    import bench_choose_image as bci
+    rnd = random.Random(1)
+    out = {}
+    for n in (10, 1_000, 100_000):
+        m = utils.compile_image_map(bci.make_map(n, rnd))
+        ts = bci.make_titles(m, titles, rnd)
+        per = bci.timeit(lambda t: utils.choose_image(m, t, False), ts)
+        out[f"{n}_titles_per_s"] = 1 / per
+    return out
+
+
+def bench_startup(runs: int) -> dict:
+    import bench_startup as bs
+    env = {**os.environ, "QT_QPA_PLATFORM": "offscreen"}
+    res = [bs.run_first_frame(env) for _ in range(runs)]
+    return {"first_frame_ms_median": statistics.median(r["first_frame_ms"] for r in res),
+            "import_ms_median": statistics.median(r["import_ms"] for r in res)}
+
+
+# ---------- résultats ----------
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def flatten(d: dict, prefix=""):
+    for k, v in d.items():
+        if isinstance(v, dict):
+            yield from flatten(v, f"{prefix}{k}.")
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            yield f"{prefix}{k}", v
+
+
+def compare(old: dict, new: dict):
+    a, b = dict(flatten(old["results"])), dict(flatten(new["results"]))
+    print(f"\n{'mesure':<45} {old['commit']:>10} {new['commit']:>10} {'Δ':>8}")
+    for k in sorted(set(a) & set(b)):
+        delta = (b[k] - a[k]) / a[k] * 100 if a[k] else 0
+        print(f"{k:<45} {a[k]:>10.1f} {b[k]:>10.1f} {delta:>+7.0f}%")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--quick", action="store_true", help="moins d'itérations")
+    ap.add_argument("--latency", type=float, default=1.0, help="latence du serveur lent (s)")
+    ap.add_argument("--out", help="fichier JSON (défaut : bench_results/<date>_<commit>.json)")
+    ap.add_argument("--compare", help="JSON d'un run précédent")
+    args = ap.parse_args()
+    q = args.quick
+
+    QApplication(sys.argv)   # PySide garde l'instance (qApp)
+    tmp = Path(tempfile.mkdtemp(prefix="inspora-bench-"))
+    # isole settings / caches du poste et pointe les catalogues vers le stand-in
+    utils.app_dir = lambda: tmp
+    utils._catalog_cache = None
+
+    results = {}
+    with StandIn(track_s=5) as srv:
+        config.STATIONS_URL = f"{srv.url}/stations.json"
+        config.MAP_URL = f"{srv.url}/images_map.json"
+
+        results["refresh"] = bench_refresh(srv, 20 if q else 100)
+        srv.fail_rate = 0.3
+        results["refresh_fail30"] = bench_refresh(srv, 10 if q else 50)
+        srv.fail_rate = 0.0
+        srv.latency = args.latency
+        results["gui_block"] = bench_gui_block(srv, 2 if q else 6)
+        srv.latency = 0.0
+        results["station_switch"] = bench_station_switch(srv, 10 if q else 40)
+        results["upstream_requests"] = dict(srv.requests)
+    results["choose_image"] = bench_choose_image(200 if q else 2000)
+    results["startup"] = bench_startup(2 if q else 5)
+    results["http_client"] = http_client.stats()
+
+    doc = {"commit": git_commit(), "timestamp": int(time.time()),
+           "python": platform.python_version(), "platform": platform.platform(), "results": results}
+    out = Path(args.out) if args.out else ROOT / "bench_results" / f"{time.strftime('%Y%m%d-%H%M%S')}_{doc['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(doc, indent=2), encoding="utf-8")
+    print(json.dumps(results, indent=2))
+    print("→", out)
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text(encoding="utf-8")), doc)
+
+
+if __name__ == "__main__":
+    main()
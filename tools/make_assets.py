@@ -1,35 +1,197 @@
-# tools/make_assets.py
+# tools/make_assets.py — génération incrémentale des assets (icônes, PNG, vignettes) depuis les sources
+# Usage : python tools/make_assets.py [--force] [--jobs N]
+#
+# - chaque taille est rendue directement depuis le SVG (QSvgRenderer) : petites icônes nettes, sans PIL ;
+# - les tailles sont rendues en parallèle (un QSvgRenderer + un QImage par tâche) ;
+# - une sortie n'est régénérée que si l'empreinte (SHA-256) de ses entrées / paramètres a changé,
+#   ou si le fichier a disparu / été modifié à la main (manifeste assets/.assets_manifest.json) ;
+# - vignettes pré-dimensionnées pour la pochette (assets/thumbs/) : le logo et les images de
+#   assets/stations/ à la taille physique de lbl_cover (112 px × 1 / 1.5 / 2), sans mise à l'échelle à l'exécution.
+#   Un logo de station porte le nom de la station dans stations.json (ex. assets/stations/InsporaRadio.svg) :
+#   l'interface l'affiche en attendant la pochette, le logo de l'appli sinon.
 from pathlib import Path
-import sys
-from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import argparse, hashlib, json, os, struct, sys, time
 
-# QtSvg (pas besoin de fenêtre)
-from PySide6.QtGui import QImage, QPainter
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PySide6.QtGui import QGuiApplication, QImage, QImageReader, QPainter
 from PySide6.QtSvg import QSvgRenderer
-from PySide6.QtGui import QGuiApplication
-
-ROOT = Path(__file__).resolve().parents[1]
-SVG  = ROOT / "assets" / "logo.svg"
-PNG  = ROOT / "assets" / "logo_512.png"
-ICO  = ROOT / "assets" / "app.ico"
-
-def svg_to_png(svg_path: Path, png_path: Path, size: int = 512):
-    app = QGuiApplication(sys.argv)  # application “headless”
-    renderer = QSvgRenderer(str(svg_path))
-    img = QImage(size, size, QImage.Format_ARGB32)
-    img.fill(0)  # transparent
+
+ROOT     = Path(__file__).resolve().parents[1]
+ASSETS   = ROOT / "assets"
+SVG      = ASSETS / "logo.svg"
+PNG      = ASSETS / "logo_512.png"
+ICO      = ASSETS / "app.ico"
+THUMBS   = ASSETS / "thumbs"
+STATIONS = ASSETS / "stations"        # logos de stations optionnels (svg / png / jpg)
+MANIFEST = ASSETS / ".assets_manifest.json"
+
+ICO_SIZES   = (16, 20, 24, 32, 40, 48, 64, 128, 256)
+COVER_PX    = 112                     # taille logique de lbl_cover (ui.py)
+COVER_SCALES = (1, 1.5, 2)
+PIPELINE    = "2"                     # à incrémenter si le rendu change (invalide tout)
+
+
+# ---------- empreintes ----------
+def sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def key_for(*parts) -> str:
+    h = hashlib.sha256(PIPELINE.encode())
+    for p in parts:
+        h.update(p if isinstance(p, bytes) else str(p).encode())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+# ---------- rendu ----------
+def render_svg(svg: bytes, size: int) -> QImage:
+    """Rendu direct à `size` px (un renderer par appel : utilisable depuis plusieurs threads)."""
+    renderer = QSvgRenderer(QByteArray(svg))
+    img = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    img.fill(Qt.transparent)
     p = QPainter(img)
+    p.setRenderHint(QPainter.Antialiasing)
+    p.setRenderHint(QPainter.SmoothPixmapTransform)
     renderer.render(p)
     p.end()
-    img.save(str(png_path))
-    app.quit()
+    return img
+
+
+def scale_raster(data: bytes, size: int) -> QImage:
+    """Image bitmap → carré `size` px, décodée directement à la bonne taille, recadrée au centre."""
+    buf = QBuffer(); buf.setData(QByteArray(data)); buf.open(QIODevice.ReadOnly)
+    reader = QImageReader(buf)
+    src = reader.size()
+    if src.isValid() and src.width() and src.height():
+        k = size / min(src.width(), src.height())
+        reader.setScaledSize(QSize(max(size, round(src.width() * k)), max(size, round(src.height() * k))))
+    img = reader.read()
+    if img.isNull():
+        raise ValueError(reader.errorString())
+    x, y = (img.width() - size) // 2, (img.height() - size) // 2
+    return img.copy(x, y, size, size)
+
+
+def png_bytes(img: QImage) -> bytes:
+    buf = QBuffer(); buf.open(QIODevice.WriteOnly)
+    img.save(buf, "PNG")
+    return bytes(buf.data())
+
+
+def build_ico(pngs: dict) -> bytes:
+    """Conteneur ICO avec entrées PNG (Windows Vista+), sans PIL."""
+    sizes = sorted(pngs)
+    header = struct.pack("<HHH", 0, 1, len(sizes))
+    offset = 6 + 16 * len(sizes)
+    entries, blobs = b"", b""
+    for s in sizes:
+        data = pngs[s]
+        dim = 0 if s >= 256 else s      # 0 = 256 px
+        entries += struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(data), offset)
+        blobs += data
+        offset += len(data)
+    return header + entries + blobs
+
+
+# ---------- pipeline ----------
+class Pipeline:
+    def __init__(self, force: bool, jobs: int):
+        self.force = force
+        self.pool = ThreadPoolExecutor(max_workers=jobs)
+        self.manifest = {} if force else self._load()
+        self.built, self.skipped = [], []
+
+    @staticmethod
+    def _load() -> dict:
+        try:
+            return json.loads(MANIFEST.read_text(encoding="utf-8"))
+        except Exception:
+            return {}
+
+    def save(self):
+        MANIFEST.write_text(json.dumps(self.manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    def up_to_date(self, out: Path, key: str) -> bool:
+        entry = self.manifest.get(out.relative_to(ROOT).as_posix())
+        if not entry or entry.get("key") != key or not out.exists():
+            return False
+        return sha256(out.read_bytes()) == entry.get("sha256")   # retouché à la main → régénéré
+
+    def write(self, out: Path, key: str, data: bytes):
+        out.parent.mkdir(parents=True, exist_ok=True)
+        tmp = out.with_name(out.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, out)
+        self.manifest[out.relative_to(ROOT).as_posix()] = {"key": key, "sha256": sha256(data)}
+        self.built.append(out)
+
+    def target(self, out: Path, key: str, make):
+        """Planifie `make()` → bytes si `out` n'est pas à jour ; renvoie un future ou None."""
+        if not self.force and self.up_to_date(out, key):
+            self.skipped.append(out)
+            return None
+        return self.pool.submit(make)
+
+    def run(self):
+        svg = SVG.read_bytes()
+        svg_hash = sha256(svg)
+        jobs = []
+
+        # icône Windows : toutes les tailles rendues en parallèle, puis assemblées
+        ico_key = key_for("ico", svg_hash, ICO_SIZES)
+        if self.force or not self.up_to_date(ICO, ico_key):
+            futs = {s: self.pool.submit(lambda s=s: png_bytes(render_svg(svg, s))) for s in ICO_SIZES}
+            jobs.append((ICO, ico_key, lambda: build_ico({s: f.result() for s, f in futs.items()})))
+        else:
+            self.skipped.append(ICO)
+
+        # PNG 512 (README, installeur…)
+        key = key_for("png", svg_hash, 512)
+        fut = self.target(PNG, key, lambda: png_bytes(render_svg(svg, 512)))
+        if fut:
+            jobs.append((PNG, key, fut.result))
+
+        # vignettes de pochette : logo + logos de stations
+        sources = [("logo", svg, True)]
+        if STATIONS.is_dir():
+            for f in sorted(STATIONS.iterdir()):
+                if f.suffix.lower() in (".svg", ".png", ".jpg", ".jpeg", ".webp"):
+                    sources.append((f.stem, f.read_bytes(), f.suffix.lower() == ".svg"))
+        for name, data, is_svg in sources:
+            for scale in COVER_SCALES:
+                px = round(COVER_PX * scale)
+                out = THUMBS / f"{name}_{px}.png"
+                key = key_for("thumb", sha256(data), px)
+                make = (lambda d=data, p=px: png_bytes(render_svg(d, p))) if is_svg else \
+                       (lambda d=data, p=px: png_bytes(scale_raster(d, p)))
+                fut = self.target(out, key, make)
+                if fut:
+                    jobs.append((out, key, fut.result))
+
+        for out, key, result in jobs:
+            self.write(out, key, result())
+        self.pool.shutdown()
+        self.save()
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--force", action="store_true", help="tout régénérer")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 4)
+    args = ap.parse_args()
+
+    QGuiApplication(sys.argv)   # requis par QtGui / QtSvg, aucune fenêtre
+    t0 = time.perf_counter()
+    p = Pipeline(args.force, max(1, args.jobs))
+    p.run()
+    dt = (time.perf_counter() - t0) * 1000
+    for out in p.built:
+        print("  ✓", out.relative_to(ROOT))
+    print(f"OK : {len(p.built)} généré(s), {len(p.skipped)} à jour — {dt:.0f} ms")
 
-def png_to_ico(png_path: Path, ico_path: Path):
-    im = Image.open(png_path).convert("RGBA")
-    im.save(ico_path, sizes=[(16,16),(32,32),(48,48),(64,64),(128,128),(256,256)])
 
 if __name__ == "__main__":
-    SVG.parent.mkdir(parents=True, exist_ok=True)
-    svg_to_png(SVG, PNG, 512)
-    png_to_ico(PNG, ICO)
-    print("OK →", PNG, "et", ICO)
+    main()
@@ -0,0 +1,244 @@
+# tools/standin_server.py — faux serveur AzuraCast / GitHub local pour les benchmarks
+# Usage autonome : python tools/standin_server.py [--port 8765] [--latency 0.5] [--fail-rate 0.1]
+#
+# Routes :
+#   /api/nowplaying/<id>        payload nowplaying d'une station (le titre change toutes les `track_s` s)
+#   /api/nowplaying             liste de toutes les stations (endpoint global)
+#   /api/live/nowplaying/sse    flux SSE façon Centrifugo (une publication par changement de titre)
+#   /art/<n>.png                pochette PNG générée (taille `art_px`), ETag + 304
+#   /stations.json              catalogue de stations pointant vers ce serveur
+#   /images_map.json            map d'images (`map_titles` entrées)
+#   /releases/latest            payload GitHub Releases (exe + fichier .sha256)
+#   /download/<nom>             binaire de release (Range + ETag)
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import argparse, hashlib, json, random, struct, threading, time, zlib
+
+
+def make_png(px: int, seed: int) -> bytes:
+    """PNG RGB px×px (dégradé), sans dépendance : assez gros pour peser au décodage."""
+    rnd = random.Random(seed)
+    r0, g0, b0 = rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)
+    reds = bytes((r0 + x) & 255 for x in range(px))
+    blues = bytes([b0]) * px
+    rows = bytearray()
+    for y in range(px):
+        row = bytearray(px * 3)
+        row[0::3], row[1::3], row[2::3] = reds, bytes([(g0 + y) & 255]) * px, blues
+        rows.append(0)   # filtre PNG « None »
+        rows += row
+    def chunk(tag, data):
+        return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data) & 0xFFFFFFFF)
+    ihdr = struct.pack(">IIBBBBB", px, px, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IDAT", zlib.compress(bytes(rows), 6)) + chunk(b"IEND", b"")
+
+
+class StandIn:
+    """Serveur local configurable (latence, taux d'échec) ; les attributs sont modifiables à chaud.
+
+        with StandIn(latency=0.2) as srv:
+            srv.url  # http://127.0.0.1:<port>
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.0, fail_rate: float = 0.0, stations: int = 3,
+                 track_s: float = 30.0, art_px: int = 600, map_titles: int = 200, release_mb: float = 4.0):
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.stations = stations
+        self.track_s = track_s
+        self.art_px = art_px
+        self.map_titles = map_titles
+        self.requests = {}          # chemin (sans id) → nombre de requêtes servies
+        self._lock = threading.Lock()
+        self._art = {}
+        self._t0 = time.time()
+        self.release = bytes(random.Random(7).randbytes(int(release_mb * 1024 * 1024)))
+        self.release_sha = hashlib.sha256(self.release).hexdigest()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ---------- données ----------
+    def track_index(self, sid: int) -> int:
+        return int((time.time() - self._t0) // self.track_s) + sid * 1000
+
+    def nowplaying(self, sid: int) -> dict:
+        n = self.track_index(sid)
+        elapsed = int((time.time() - self._t0) % self.track_s)
+        return {
+            "station": {"id": sid, "shortcode": f"station{sid}", "name": f"Station {sid}"},
+            "listeners": {"total": 10 + sid, "unique": 10 + sid, "current": 10 + sid},
+            "live": {"is_live": False},
+            "now_playing": {
+                "elapsed": elapsed, "remaining": int(self.track_s) - elapsed, "duration": int(self.track_s),
+                "played_at": int(time.time()) - elapsed,
+                "song": {"title": f"Titre {n}", "artist": f"Artiste {sid}", "art": f"{self.url}/art/{n}.png"},
+            },
+            "playing_next": {"song": {"title": f"Titre {n + 1}", "artist": f"Artiste {sid}",
+                                      "art": f"{self.url}/art/{n + 1}.png"}},
+            "cache": "station",
+        }
+
+    def art(self, n: int) -> bytes:
+        with self._lock:
+            if n not in self._art:
+                self._art[n] = make_png(self.art_px, n)
+            return self._art[n]
+
+    def stations_json(self) -> dict:
+        return {"default": "Station1", "stations": {
+            f"Station{i}": {
+                "stream_url": f"{self.url}/listen/station{i}/radio.mp3",
+                "nowplaying_url": f"{self.url}/api/nowplaying/{i}",
+                "images_map_url": f"{self.url}/images_map.json",
+            } for i in range(1, self.stations + 1)}}
+
+    def images_map(self) -> dict:
+        return {"default": "logo_default", "live": "logo_live",
+                "titles": {f"Titre {i}": str(i) for i in range(self.map_titles)}}
+
+    def release_json(self) -> dict:
+        return {"tag_name": "v99.0.0", "assets": [
+            {"name": "InsporaRadio.exe", "browser_download_url": f"{self.url}/download/InsporaRadio.exe"},
+            {"name": "InsporaRadio.exe.sha256", "browser_download_url": f"{self.url}/download/InsporaRadio.exe.sha256"},
+        ]}
+
+    # ---------- HTTP ----------
+    def _handler(self):
+        srv = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send(self, code, body: bytes = b"", ctype="application/json", headers=None):
+                self.send_response(code)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                if self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _json(self, obj, etag=True):
+                body = json.dumps(obj).encode()
+                tag = '"%s"' % hashlib.md5(body).hexdigest()
+                if etag and self.headers.get("If-None-Match") == tag:
+                    return self._send(304, headers={"ETag": tag})
+                self._send(200, body, headers={"ETag": tag} if etag else None)
+
+            def do_HEAD(self):
+                self.do_GET()
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                key = "/".join(p for p in path.split("/") if not p.split(".")[0].isdigit())
+                with srv._lock:
+                    srv.requests[key] = srv.requests.get(key, 0) + 1
+                if srv.latency:
+                    time.sleep(srv.latency)
+                if srv.fail_rate and random.random() < srv.fail_rate:
+                    return self._send(503, b'{"error": "injected"}')
+
+                if path.startswith("/api/live/nowplaying/sse"):
+                    return self._sse()
+                if path == "/api/nowplaying":
+                    return self._json([srv.nowplaying(i) for i in range(1, srv.stations + 1)], etag=False)
+                if path.startswith("/api/nowplaying/"):
+                    return self._json(srv.nowplaying(int(path.rsplit("/", 1)[1])), etag=False)
+                if path.startswith("/art/"):
+                    n = int(path.rsplit("/", 1)[1].split(".")[0])
+                    body = srv.art(n)
+                    tag = f'"art-{n}"'
+                    if self.headers.get("If-None-Match") == tag:
+                        return self._send(304, headers={"ETag": tag})
+                    return self._send(200, body, "image/png", {"ETag": tag})
+                if path == "/stations.json":
+                    return self._json(srv.stations_json())
+                if path == "/images_map.json":
+                    return self._json(srv.images_map())
+                if path == "/releases/latest":
+                    return self._json(srv.release_json(), etag=False)
+                if path.endswith(".sha256"):
+                    return self._send(200, f"{srv.release_sha}  InsporaRadio.exe\n".encode(), "text/plain")
+                if path.startswith("/download/"):
+                    return self._download()
+                self._send(404, b"{}")
+
+            def _download(self):
+                data = srv.release
+                headers = {"Accept-Ranges": "bytes", "ETag": f'"{srv.release_sha[:16]}"'}
+                rng = self.headers.get("Range", "")
+                if rng.startswith("bytes="):
+                    start_s, _, end_s = rng[6:].partition("-")
+                    start = int(start_s)
+                    end = int(end_s) if end_s else len(data) - 1
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    return self._send(206, data[start:end + 1], "application/octet-stream", headers)
+                self._send(200, data, "application/octet-stream", headers)
+
+            def _sse(self):
+                sid = 1
+                self.close_connection = True   # flux sans Content-Length : fin = fermeture
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                last = None
+                try:
+                    while True:
+                        n = srv.track_index(sid)
+                        if n != last:
+                            last = n
+                            msg = {"channel": f"station:station{sid}", "pub": {"data": {"np": srv.nowplaying(sid)}}}
+                            self.wfile.write(f"data: {json.dumps(msg)}\n\n".encode())
+                        else:
+                            self.wfile.write(b"data: {}\n\n")   # ping
+                        self.wfile.flush()
+                        time.sleep(min(1.0, srv.track_s / 4))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        return Handler
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--latency", type=float, default=0.0, help="délai ajouté à chaque réponse (s)")
+    ap.add_argument("--fail-rate", type=float, default=0.0, help="proportion de réponses 503")
+    ap.add_argument("--stations", type=int, default=3)
+    ap.add_argument("--track-s", type=float, default=30.0)
+    args = ap.parse_args()
+    srv = StandIn(args.port, args.latency, args.fail_rate, args.stations, args.track_s).start()
+    print("Stand-in AzuraCast sur", srv.url, "— Ctrl+C pour arrêter")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        srv.stop()
+
+
+if __name__ == "__main__":
+    main()
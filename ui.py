@@ -1,17 +1,22 @@
 # ui.py — thèmes clair/sombre + pochette + prochain titre + badge auditeurs + multi-stations + RPC
 
-import requests
-from PySide6.QtCore import Qt, QTimer, Slot
-from PySide6.QtGui import QPixmap, QIcon
+import glob, time
+from PySide6.QtCore import Qt, QEvent, QTimer, Signal, Slot
+from PySide6.QtGui import QPixmap, QImage, QIcon, QKeySequence, QShortcut
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QLabel, QPushButton, QSlider, QComboBox,
-    QVBoxLayout, QHBoxLayout, QFrame, QMessageBox
+    QVBoxLayout, QHBoxLayout, QFrame, QMessageBox, QCompleter
 )
 
-import config, utils
-from player import RadioPlayer
-from rpc import DiscordRPCManager
-from updater import UpdateChecker, UpdateDownloader
+import config, utils, metrics
+from nowplaying import NowPlayingWorker, NowPlayingStream, StationStatusAggregator
+from nowplaying_data import IcyTracker, PollSchedule
+from station_index import StationIndex
+from station_picker import StationListModel, StationFilterProxy
+from covercache import DiskCache, LRU
+from catalog import CatalogRefresher, ImagesMapLoader
+from settings_store import SettingsStore
+# player (vlc), rpc (pypresence) et updater sont importés à la demande : voir start_backend()
 
 
 # -------------------- THEMES --------------------
@@ -51,6 +56,9 @@ QLabel#cover { background:#eef2ff; border-radius:10px; }
 
 
 class MainWindow(QMainWindow):
+    rpc_status = Signal(bool)   # émis depuis le thread RPC
+    history_written = Signal(str, int)   # émis depuis l'écrivain de l'historique (station, nb de lignes)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle(f"🎵 {config.APP_NAME} v{config.CURRENT_VERSION}")
@@ -64,59 +72,154 @@ class MainWindow(QMainWindow):
 
         # Settings
         self.settings_path = utils.app_dir() / config.SETTINGS_FILE
-        self.settings = utils.load_json(self.settings_path, {
-            "volume": 80, "autoplay": True, "station": None, "theme": "dark"
+        self.settings = SettingsStore(self.settings_path, {
+            "volume": 80, "autoplay": True, "station": None, "theme": "dark",
+            "prewarm": False,   # 2e lecteur muet pour changer de station sans blanc (coûte de la bande passante)
+            "metadata_proxy": False,   # sert now-playing / pochettes aux outils locaux (voir metadata_proxy.py)
+            "stall_watchdog": False,   # surveille les blocages en permanence, pas seulement panneau debug ouvert
         })
 
-        # Stations (depuis GitHub) + sélection courante
-        self.stations = utils.load_stations()
+        # Stations (copie locale immédiate, revalidée depuis GitHub en arrière-plan)
+        self.stations = utils.load_stations(offline=True)
         names = utils.get_station_names(self.stations)
         default_name = self.settings.get("station") or self.stations.get("default") or (names[0] if names else "InsporaRadio")
         self.current_station_name = default_name
         self.current_station = utils.get_station(self.stations, self.current_station_name)
 
-        # Player
-        self.player = RadioPlayer()
-        self.player.set_volume(self.settings["volume"])
-
-        # RPC auto
-        self.rpc = DiscordRPCManager(config.DISCORD_CLIENT_ID, config.APP_NAME)
-        rpc_ok = self.rpc.connect()
+        # Player / RPC : créés après le premier affichage (start_backend)
+        self.player = None
+        self.rpc = None
+        self.status_agg = None
+        self.proxy = None
+        self.proxy_url = None     # proxy de métadonnées servi ici ou par une autre instance
+        self.history = None
+        self.history_dialog = None
+        self._backend_started = False
 
         # Images map — spécifique à la station courante
-        self.images_map = utils.load_images_map_for_station(self.current_station)
+        self.images_map = utils.load_images_map_for_station(self.current_station, offline=True)
 
         # UI
-        self.build_ui(names, default_name)
+        self.build_ui(default_name)
         self.apply_theme(self.settings.get("theme", "dark"))
-        self.lbl_rpc.setText("RPC : connecté ✅" if rpc_ok else "RPC : inactif ❌")
-
-        # Sync état VLC
+        self.rpc_status.connect(lambda ok: self.lbl_rpc.setText("RPC : connecté ✅" if ok else "RPC : inactif ❌"))
         self.playing = False
-        self.state_timer = QTimer(self)
-        self.state_timer.setInterval(400)
-        self.state_timer.timeout.connect(self.sync_player_state)
-        self.state_timer.start()
 
-        # NowPlaying + RPC refresh
-        self.timer = QTimer(self); self.timer.setInterval(12_000)
+        # station survolée dans la liste → pré-chauffage (après un court délai)
+        self._hover_station = None
+        self.prewarm_timer = QTimer(self); self.prewarm_timer.setSingleShot(True); self.prewarm_timer.setInterval(400)
+        self.prewarm_timer.timeout.connect(lambda: self._prewarm(self._hover_station))
+        self.cb_station.highlighted.connect(self.on_station_hovered)
+
+        # NowPlaying + RPC refresh (fetch dans un thread dédié)
+        self._last_art_url = None
+        self.cover_pixmaps = LRU(32)   # url → QPixmap déjà à la taille de lbl_cover
+        cover_cache = DiskCache(utils.app_dir() / config.CACHE_DIR / "covers", config.COVER_CACHE_MAX_BYTES)
+        self.np_worker = NowPlayingWorker(cache=cover_cache, parent=self)
+        self.np_worker.set_cover_size(self.lbl_cover.size(), self.devicePixelRatioF())
+        self.np_worker.fetched.connect(self.on_nowplaying)
+        self.np_worker.cover.connect(self._set_cover)
+        self.np_worker.prefetched.connect(self._cache_cover)
+        self.np_worker.fail.connect(self.on_nowplaying_fail)
+        # polling now-playing : délai recalculé après chaque réponse (fin de morceau, lecture, fenêtre)
+        self.timer = QTimer(self); self.timer.setSingleShot(True)
         self.timer.timeout.connect(self.refresh_nowplaying)
-        self.timer.start()
+        self.np_schedule = PollSchedule()
+        self._np_pushed = False   # flux SSE connecté : pas de polling
+        # titres ICY (dans le flux) : affichage immédiat, l'API enrichit ensuite
+        self.icy = IcyTracker()
+        self._last_np = None
+        self.enrich_timer = QTimer(self); self.enrich_timer.setSingleShot(True)
+        self.enrich_timer.timeout.connect(self.refresh_nowplaying)
+        self.np_stream = None
+
+        # Instrumentation : blocages du thread GUI + panneau de debug caché (Ctrl+Maj+D) ;
+        # le battement réveille la boucle 20 fois / s : armé seulement panneau ouvert (ou réglage)
+        self.watchdog = metrics.StallWatchdog(config.STALL_THRESHOLD_MS)
+        self.heartbeat = QTimer(self); self.heartbeat.setInterval(50)
+        self.heartbeat.timeout.connect(self.watchdog.beat)
+        self.debug_panel = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.toggle_debug_panel)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if not self._backend_started:
+            self._backend_started = True
+            self._watch_stalls(False)
+            self._update_cover_size()   # ratio de pixels de l'écran réel
+            self.windowHandle().screenChanged.connect(lambda _s: self._update_cover_size())
+            # laisser la boucle d'événements peindre la fenêtre avant VLC / RPC / réseau
+            QTimer.singleShot(0, self.start_backend)
+
+    def start_backend(self):
+        """Initialisation lourde, différée après la première frame (libVLC, Discord, threads réseau)."""
+        from player import RadioPlayer
+        from rpc import DiscordRPCManager
+
+        # Player
+        self.player = RadioPlayer(prewarm=bool(self.settings.get("prewarm")))
+        self.player.set_volume(self.settings["volume"])
+        self.player.state_changed.connect(self.on_player_state)
+        self.player.start_timings.connect(self.on_start_timings)
+        self.player.metadata_changed.connect(self.on_icy_title)
+        self.player.first_audio.connect(
+            lambda dt, warm: self.btn_play.setToolTip(f"Premier son en {dt * 1000:.0f} ms" + (" (pré-chauffé)" if warm else "")))
+
+        # Historique des titres (écritures groupées dans un thread dédié)
+        from history import PlayHistory
+        self.history = PlayHistory(utils.app_dir() / config.HISTORY_FILE, on_written=self.history_written.emit)
+
+        # RPC auto (connexion et envois dans un thread dédié)
+        self.rpc = DiscordRPCManager(config.DISCORD_CLIENT_ID, config.APP_NAME, on_status=self.rpc_status.emit)
+        self.rpc.start()
+
+        # Proxy local : un seul poller amont pour tous les consommateurs de la machine
+        if self.settings.get("metadata_proxy"):
+            self.start_metadata_proxy()
+
+        # NowPlaying
+        self.np_worker.start()
+        self._start_np_stream()
         self.refresh_nowplaying()
 
         # Autoplay
         if self.settings.get("autoplay", True):
             self.handle_play()
 
+        # État de toutes les stations pour le sélecteur (1 requête par serveur AzuraCast)
+        self.status_agg = StationStatusAggregator(self.stations, config.STATUS_POLL_INTERVAL,
+                                                  config.STATUS_MAX_REQ_PER_MIN, parent=self)
+        if self.proxy_url:
+            self.status_agg.set_proxy(self.proxy_url)
+        self.status_agg.set_current(self.current_station_name)
+        self.status_agg.statuses.connect(self.on_station_statuses)
+        self.status_agg.start()
+
+        # Revalidation des catalogues (stations / images) sans bloquer l'affichage
+        self.catalog = CatalogRefresher(self.current_station_name, self.current_station, parent=self)
+        self.catalog.stations.connect(self.on_catalog_stations)
+        self.catalog.images_map.connect(self.on_catalog_images_map)
+        self.catalog.start()
+
         # Update banner
         if utils.is_frozen_exe():
             QTimer.singleShot(1500, self.start_silent_update_check)
 
-        # cache art
-        self._last_art_url = None
+    def start_metadata_proxy(self):
+        """Sert le proxy, ou se branche sur celui d'une autre instance ; now-playing et état des
+        stations passent ensuite par lui (aucun poller amont propre à cette fenêtre)."""
+        from metadata_proxy import MetadataHub, MetadataProxy, find_running
+        hub = MetadataHub(self.stations, config.PROXY_POLL_INTERVAL, cover_cache=self.np_worker.cache)
+        try:
+            self.proxy = MetadataProxy(hub).start()
+            self.proxy_url = self.proxy.url
+        except OSError as e:   # port déjà pris : autre instance qui sert déjà le proxy ?
+            self.proxy_url = find_running()
+            if self.proxy_url is None:
+                print("[proxy]", e)
 
     # ---------------- UI ----------------
-    def build_ui(self, station_names, default_name):
+    def build_ui(self, default_name):
         root = QWidget(); self.setCentralWidget(root)
         v = QVBoxLayout(root); v.setContentsMargins(14,14,14,14); v.setSpacing(12)
 
@@ -134,11 +237,32 @@ class MainWindow(QMainWindow):
         # Choix station
         header.addWidget(QLabel("Station :"))
         self.cb_station = QComboBox()
-        self.cb_station.addItems(station_names)
-        self.cb_station.setEnabled(len(station_names) > 1)
-        if default_name in station_names:
-            self.cb_station.setCurrentText(default_name)
-        self.cb_station.currentTextChanged.connect(self.on_station_changed)
+        # libellé = nom + état en direct ; le nom de la station est dans les données de l'item
+        self.cb_station.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.cb_station.setMinimumContentsLength(18)
+        self.cb_station.view().setMinimumWidth(360)
+        self.station_status = {}
+        # modèle paresseux : libellés calculés pour les seules lignes affichées (annuaires de 50k stations)
+        index = StationIndex.from_catalog(self.stations)   # construit une seule fois : modèle + sélection initiale
+        self.station_model = StationListModel(index, self._station_label, self)
+        self.cb_station.setModel(self.station_model)
+        self.cb_station.view().setUniformItemSizes(True)
+        # saisie = recherche (nom, genre, pays, tags) dans une liste filtrée sous le champ
+        self.cb_station.setEditable(True)
+        self.cb_station.setInsertPolicy(QComboBox.NoInsert)
+        self.cb_station.lineEdit().setPlaceholderText("Rechercher une station…")
+        self.station_filter = StationFilterProxy(self.station_model, self)
+        completer = QCompleter(self.station_filter, self)
+        completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        completer.popup().setUniformItemSizes(True)
+        self.cb_station.setCompleter(completer)
+        self.search_timer = QTimer(self); self.search_timer.setSingleShot(True); self.search_timer.setInterval(120)
+        self.search_timer.timeout.connect(lambda: self.station_filter.set_query(self.cb_station.lineEdit().text()))
+        self.cb_station.lineEdit().textEdited.connect(lambda _: self.search_timer.start())
+        self.cb_station.lineEdit().editingFinished.connect(lambda: QTimer.singleShot(0, self._restore_station_text))
+        self._fill_station_combo(index, default_name)
+        self.cb_station.currentIndexChanged.connect(
+            lambda i: i >= 0 and self.on_station_changed(self.cb_station.itemData(i)))
         header.addWidget(self.cb_station)
 
         # Toggle thème
@@ -159,7 +283,9 @@ class MainWindow(QMainWindow):
         top = QHBoxLayout(); top.setSpacing(12)
 
         self.lbl_cover = QLabel(); self.lbl_cover.setObjectName("cover")
-        self.lbl_cover.setFixedSize(112, 112); self.lbl_cover.setScaledContents(True)
+        # pas de setScaledContents : les pixmaps arrivent déjà à la taille physique (ratio de pixels inclus)
+        self.lbl_cover.setFixedSize(112, 112)
+        self._set_placeholder_cover(self.current_station_name)
         top.addWidget(self.lbl_cover)
 
         textcol = QVBoxLayout(); textcol.setSpacing(6)
@@ -197,10 +323,68 @@ class MainWindow(QMainWindow):
         actions = QHBoxLayout()
         self.btn_reload = QPushButton("🖼️  Recharger images"); self.btn_reload.clicked.connect(self.reload_images_map)
         self.btn_update = QPushButton("🔄  Vérifier les mises à jour"); self.btn_update.clicked.connect(self.on_check_update_clicked)
-        actions.addWidget(self.btn_reload); actions.addWidget(self.btn_update)
+        self.btn_history = QPushButton("🕘  Historique"); self.btn_history.clicked.connect(self.show_history)
+        actions.addWidget(self.btn_reload); actions.addWidget(self.btn_history); actions.addWidget(self.btn_update)
 
         v.addLayout(header); v.addWidget(card); v.addLayout(actions)
 
+    def _set_placeholder_cover(self, station: str = None):
+        """Vignette pré-dimensionnée par tools/make_assets.py (assets/thumbs/<nom>_<px>.png), sans mise à l'échelle.
+
+        Logo de la station (assets/stations/<station>.*) s'il existe, sinon logo de l'appli."""
+        dpr = self.devicePixelRatioF()
+        want = round(self.lbl_cover.width() * dpr)
+        thumbs = utils.app_dir() / "assets" / "thumbs"
+        sizes = []
+        for name in ((station, "logo") if station else ("logo",)):
+            sizes = sorted(int(p.stem.rsplit("_", 1)[1]) for p in thumbs.glob(f"{glob.escape(name)}_*.png")
+                           if p.stem.rsplit("_", 1)[1].isdigit()) if thumbs.is_dir() else []
+            if sizes:
+                break
+        if not sizes:
+            return
+        px = next((s for s in sizes if s >= want), sizes[-1])
+        pix = QPixmap(str(thumbs / f"{name}_{px}.png"))
+        if not pix.isNull():
+            pix.setDevicePixelRatio(px / self.lbl_cover.width())
+            self.lbl_cover.setPixmap(pix)
+
+    def _station_label(self, name: str) -> str:
+        np = self.station_status.get(name)
+        if np is None:
+            return name
+        title = f"{np.title} — {np.artist}" if np.artist else np.title
+        if len(title) > 40:
+            title = title[:39] + "…"
+        return f"{name}  ·  👥 {np.listeners}  ·  {title}"
+
+    def _fill_station_combo(self, index: StationIndex, selected):
+        self.cb_station.blockSignals(True)
+        if index is not self.station_model.catalog:
+            self.station_model.set_catalog(index)
+        self.cb_station.setEnabled(len(self.station_model.catalog) > 1)
+        row = self.station_model.row_of(selected)
+        if row >= 0:
+            self.cb_station.setCurrentIndex(row)
+        self.cb_station.blockSignals(False)
+        self._restore_station_text()
+
+    def _restore_station_text(self):
+        """Recherche abandonnée : le champ réaffiche la station en cours."""
+        i = self.cb_station.currentIndex()
+        if i >= 0 and not self.cb_station.completer().popup().isVisible():
+            self.cb_station.setEditText(self.cb_station.itemText(i))
+
+    @Slot(object)
+    def on_station_statuses(self, statuses):
+        """État en direct de toutes les stations (agrégateur) → libellés du sélecteur."""
+        self.station_status.update(statuses)
+        names = statuses.keys()
+        if self.cb_station.lineEdit().hasFocus():
+            # le QComboBox réécrit le champ quand la ligne courante change : pas pendant une saisie
+            names = [n for n in names if n != self.current_station_name]
+        self.station_model.refresh(names)
+
     # ---------------- Thème ----------------
     def apply_theme(self, theme: str):
         theme = (theme or "dark").lower()
@@ -209,133 +393,349 @@ class MainWindow(QMainWindow):
         self.btn_theme.setText("☀️" if theme == "light" else "🌙")
         # Sauver
         self.settings["theme"] = theme
-        utils.save_json(self.settings_path, self.settings)
 
     def toggle_theme(self):
         self.apply_theme("light" if self.current_theme == "dark" else "dark")
 
+    def show_history(self):
+        if self.history is None:
+            return  # backend pas encore démarré
+        if self.history_dialog is None:
+            from history_view import HistoryDialog
+            self.history_dialog = HistoryDialog(self.history.reader(), self.current_station_name, self)
+            self.history_written.connect(self.history_dialog.model.rows_added)
+        elif self.history_dialog.model.station != self.current_station_name:
+            self.history_dialog.set_station(self.current_station_name)
+        self.history_dialog.show()
+        self.history_dialog.raise_()
+
+    def _watch_stalls(self, panel_open: bool):
+        if panel_open or self.settings.get("stall_watchdog"):
+            self.heartbeat.start()
+            self.watchdog.start()
+        else:
+            self.heartbeat.stop()
+            self.watchdog.stop()
+
+    def toggle_debug_panel(self):
+        if self.debug_panel is None:
+            from debug_panel import DebugPanel
+            self.debug_panel = DebugPanel(self)
+            self.debug_panel.shown.connect(self._watch_stalls)
+        self.debug_panel.setVisible(not self.debug_panel.isVisible())
+
     # ---------------- Player ----------------
     def handle_play(self):
-        s = str(self.player.state())
-        if self.playing or s in ("State.Playing", "State.Opening", "State.Buffering"):
+        if self.player is None:
+            return  # backend pas encore démarré
+        if self.playing or self.player.is_active():
             self.player.stop_stream()
         else:
-            self.player.start_stream(self.current_station["stream_url"])
+            self.player.start_stream(self.current_station["stream_url"], self.current_station.get("vlc"))
 
-    def sync_player_state(self):
-        s = str(self.player.state())
-        if s == "State.Playing":
-            if not self.playing:
-                self.playing = True
-                self.btn_play.setText("⏹️  Stop")
-        elif s in ("State.Stopped", "State.Ended", "State.NothingSpecial"):
-            if self.playing:
+    @Slot(str)
+    def on_player_state(self, s: str):
+        if s == "playing":
+            if not self.playing and self.np_schedule.due():
+                self.refresh_nowplaying()   # reprise après un arrêt : infos probablement périmées
+            self.playing = True
+            self.btn_play.setText("⏹️  Stop")
+        elif s in ("stopped", "ended", "error"):
+            # un stop() interne (changement de station) est suivi d'une relecture : on l'ignore
+            if not self.player.is_active():
+                self._reset_icy()
                 self.playing = False
                 self.btn_play.setText("▶️  Lecture")
                 self.lbl_now.setText("⏸️ Radio arrêtée")
-        elif s in ("State.Opening", "State.Buffering"):
-            self.btn_play.setText("⏳  Chargement…")
-        elif s == "State.Error":
-            # petit retry doux si erreur
-            QTimer.singleShot(1200, lambda: self.player.start_stream(self.current_station["stream_url"]))
+                self._schedule_np()   # arrêt : on espace les appels
+        elif s in ("opening", "buffering"):
+            if not self.playing:
+                self.btn_play.setText("⏳  Chargement…")
+        elif s == "reconnecting":
+            self.playing = False
+            self.btn_play.setText("⏳  Reconnexion…")
+
+    @Slot(object)
+    def on_start_timings(self, t: dict):
+        """Chaque démarrage est journalisé pour comparer les réglages réseau des stations."""
+        t = {**t, "station": self.current_station_name, "ts": int(time.time())}
+        utils.append_jsonl(utils.app_dir() / config.CACHE_DIR / "start_timings.jsonl", t)
 
     def on_volume(self, v: int):
-        self.player.set_volume(v); self.lbl_vol.setText(f"{v}%")
-        self.settings["volume"] = int(v); utils.save_json(self.settings_path, self.settings)
+        if self.player is not None:
+            self.player.set_volume(v)
+        self.lbl_vol.setText(f"{v}%")
+        self.settings["volume"] = int(v)  # écrit sur disque après un temps calme
 
     # ---------------- Stations ----------------
+    def _prewarm(self, name):
+        """Pré-charge la station `name` sur le lecteur secondaire (seulement si la radio joue)."""
+        if not name or name == self.current_station_name or self.player is None or not self.player.is_active():
+            return
+        st = self.stations.get("stations", {}).get(name)
+        if st and st.get("stream_url"):
+            self.player.prewarm(st["stream_url"], st.get("vlc"))
+
+    def on_station_hovered(self, i: int):
+        self._hover_station = self.cb_station.itemData(i)
+        self.prewarm_timer.start()
+
     def on_station_changed(self, name: str):
+        metrics.incr("ui.station_changed")
+        self._reset_icy()
+        self._last_np = None
+        self.np_schedule.reset()
+        previous = self.current_station_name
         self.current_station_name = name
         self.current_station = utils.get_station(self.stations, name)
-        self.images_map = utils.load_images_map_for_station(self.current_station)
+        # map en mémoire (ou copie disque) tout de suite, revalidation en arrière-plan si TTL dépassé
+        cached, fresh = utils.peek_images_map(name)
+        self.images_map = cached or utils.load_images_map_for_station(self.current_station, offline=True)
+        if not fresh:
+            self._load_images_map()
         self.settings["station"] = name
-        utils.save_json(self.settings_path, self.settings)
-
-        state = str(self.player.state())
-        if self.playing or state in ("State.Playing", "State.Opening", "State.Buffering"):
-            self.player.start_stream(self.current_station["stream_url"])
+        self.np_worker.cancel()
+        # la pochette de l'ancienne station ne reste pas affichée : logo de la nouvelle en attendant
+        self._last_art_url = None
+        self._set_placeholder_cover(name)
+        if self.status_agg is not None:
+            self.status_agg.set_current(name)   # suivie par le worker désormais
+        if self.player is None:
+            return  # start_backend() lancera lecture et now-playing pour cette station
+
+        self._start_np_stream()
+        if self.playing or self.player.is_active():
+            self.player.start_stream(self.current_station["stream_url"], self.current_station.get("vlc"))
             self.lbl_now.setText("⏳ Changement de station…")
+            # station la plus probable ensuite : celle qu'on vient de quitter
+            # (déjà le cas si on a basculé sur un lecteur pré-chauffé)
+            QTimer.singleShot(2000, lambda: self._prewarm(previous))
         else:
             self.lbl_now.setText("✅ Station prête. Appuie sur Lecture.")
         QTimer.singleShot(300, self.refresh_nowplaying)
 
+    @Slot(object)
+    def on_catalog_stations(self, stations):
+        """Catalogue plus récent reçu : on remplace la liste sans couper la lecture,
+        sauf si la station à jouer (ou son flux) n'est plus celle en cours."""
+        names = utils.get_station_names(stations)
+        if not names:
+            return
+        self.stations = stations
+        # au premier lancement, la copie locale n'avait que la station de secours
+        wanted = self.settings.get("station") or stations.get("default")
+        if wanted not in names:
+            wanted = self.current_station_name if self.current_station_name in names else \
+                     stations.get("default") if stations.get("default") in names else names[0]
+        self._fill_station_combo(StationIndex.from_catalog(stations), wanted)   # signaux bloqués : rien n'est relancé ici
+        self.status_agg.set_stations(stations)
+        if self.proxy is not None:
+            self.proxy.hub.set_stations(stations)
+        new = utils.get_station(stations, wanted)
+        keys = ("stream_url", "vlc", "nowplaying_url", "nowplaying_sse_url")
+        if wanted != self.current_station_name or any(new.get(k) != self.current_station.get(k) for k in keys):
+            self.on_station_changed(wanted)   # relance flux et now-playing si on jouait
+        else:
+            self.current_station = new
+
+    @Slot(str, object)
+    def on_catalog_images_map(self, station_name, images_map):
+        if station_name == self.current_station_name:
+            self.images_map = images_map
+
     # ---------------- NowPlaying & RPC ----------------
-    def _set_cover(self, url: str | None):
-        if not url or url == self._last_art_url:
+    def _cover_pixmap(self, url: str, img: QImage):
+        """QImage déjà décodée à la taille physique par le worker → QPixmap gardée en LRU."""
+        pix = self.cover_pixmaps.get(url)
+        if pix is None:
+            pix = QPixmap.fromImage(img)   # conserve le devicePixelRatio de l'image
+            self.cover_pixmaps.put(url, pix)
+        return pix
+
+    def _update_cover_size(self):
+        """Taille cible des pochettes décodées (change avec l'écran / le facteur d'échelle)."""
+        self.np_worker.set_cover_size(self.lbl_cover.size(), self.devicePixelRatioF())
+        self.cover_pixmaps.clear()
+
+    @Slot(str, QImage)
+    def _cache_cover(self, url: str, img: QImage):
+        self._cover_pixmap(url, img)
+
+    @Slot(str, QImage)
+    def _set_cover(self, url: str, img: QImage):
+        if url == self._last_art_url:
             return
-        try:
-            r = requests.get(url, timeout=5)
-            if r.status_code == 200:
-                pix = QPixmap()
-                pix.loadFromData(r.content)
-                self.lbl_cover.setPixmap(pix)
-                self._last_art_url = url
-        except Exception:
-            pass
+        self.lbl_cover.setPixmap(self._cover_pixmap(url, img))
+        self._last_art_url = url
+
+    def _start_np_stream(self):
+        """Transport push optionnel (clé `nowplaying_sse_url` de la station) ; sinon polling seul."""
+        if self.np_stream is not None:
+            self.np_stream.stop()
+            self.np_stream = None
+        self._np_pushed = False
+        self._schedule_np()
+        if self.proxy_url:
+            from metadata_proxy import sse_url
+            url = sse_url(self.proxy_url, self.current_station_name)
+        else:
+            url = self.current_station.get("nowplaying_sse_url")
+        if not url:
+            return
+        self.np_stream = NowPlayingStream(self.current_station_name, url, parent=self)
+        self.np_stream.fetched.connect(self.on_nowplaying)
+        self.np_stream.connected.connect(self.on_np_stream_connected)
+        self.np_stream.disconnected.connect(self.on_np_stream_lost)
+        self.np_stream.start()
+
+    @Slot()
+    def on_np_stream_connected(self):
+        if self.sender() is self.np_stream:
+            self._np_pushed = True
+            self.timer.stop()
+
+    @Slot(str)
+    def on_np_stream_lost(self, msg: str):
+        if self.sender() is not self.np_stream:
+            return
+        print("[NowPlaying SSE]", msg)
+        # retour au polling le temps que le flux se reconnecte
+        if self._np_pushed:
+            self._np_pushed = False
+            self.refresh_nowplaying()
 
     def refresh_nowplaying(self):
-        try:
+        metrics.incr("np.requests")
+        if self.proxy_url:
+            from metadata_proxy import nowplaying_url
+            api_url = nowplaying_url(self.proxy_url, self.current_station_name)
+        else:
             api_url = self.current_station.get("nowplaying_url", config.API_URL)
-            data = requests.get(api_url, timeout=5).json()
+        self.np_worker.request(self.current_station_name, api_url)
+        self._schedule_np()   # filet de sécurité si aucune réponse n'arrive
 
-            np = data.get("now_playing", {}) or {}
-            song = np.get("song", {}) or {}
-            title = song.get("title", "Inconnu")
-            artist = song.get("artist", "")
-            art_url = song.get("art")
+    def _schedule_np(self):
+        if self._np_pushed:
+            return
+        playing = self.player is not None and self.player.is_active()
+        visible = self.isVisible() and not self.isMinimized()
+        delay = self.np_schedule.next_delay(playing, visible, icy=self.icy.active)
+        self.timer.start(int(delay * 1000))
 
-            # prochain titre si dispo
-            pn = data.get("playing_next", {}) or {}
-            pn_song = pn.get("song", {}) or {}
-            next_title = pn_song.get("title")
-            next_artist = pn_song.get("artist")
+    @Slot(str)
+    def on_nowplaying_fail(self, msg: str):
+        metrics.incr("np.fail")
+        print("[NowPlaying]", msg)
+        self.np_schedule.failed()
+        self._schedule_np()
+
+    def changeEvent(self, event):
+        super().changeEvent(event)
+        if event.type() == QEvent.WindowStateChange and self.player is not None:
+            if not self.isMinimized() and self.np_schedule.due():
+                self.refresh_nowplaying()   # restauration : rattrape le morceau en cours
+            else:
+                self._schedule_np()
 
-            listeners = (data.get("listeners") or {}).get("total", 0)
-            live = (data.get("live") or {}).get("is_live", False)
+    # ---------------- Titres ICY ----------------
+    def _reset_icy(self):
+        self.icy.reset()
+        self.enrich_timer.stop()
 
+    @Slot(str)
+    def on_icy_title(self, raw: str):
+        """Changement de morceau signalé dans le flux : titre + RPC tout de suite, API pour le reste."""
+        ok, np = self.icy.on_title(raw, self.current_station_name, self._last_np)
+        if not ok:
+            return
+        self.enrich_timer.start(config.ICY_ENRICH_DELAY * 1000)
+        if np is not None:
+            self._show_nowplaying(np)
+
+    @Slot(object)
+    def on_nowplaying(self, np):
+        # réponse d'une ancienne station arrivée après un changement
+        if np.station != self.current_station_name:
+            metrics.incr("np.stale")
+            return
+        self.np_schedule.observe(np)
+        self._schedule_np()
+        retry = self.icy.api_behind(np)
+        if retry is not None:
+            # l'API n'a pas encore vu le morceau annoncé par le flux : on garde le titre ICY
+            self.lbl_badge.setText(f"👥 {np.listeners}")
+            if retry:
+                self.enrich_timer.start(int(retry * 1000))
+            return
+        metrics.incr("np.updates")
+        # la station en cours n'est pas interrogée par l'agrégateur : son libellé suit le worker
+        self.on_station_statuses({np.station: np})
+        if self.history is not None:
+            self.history.record(np.station, np.title, np.artist, np.art_url, np.listeners, np.live)
+        # pochette déjà décodée (préchargée) → bascule immédiate, sans attendre le worker
+        cached = self.cover_pixmaps.get(np.art_url) if np.art_url else None
+        if cached is not None and np.art_url != self._last_art_url:
+            self.lbl_cover.setPixmap(cached)
+            self._last_art_url = np.art_url
+        if self.np_stream is not None and self.sender() is self.np_stream:
+            self.np_worker.request_cover(np.station, np.art_url)
+        self._show_nowplaying(np)
+
+    def _show_nowplaying(self, np):
+        """Titre, badge, prochain titre et présence Discord."""
+        self._last_np = np
+        try:
             # UI
-            self.lbl_now.setText(f"🎼 {title} — {artist}")
-            self.lbl_badge.setText(f"👥 {listeners}")
-            if next_title:
-                na = f" — {next_artist}" if next_artist else ""
-                self.lbl_next.setText(f"🔜 À suivre : {next_title}{na}")
+            self.lbl_now.setText(f"🎼 {np.title} — {np.artist}")
+            self.lbl_badge.setText(f"👥 {np.listeners}")
+            if np.next_title:
+                na = f" — {np.next_artist}" if np.next_artist else ""
+                self.lbl_next.setText(f"🔜 À suivre : {np.next_title}{na}")
             else:
                 self.lbl_next.setText("")
 
-            self._set_cover(art_url)
-
-            # RPC
-            if not self.rpc.enabled():
-                if self.rpc.connect():
-                    self.lbl_rpc.setText("RPC : connecté ✅")
-                else:
-                    self.lbl_rpc.setText("RPC : inactif ❌")
-            else:
-                img = utils.choose_image(self.images_map, title, live)
-                small = self.current_station.get("rpc_small_image")
-                self.rpc.update(title, artist, listeners, img, small_image=small, small_text=self.current_station_name)
+            # RPC (non bloquant : la dernière présence gagne, envoi géré par le worker)
+            img = utils.choose_image(self.images_map, np.title, np.live)
+            small = self.current_station.get("rpc_small_image")
+            if self.rpc is not None:
+                self.rpc.update(np.title, np.artist, np.listeners, img, small_image=small, small_text=self.current_station_name)
 
         except Exception as e:
+            metrics.incr("np.ui_errors")
             print("[NowPlaying]", e)
 
+    def _load_images_map(self, force: bool = False, on_done=None):
+        """`on_done` est branché avant le démarrage : appelé même si le thread finit aussitôt."""
+        loader = ImagesMapLoader(self.current_station_name, self.current_station, force=force, parent=self)
+        loader.images_map.connect(self.on_catalog_images_map)
+        if on_done is not None:
+            loader.finished.connect(on_done)
+        loader.finished.connect(loader.deleteLater)
+        loader.start()
+
     def reload_images_map(self):
-        self.images_map = utils.load_images_map_for_station(self.current_station)
-        QMessageBox.information(self, "Images", f"Mappings rechargés pour « {self.current_station_name} » ✅")
+        self.btn_reload.setEnabled(False)
+        name = self.current_station_name
+        self._load_images_map(force=True, on_done=lambda: (
+            self.btn_reload.setEnabled(True),
+            QMessageBox.information(self, "Images", f"Mappings rechargés pour « {name} » ✅")))
 
     # ---------------- Updates ----------------
     def start_silent_update_check(self):
+        from updater import UpdateChecker
         self.chk = UpdateChecker()
         self.chk.found.connect(self.on_update_found_banner)
         self.chk.none.connect(lambda: self.lbl_ver.setText(f"v{config.CURRENT_VERSION}"))
         self.chk.fail.connect(lambda msg: print("[update fail]", msg))
         self.chk.start()
 
-    @Slot(str, str)
-    def on_update_found_banner(self, latest, url):
+    @Slot(str, str, str)
+    def on_update_found_banner(self, latest, url, sums_url):
         self.lbl_ver.setText(f"v{config.CURRENT_VERSION} → dispo v{latest}")
 
     def on_check_update_clicked(self):
         self.btn_update.setEnabled(False); self.btn_update.setText("Recherche…")
+        from updater import UpdateChecker
         self.chk = UpdateChecker()
         self.chk.found.connect(self.ask_install_update)
         self.chk.none.connect(lambda: QMessageBox.information(self, "Mises à jour", "✅ Aucune mise à jour disponible."))
@@ -343,8 +743,8 @@ class MainWindow(QMainWindow):
         self.chk.finished.connect(lambda: (self.btn_update.setEnabled(True), self.btn_update.setText("🔄  Vérifier les mises à jour")))
         self.chk.start()
 
-    @Slot(str, str)
-    def ask_install_update(self, latest, url):
+    @Slot(str, str, str)
+    def ask_install_update(self, latest, url, sums_url):
         if not utils.is_frozen_exe():
             QMessageBox.information(self, "Mise à jour", f"Nouvelle version {latest} dispo.\nCompile l’exe pour l’auto-update.")
             return
@@ -352,12 +752,13 @@ class MainWindow(QMainWindow):
                                    f"🚀 Version {latest} disponible.\nInstaller maintenant ?",
                                    QMessageBox.Yes | QMessageBox.No)
         if res == QMessageBox.Yes:
-            self.download_update(url)
+            self.download_update(url, sums_url)
 
-    def download_update(self, url: str):
+    def download_update(self, url: str, sums_url: str = ""):
         dest = utils.temp_path(f"{config.APP_NAME}_new.exe")
         self.btn_update.setEnabled(False); self.btn_update.setText("Téléchargement… 0%")
-        self.dl = UpdateDownloader(url, dest)
+        from updater import UpdateDownloader
+        self.dl = UpdateDownloader(url, dest, checksum_url=sums_url)
         self.dl.progress.connect(lambda p: self.btn_update.setText(f"Téléchargement… {p}%"))
         self.dl.done.connect(self.install_update)
         self.dl.fail.connect(lambda msg: (QMessageBox.critical(self, "Erreur", f"Téléchargement échoué : {msg}"),
@@ -376,10 +777,31 @@ class MainWindow(QMainWindow):
             self.btn_update.setEnabled(True); self.btn_update.setText("🔄  Vérifier les mises à jour")
 
     # ---------------- Quit ----------------
+    def closeEvent(self, event):
+        if self.np_stream is not None:
+            self.np_stream.stop()
+        self.np_worker.stop()
+        if self.player is not None:
+            self.status_agg.stop()
+            self.catalog.wait(2000)
+            self.rpc.clear_close()
+        if self.proxy is not None:
+            self.proxy.stop()
+        if self.history_dialog is not None:
+            self.history_dialog.model.reader.close()
+        if self.history is not None:
+            self.history.close()
+        self.settings.flush()
+        self.watchdog.stop()
+        metrics.dump(utils.app_dir() / config.CACHE_DIR / config.METRICS_FILE)
+        super().closeEvent(event)
+
     def safe_quit(self):
         try:
-            self.rpc.clear_close()
+            if self.rpc is not None:
+                self.rpc.clear_close()
         except Exception:
             pass
-        self.player.stop_stream()
+        if self.player is not None:
+            self.player.stop_stream()
         self.close()
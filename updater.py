@@ -1,8 +1,13 @@
+import hashlib, os, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
 from PySide6.QtCore import QThread, Signal
-import utils, config
+import utils, config, http_client
 
 class UpdateChecker(QThread):
-    found = Signal(str, str)   # version, url
+    found = Signal(str, str, str)   # version, url, url des sommes SHA-256 ("" si absent)
     none  = Signal()
     fail  = Signal(str)
 
@@ -10,36 +15,157 @@ class UpdateChecker(QThread):
         try:
             res = utils.get_latest_release(config.GITHUB_REPO, config.CURRENT_VERSION)
             if res:
-                self.found.emit(res[0], res[1])
+                self.found.emit(*res)
             else:
                 self.none.emit()
         except Exception as e:
             self.fail.emit(str(e))
 
 class UpdateDownloader(QThread):
+    """Téléchargement reprenable (HTTP Range), en segments parallèles, vérifié en SHA-256.
+
+    L'avancement est conservé dans `<dest>.part` + `<dest>.part.json` : une
+    connexion coupée (ou un redémarrage de l'appli) reprend là où elle s'était
+    arrêtée. `progress` n'est émis que si le % change, au plus toutes les 100 ms.
+    """
     progress = Signal(int)     # %
     done     = Signal(str)     # path
     fail     = Signal(str)
 
-    def __init__(self, url: str, dest: str):
+    CHUNK = 1024 * 64
+    SEGMENT_RETRIES = 3
+    PROGRESS_INTERVAL = 0.1    # s
+
+    def __init__(self, url: str, dest: str, checksum_url: str = "", segments: int = 4):
         super().__init__()
         self.url = url
         self.dest = dest
+        self.checksum_url = checksum_url
+        self.segments = max(1, segments)
+        self.part = dest + ".part"
+        self.state_path = Path(dest + ".part.json")
+        self._lock = threading.Lock()
+        self._done_bytes = 0
+        self._total = 0
+        self._last_pct = -1
+        self._last_emit = 0.0
+
+    # ---------- plan de téléchargement ----------
+    def _probe(self):
+        r = http_client.head(self.url, timeout=20)
+        r.raise_for_status()
+        size = int(r.headers.get("content-length") or 0)
+        ranges = bool(size) and r.headers.get("accept-ranges", "").lower() == "bytes"
+        return size, ranges, r.headers.get("ETag", "")
+
+    def _load_plan(self, size: int, ranges: bool, etag: str):
+        """Reprend le plan existant s'il correspond au même fichier distant, sinon en crée un neuf."""
+        if ranges and size and os.path.exists(self.part):
+            st = utils.load_json(self.state_path, {})
+            if st.get("url") == self.url and st.get("size") == size and st.get("etag") == etag:
+                return st
+        n = self.segments if ranges else 1
+        step = -(-size // n) if size else 0
+        segs = [[i * step, min(size, (i + 1) * step) - 1, 0] for i in range(n)] if size else [[0, -1, 0]]
+        with open(self.part, "wb") as f:
+            if size:
+                f.truncate(size)   # pré-allocation : chaque segment écrit à son offset
+        return {"url": self.url, "size": size, "etag": etag, "ranges": ranges, "segments": segs}
+
+    def _save_plan(self, plan):
+        with self._lock:
+            utils.save_json(self.state_path, plan)
+
+    # ---------- progression ----------
+    def _advance(self, n: int, force: bool = False):
+        with self._lock:
+            self._done_bytes += n
+            if not self._total:
+                return
+            pct = int(self._done_bytes * 100 / self._total)
+            now = time.monotonic()
+            if pct == self._last_pct or (not force and now - self._last_emit < self.PROGRESS_INTERVAL):
+                return
+            self._last_pct, self._last_emit = pct, now
+        self.progress.emit(pct)
+
+    # ---------- segments ----------
+    def _fetch_segment(self, plan, seg):
+        start, end, _ = seg
+        for attempt in range(self.SEGMENT_RETRIES):
+            offset = start + seg[2]
+            if end >= 0 and offset > end:
+                return
+            headers = {"Range": f"bytes={offset}-{end}"} if plan["ranges"] else {}
+            try:
+                with http_client.get(self.url, stream=True, timeout=20, headers=headers) as r:
+                    r.raise_for_status()
+                    if headers and r.status_code != 206:
+                        raise IOError("le serveur a ignoré la requête Range")
+                    with open(self.part, "r+b") as f:
+                        f.seek(offset)
+                        since_save = 0
+                        for chunk in r.iter_content(self.CHUNK):
+                            if not chunk:
+                                continue
+                            f.write(chunk)
+                            seg[2] += len(chunk)
+                            since_save += len(chunk)
+                            self._advance(len(chunk))
+                            if since_save >= 1024 * 1024:   # point de reprise tous les ~1 Mo
+                                f.flush()
+                                self._save_plan(plan)
+                                since_save = 0
+                self._save_plan(plan)
+                return
+            except Exception:
+                self._save_plan(plan)
+                if attempt == self.SEGMENT_RETRIES - 1 or not plan["ranges"]:
+                    raise
+                time.sleep(2 ** attempt)
+
+    # ---------- vérification ----------
+    def _verify(self):
+        if not self.checksum_url:
+            return
+        r = http_client.get(self.checksum_url, timeout=20)
+        r.raise_for_status()
+        filename = unquote(os.path.basename(urlsplit(self.url).path))
+        expected = utils.parse_sha256(r.text, filename)
+        if not expected:
+            raise ValueError(f"somme SHA-256 introuvable pour {filename}")
+        h = hashlib.sha256()
+        with open(self.part, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                h.update(block)
+        if h.hexdigest() != expected:
+            self._discard()
+            raise ValueError("SHA-256 invalide : fichier corrompu, téléchargement supprimé")
+
+    def _discard(self):
+        for p in (Path(self.part), self.state_path):
+            try:
+                p.unlink(missing_ok=True)
+            except Exception:
+                pass
 
     def run(self):
         try:
-            import requests
-            with requests.get(self.url, stream=True, timeout=20) as r:
-                r.raise_for_status()
-                total = int(r.headers.get("content-length") or 0)
-                done = 0
-                with open(self.dest, "wb") as f:
-                    for chunk in r.iter_content(1024 * 64):
-                        if chunk:
-                            f.write(chunk)
-                            if total:
-                                done += len(chunk)
-                                self.progress.emit(int(done * 100 / total))
+            size, ranges, etag = self._probe()
+            plan = self._load_plan(size, ranges, etag)
+            self._total = size
+            self._done_bytes = sum(s[2] for s in plan["segments"])
+            self._save_plan(plan)
+
+            todo = [s for s in plan["segments"] if s[1] < 0 or s[0] + s[2] <= s[1]]
+            with ThreadPoolExecutor(max_workers=max(1, len(todo))) as ex:
+                for fut in [ex.submit(self._fetch_segment, plan, s) for s in todo]:
+                    fut.result()
+            self._advance(0, force=True)
+
+            self._verify()
+            os.replace(self.part, self.dest)
+            self.state_path.unlink(missing_ok=True)
             self.done.emit(self.dest)
         except Exception as e:
             self.fail.emit(str(e))
@@ -1,7 +1,9 @@
-import os, sys, json, requests, subprocess
+import os, sys, re, json, time, subprocess
 from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 import config
+import http_client
+from covercache import DiskCache
 
 # ---------- chemins ----------
 def app_dir() -> Path:
@@ -27,16 +29,38 @@ def load_json(path: Path, default: dict) -> dict:
         pass
     return default
 
-def save_json(path: Path, data: dict):
+def save_json(path: Path, data: dict) -> bool:
+    """Écriture atomique (fichier temporaire + rename) : un crash ne laisse jamais un JSON tronqué."""
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
     try:
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-    except Exception:
-        pass
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(json.dumps(data, ensure_ascii=False, indent=2))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"[!] save_json error for {path}:", e)
+        try:
+            tmp.unlink(missing_ok=True)
+        except Exception:
+            pass
+        return False
+
+def append_jsonl(path: Path, obj: dict):
+    """Ajoute une ligne JSON (journal de mesures) ; crée le dossier au besoin."""
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(obj, ensure_ascii=False) + "\n")
+    except Exception as e:
+        print(f"[!] append_jsonl error for {path}:", e)
 
 # ---------- fetch helper ----------
 def fetch_json(url: str, timeout: int = 6):
     try:
-        r = requests.get(url, timeout=timeout)
+        r = http_client.get(url, timeout=timeout)
         if r.status_code == 200:
             return r.json()
         print(f"[!] fetch_json status {r.status_code} for {url}")
@@ -44,6 +68,48 @@ def fetch_json(url: str, timeout: int = 6):
         print(f"[!] fetch_json error for {url}:", e)
     return None
 
+# ---------- catalogues en cache local (stale-while-revalidate) ----------
+_catalog_cache = None
+
+def catalog_cache() -> DiskCache:
+    """Copie disque des JSON distants (stations, images maps), à côté de settings.json."""
+    global _catalog_cache
+    if _catalog_cache is None:
+        _catalog_cache = DiskCache(app_dir() / config.CACHE_DIR / "catalog", 5 * 1024 * 1024, fresh_for=0)
+    return _catalog_cache
+
+def cached_json(url: str):
+    """Dernière copie locale connue de `url`, sans réseau (None si jamais téléchargée)."""
+    data, _, _ = catalog_cache().lookup(url)
+    try:
+        return json.loads(data) if data is not None else None
+    except ValueError:
+        return None
+
+def revalidate_json(url: str, timeout: int = 6) -> Tuple[Any, bool]:
+    """GET conditionnel (ETag/Last-Modified) et mise à jour du cache. Retourne (données, modifiées ?).
+
+    En cas d'échec réseau, renvoie la copie locale (non modifiée).
+    """
+    cache = catalog_cache()
+    cached, validators, _ = cache.lookup(url)
+    try:
+        r = http_client.get(url, timeout=timeout, validators=validators)
+        if r.status_code == 304 and cached is not None:
+            cache.touch(url)
+            return json.loads(cached), False
+        if r.status_code == 200:
+            data = r.json()
+            cache.store(url, r.content, r.headers)
+            return data, r.content != cached
+        print(f"[!] revalidate_json status {r.status_code} for {url}")
+    except Exception as e:
+        print(f"[!] revalidate_json error for {url}:", e)
+    return cached_json(url), False
+
+def _get_json(url: str, offline: bool):
+    return cached_json(url) if offline else revalidate_json(url)[0]
+
 # ---------- VLC portable ----------
 def load_vlc_portable():
     if sys.platform.startswith("win"):
@@ -70,22 +136,105 @@ def merge_image_maps(base: dict, override: dict) -> dict:
         "titles": {**base["titles"], **override["titles"]},
     }
 
-def load_images_map() -> dict:
-    data = fetch_json(config.MAP_URL) or {}
-    return normalize_image_map(data)
+def load_images_map(offline: bool = False) -> dict:
+    data = _get_json(config.MAP_URL, offline) or {}
+    return compile_image_map(normalize_image_map(data))
+
+class TitleMatcher:
+    """Automate Aho–Corasick (casefold) sur les clés de `titles`.
+
+    Une seule passe sur le titre, quel que soit le nombre de motifs. Si plusieurs
+    motifs apparaissent, c'est le premier dans l'ordre du mapping qui gagne
+    (même règle que l'ancienne boucle sur le dict). Pour les petites maps, une
+    simple boucle sur les clés pré-casefoldées reste plus rapide que l'automate.
+    """
+    __slots__ = ("_goto", "_fail", "_best", "_values", "_small")
+
+    NONE = 1 << 62
+    SMALL = 32
+
+    def __init__(self, titles: dict):
+        self._values = list(titles.values())
+        self._small = None
+        if len(titles) <= self.SMALL:
+            self._small = [(str(k).casefold(), v) for k, v in titles.items()]
+            return
+        goto = [{}]
+        best = [self.NONE]
+        for prio, key in enumerate(titles):
+            state = 0
+            for ch in str(key).casefold():
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    best.append(self.NONE)
+                state = nxt
+            best[state] = min(best[state], prio)
+
+        # liens d'échec (BFS) + propagation de la meilleure priorité le long des suffixes
+        fail = [0] * len(goto)
+        queue = [0]
+        i = 0
+        while i < len(queue):
+            state = queue[i]; i += 1
+            for ch, nxt in goto[state].items():
+                if state:
+                    f = fail[state]
+                    while f and ch not in goto[f]:
+                        f = fail[f]
+                    fail[nxt] = goto[f].get(ch, 0)
+                best[nxt] = min(best[nxt], best[fail[nxt]])
+                queue.append(nxt)
+        self._goto, self._fail, self._best = goto, fail, best
+
+    def match(self, title: str):
+        """Valeur du motif prioritaire contenu dans `title`, sinon None."""
+        if self._small is not None:
+            folded = title.casefold()
+            for key, img in self._small:
+                if key in folded:
+                    return img
+            return None
+        goto, fail, best_of = self._goto, self._fail, self._best
+        best = best_of[0]
+        state = 0
+        for ch in title.casefold():
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best_of[state] < best:
+                best = best_of[state]
+                if best == 0:
+                    break
+        return None if best == self.NONE else self._values[best]
+
+def compile_image_map(m: dict) -> dict:
+    """Ajoute l'automate de correspondance (`matcher`) à une map normalisée — à faire une fois au chargement."""
+    m["matcher"] = TitleMatcher(m.get("titles", {}))
+    return m
 
 def choose_image(images_map: dict, title: str, live: bool) -> str:
     if live:
         return images_map.get("live", "logo_live")
-    for song_title, img in images_map.get("titles", {}).items():
-        if song_title.lower() in title.lower():
-            return img
+    matcher = images_map.get("matcher")
+    if matcher is None:
+        matcher = compile_image_map(images_map)["matcher"]
+    img = matcher.match(title or "")
+    if img is not None:
+        return img
     return images_map.get("default", "logo_default")
 
 # ---------- stations (multi-radios) ----------
-def load_stations() -> Dict[str, Any]:
-    data = fetch_json(config.STATIONS_URL)
-    if data and isinstance(data.get("stations"), dict):
+def load_stations(offline: bool = False) -> Dict[str, Any]:
+    """`offline=True` : copie locale uniquement (démarrage instantané), sinon revalidation réseau."""
+    data = _get_json(config.STATIONS_URL, offline)
+    if isinstance(data, dict) and isinstance(data.get("stations"), dict):
+        return data
+    from station_index import normalize
+    data = normalize(data)   # annuaire au format liste (radio-browser…)
+    if data is not None:
         return data
     # Fallback local minimal
     return {
@@ -102,41 +251,94 @@ def get_station_names(stations: Dict[str, Any]):
     return list(stations.get("stations", {}).keys())
 
 def get_station(stations: Dict[str, Any], name: str) -> Dict[str, str]:
-    return stations["stations"].get(name, next(iter(stations["stations"].values())))
+    """Station `name`, sinon la station par défaut du catalogue, sinon la première."""
+    all_ = stations.get("stations") or {}
+    st = all_.get(name) or all_.get(stations.get("default"))
+    if st is None:
+        st = next(iter(all_.values()), {"stream_url": config.STREAM_URL, "nowplaying_url": config.API_URL})
+    return st
 
-def load_images_map_for_station(station: Dict[str, Any]) -> dict:
+def load_images_map_for_station(station: Dict[str, Any], offline: bool = False) -> dict:
     """Retourne la map d'images propre à la station, fusionnée avec la map globale."""
-    global_map = load_images_map()
+    global_map = normalize_image_map(_get_json(config.MAP_URL, offline) or {})
     # inline ?
     inline = station.get("images_map")
     if isinstance(inline, dict):
-        return merge_image_maps(global_map, inline)
+        return compile_image_map(merge_image_maps(global_map, inline))
     # url dédiée ?
     url = station.get("images_map_url")
     if isinstance(url, str) and url.startswith("http"):
-        remote = fetch_json(url) or {}
-        return merge_image_maps(global_map, remote)
+        remote = _get_json(url, offline) or {}
+        return compile_image_map(merge_image_maps(global_map, remote))
     # fallback global
-    return global_map
+    return compile_image_map(global_map)
+
+# ---------- cache des maps fusionnées par station ----------
+_station_maps: Dict[str, Tuple[float, dict]] = {}   # nom → (horodatage, map compilée)
+
+def peek_images_map(name: str, max_age: float = None) -> Tuple[Optional[dict], bool]:
+    """Map en mémoire pour la station, sans I/O. Retourne (map ou None, encore dans le TTL ?)."""
+    max_age = config.IMAGES_MAP_TTL if max_age is None else max_age
+    hit = _station_maps.get(name)
+    if hit is None:
+        return None, False
+    return hit[1], time.monotonic() - hit[0] < max_age
+
+def remember_images_map(name: str, images_map: dict):
+    _station_maps[name] = (time.monotonic(), images_map)
+
+def get_images_map_for_station(name: str, station: Dict[str, Any], max_age: float = None) -> dict:
+    """Map fusionnée + compilée de la station ; réseau (GET conditionnel) seulement après le TTL."""
+    cached, fresh = peek_images_map(name, max_age)
+    if cached is not None and fresh:
+        return cached
+    m = load_images_map_for_station(station)
+    remember_images_map(name, m)
+    return m
+
+def invalidate_images_maps(name: Optional[str] = None):
+    """Oublie la map d'une station (ou toutes) — bouton « Recharger images », nouveau catalogue."""
+    if name is None:
+        _station_maps.clear()
+    else:
+        _station_maps.pop(name, None)
 
 # ---------- GitHub Releases ----------
-def get_latest_release(repo: str, current_version: str) -> Optional[Tuple[str, str]]:
+CHECKSUM_SUFFIXES = (".sha256", ".sha256sum", "sha256sums", "sha256sums.txt", "checksums.txt")
+
+def get_latest_release(repo: str, current_version: str) -> Optional[Tuple[str, str, str]]:
+    """(version, url de l'exe, url du fichier SHA-256 ou "") si une autre version est publiée."""
     data = fetch_json(f"https://api.github.com/repos/{repo}/releases/latest", timeout=8) or {}
     try:
         tag = (data.get("tag_name") or "").lstrip("v")
         asset_url = None
+        sums_url = ""
         for asset in data.get("assets", []):
-            if asset.get("name", "").lower().endswith(".exe"):
+            name = asset.get("name", "").lower()
+            if asset_url is None and name.endswith(".exe"):
                 asset_url = asset.get("browser_download_url")
-                break
+            elif name.endswith(CHECKSUM_SUFFIXES):
+                sums_url = asset.get("browser_download_url") or ""
         if tag and asset_url and tag != current_version:
-            return tag, asset_url
+            return tag, asset_url, sums_url
     except Exception as e:
         print("[get_latest_release]", e)
     return None
 
+def parse_sha256(text: str, filename: str) -> Optional[str]:
+    """Extrait le hash d'un fichier de sommes (`<hash>  <nom>` par ligne, ou hash seul)."""
+    hashes = []
+    for line in text.splitlines():
+        m = re.match(r"\s*([0-9a-fA-F]{64})\b\s*\*?(.*)", line)
+        if not m:
+            continue
+        if m.group(2).strip().lower() == filename.lower():
+            return m.group(1).lower()
+        hashes.append(m.group(1).lower())
+    return hashes[0] if len(hashes) == 1 else None
+
 def download_file(url: str, dest: str):
-    with requests.get(url, stream=True, timeout=20) as r:
+    with http_client.get(url, stream=True, timeout=20) as r:
         r.raise_for_status()
         with open(dest, "wb") as f:
             for chunk in r.iter_content(1024 * 64):